@@ -10,6 +10,11 @@ class Settings:
     def __init__(self) -> None:
         self.env = os.getenv("APP_ENV", "local")
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///./rfp.db")
+        # Connection pool and SQLite tuning (see backend/models/db.py)
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.db_busy_timeout_ms = int(os.getenv("DB_BUSY_TIMEOUT_MS", "15000"))
+        self.db_cache_size_kb = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))
         self.storage_path = os.getenv("STORAGE_PATH", "storage")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4o")
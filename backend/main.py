@@ -7,7 +7,8 @@ from fastapi.staticfiles import StaticFiles
 
 from backend.config.settings import settings
 from backend.models.db import init_db
-from backend.routers import analysis, chat, pages, proposals, reviews, rfps, comparisons
+from backend.routers import analysis, chat, pages, proposals, reviews, rfps, comparisons, search, stats
+from backend.workers import db_writer
 
 # ...
 
@@ -44,6 +45,8 @@ app.include_router(reviews.router, prefix="/api")
 app.include_router(analysis.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 app.include_router(comparisons.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
 
 
 @app.get("/")
@@ -62,3 +65,9 @@ def on_startup():
     init_db()
     Path(settings.storage_path).mkdir(parents=True, exist_ok=True)
 
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Let queued writes (uploads, reviews) finish before the process exits
+    db_writer.drain()
+
@@ -1,19 +1,108 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.config.settings import settings
 
+IS_SQLITE = settings.database_url.startswith("sqlite")
+_IN_MEMORY = IS_SQLITE and (":memory:" in settings.database_url or settings.database_url.rstrip("/") == "sqlite:")
+
+
+def _engine_options() -> dict:
+    """Pool and driver options for the configured database."""
+    if not IS_SQLITE:
+        return {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow, "pool_pre_ping": True}
+    options = {
+        # The driver waits this long for a lock before raising "database is locked"
+        "connect_args": {"check_same_thread": False, "timeout": settings.db_busy_timeout_ms / 1000},
+    }
+    if not _IN_MEMORY:  # in-memory databases use a per-thread pool that takes no sizing
+        options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    return options
+
+
+engine = create_engine(settings.database_url, echo=False, **_engine_options())
+
+# Async drivers for the same databases (used by async routes; jobs stay on the sync engine)
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
 
-engine = create_engine(
-    settings.database_url,
-    echo=False,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-)
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Production profile for every new SQLite connection: WAL lets readers
+    run alongside the single writer (and across uvicorn workers),
+    synchronous=NORMAL is durable under WAL while skipping an fsync per
+    commit, and writers wait busy_timeout ms for the lock instead of
+    failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    if not _IN_MEMORY:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.db_busy_timeout_ms}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{settings.db_cache_size_kb}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _sqlite_pragmas)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """
+    Async engine over the same database (aiosqlite for SQLite), created on
+    first use so sync-only processes such as jobs never load the driver.
+    """
+    scheme, _, rest = settings.database_url.partition("://")
+    url = f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+    options = _engine_options()
+    options.get("connect_args", {}).pop("check_same_thread", None)
+    async_engine = create_async_engine(url, echo=False, **options)
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+    return async_engine
 
 
 def init_db() -> None:
     """Create tables if they do not exist."""
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    _create_missing_indexes()
+
+    from backend.services.search_service import ensure_search_index
+    ensure_search_index()
+
+
+def _add_missing_columns() -> None:
+    """Add nullable columns declared on models but missing from existing tables.
+
+    create_all() never alters tables that already exist, so new optional
+    fields are added here with ALTER TABLE ... ADD COLUMN.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {col_type}'))
+
+
+def _create_missing_indexes() -> None:
+    """Create indexes declared on models but missing from existing tables."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 @contextmanager
@@ -21,3 +110,27 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+
+@asynccontextmanager
+async def get_async_session():
+    """
+    Async counterpart of get_session() for reads on the event loop. Writes
+    go through db_writer.run_async() with write_session(), so they queue
+    behind the single writer instead of failing with "database is locked".
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+@contextmanager
+def write_session():
+    """
+    Session for a write-heavy transaction. On SQLite it starts with BEGIN
+    IMMEDIATE, taking the write lock up front (waiting up to busy_timeout)
+    rather than failing when a read transaction later tries to upgrade.
+    """
+    with Session(engine) as session:
+        if IS_SQLITE:
+            session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+        yield session
+
@@ -2,11 +2,17 @@ from datetime import datetime, date
 from typing import Optional, List
 from uuid import uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Column, JSON, Relationship
 
 
 class RfpModel(SQLModel, table=True):
     __tablename__ = "rfps"
+    # Keyset pagination of listings: newest first, optionally by status
+    __table_args__ = (
+        Index("ix_rfps_created_at_id", "created_at", "id"),
+        Index("ix_rfps_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     title: str
@@ -33,12 +39,27 @@ class RfpModel(SQLModel, table=True):
         sa_column=Column(JSON), default_factory=dict,
         description="Cached column classification: {proposal_ids, fixed_columns, vendor_columns}"
     )
+    # Compact RFP summary used as the shared prefix of AI prompts
+    digest: Optional[str] = None
+    digest_version: Optional[str] = None
+    # Generated evaluation dimensions, reused until title/scope/requirements change
+    evaluation_dimensions: Optional[List[dict]] = Field(
+        sa_column=Column(JSON), default=None,
+        description="Dimensions from /analysis/rfp/{id}/dimensions"
+    )
+    dimensions_version: Optional[str] = None
 
     proposals: List["ProposalModel"] = Relationship(back_populates="rfp")
 
 
 class ProposalModel(SQLModel, table=True):
     __tablename__ = "proposals"
+    # Keyset pagination of listings: newest first, per RFP and/or status
+    __table_args__ = (
+        Index("ix_proposals_created_at_id", "created_at", "id"),
+        Index("ix_proposals_rfp_id_created_at_id", "rfp_id", "created_at", "id"),
+        Index("ix_proposals_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     rfp_id: str = Field(foreign_key="rfps.id", index=True)
@@ -46,6 +67,9 @@ class ProposalModel(SQLModel, table=True):
     contractor_email: Optional[str] = None
     price: Optional[float] = None
     currency: str = "USD"
+    # Normalized price: integer minor units (cents) and quote status (quoted/tbd/n/a/not_quoted)
+    price_minor: Optional[int] = None
+    price_status: Optional[str] = None
     start_date: Optional[date] = None
     summary: Optional[str] = None
     
@@ -99,7 +123,8 @@ class ProposalModel(SQLModel, table=True):
     # Proposal Form Data (NEW)
     proposal_form_data: List[dict] = Field(
         sa_column=Column(JSON), default_factory=list,
-        description="Vendor's filled proposal form values (item_id, unit_cost, total, etc.)"
+        description="Vendor's filled proposal form values (item_id, unit_cost, total, etc.) "
+                    "plus a 'normalized' map of amount columns to {minor, currency, status}"
     )
     status: str = Field(default="submitted", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -126,4 +151,106 @@ class SavedComparisonModel(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ScoreCacheModel(SQLModel, table=True):
+    """AI score of one proposal on one comparison dimension.
+
+    Keyed by the proposal content, RFP content and scoring prompt versions,
+    so a score is reused until any input to it changes.
+    """
+    __tablename__ = "score_cache"
+
+    proposal_id: str = Field(foreign_key="proposals.id", primary_key=True)
+    dimension: str = Field(primary_key=True)
+    proposal_hash: str = Field(primary_key=True)
+    rfp_version: str = Field(primary_key=True)
+    prompt_version: str = Field(primary_key=True)
+    score: int
+    label: str
+    reasoning: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProposalReviewModel(SQLModel, table=True):
+    """Stored AI review of a proposal (coverage, risk, scores, qualitative fields).
+
+    Valid while the proposal text, the RFP (digest version, stored as
+    requirements_hash) and the review prompt still hash to the stored
+    versions; otherwise it is re-evaluated. An empty result records a
+    failed evaluation, retried once created_at is older than
+    review_service.REVIEW_RETRY_SECONDS.
+    """
+    __tablename__ = "proposal_reviews"
+
+    proposal_id: str = Field(foreign_key="proposals.id", primary_key=True)
+    proposal_hash: str
+    requirements_hash: str
+    prompt_version: str
+    result: dict = Field(sa_column=Column(JSON), default_factory=dict, description="Raw AI evaluation JSON")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ChatSessionModel(SQLModel, table=True):
+    """Server-side chat conversation (proposal chat or RFP consultant).
+
+    Only the most recent turns are kept verbatim; older turns are folded
+    into `summary`, so the history sent with each prompt stays bounded.
+    """
+    __tablename__ = "chat_sessions"
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    kind: str = Field(index=True, description="proposal | rfp | rfp_consultant")
+    subject_id: Optional[str] = Field(default=None, index=True, description="Proposal id (proposal chat) or RFP id (rfp chat)")
+    summary: str = Field(default="", description="Running summary of compacted turns")
+    turns: List[dict] = Field(
+        sa_column=Column(JSON), default_factory=list, description="Recent turns: [{role, content}]"
+    )
+    summarized_turns: int = Field(default=0, description="Number of turns folded into the summary")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class AnswerCacheModel(SQLModel, table=True):
+    """Chat answer to a history-free question about one proposal version.
+
+    Looked up by embedding similarity of the question, so rephrasings of a
+    cached question reuse its answer. proposal_version holds
+    chat_service.answer_version (proposal and RFP digest); hits is no
+    longer updated, so lookups stay read-only.
+    """
+    __tablename__ = "answer_cache"
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    proposal_id: str = Field(foreign_key="proposals.id", index=True)
+    proposal_version: str
+    question: str
+    question_vector: List[float] = Field(sa_column=Column(JSON), default_factory=list)
+    answer: str
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProposalTextModel(SQLModel, table=True):
+    """Compressed full text extracted from a proposal PDF.
+
+    Kept out of the proposals table so proposal reads and scans stay small;
+    loaded only when the text itself is needed.
+    """
+    __tablename__ = "proposal_texts"
+
+    proposal_id: str = Field(foreign_key="proposals.id", primary_key=True)
+    codec: str = Field(description="zstd | zlib")
+    data: bytes
+    size: int = Field(description="Uncompressed size in bytes (UTF-8)")
+    text_hash: str = Field(description="content_hash of the text")
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SearchDocModel(SQLModel, table=True):
+    """Row of the search_index FTS5 table (its rowid is this id)."""
+    __tablename__ = "search_docs"
+    __table_args__ = (Index("ix_search_docs_doc", "doc_type", "doc_id", unique=True),)
 
+    id: Optional[int] = Field(default=None, primary_key=True)
+    doc_type: str = Field(description="proposal | rfp")
+    doc_id: str
+    rfp_id: Optional[str] = Field(default=None, index=True)
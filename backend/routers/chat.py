@@ -1,35 +1,172 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import StreamingResponse
 
-from backend.schemas.chat import ChatRequest, ChatResponse, RFPChatRequest, RFPChatResponse
-from backend.services import chat_service, proposal_service
+from backend.schemas.chat import (
+    ChatRequest,
+    ChatResponse,
+    ChatSession,
+    ProposalsChatRequest,
+    ProposalsChatResponse,
+    RFPChatRequest,
+    RFPChatResponse,
+)
+from backend.services import chat_service, chat_session_service, proposal_service, rfp_service
+from backend.src.utils.sse import SSE_HEADERS, sse_event
 
 router = APIRouter(tags=["chat"])
 
 
+def _wants_session(session_id, history) -> bool:
+    """Server-side history unless a legacy client sends its own history without a session."""
+    return bool(session_id) or not history
+
+
 @router.post("/proposals/{proposal_id}/chat", response_model=ChatResponse)
-def chat_with_proposal(proposal_id: str, body: ChatRequest):
+def chat_with_proposal(proposal_id: str, body: ChatRequest, background_tasks: BackgroundTasks):
     if not proposal_service.get_proposal(proposal_id):
         raise HTTPException(status_code=404, detail="Proposal not found")
-    reply = chat_service.ask_about_proposal(proposal_id, body.message, body.conversation_history)
-    return ChatResponse(reply=reply)
+
+    if not _wants_session(body.session_id, body.conversation_history):
+        reply = chat_service.ask_about_proposal(proposal_id, body.message, body.conversation_history)
+        return ChatResponse(reply=reply)
+
+    chat = chat_session_service.open_session(body.session_id, "proposal", proposal_id)
+    reply = chat_service.ask_about_proposal(proposal_id, body.message, chat.turns, chat.summary)
+    chat_session_service.append_turns(chat.id, [
+        {"role": "user", "content": body.message},
+        {"role": "assistant", "content": reply},
+    ])
+    background_tasks.add_task(chat_session_service.compact_session, chat.id)
+    return ChatResponse(reply=reply, session_id=chat.id)
+
+
+@router.post("/proposals/{proposal_id}/chat/stream")
+def stream_chat_with_proposal(proposal_id: str, body: ChatRequest, background_tasks: BackgroundTasks):
+    """
+    Streaming variant of chat_with_proposal (Server-Sent Events): `token`
+    events with reply deltas, then `done` with the full reply and session id.
+    """
+    if not proposal_service.get_proposal(proposal_id):
+        raise HTTPException(status_code=404, detail="Proposal not found")
+
+    chat = None
+    history, summary = body.conversation_history, ""
+    if _wants_session(body.session_id, body.conversation_history):
+        chat = chat_session_service.open_session(body.session_id, "proposal", proposal_id)
+        history, summary = chat.turns, chat.summary
+        background_tasks.add_task(chat_session_service.compact_session, chat.id)
+
+    def events():
+        parts = []
+        for delta in chat_service.stream_about_proposal(proposal_id, body.message, history, summary):
+            parts.append(delta)
+            yield sse_event("token", {"text": delta})
+        reply = "".join(parts)
+        if chat:
+            chat_session_service.append_turns(chat.id, [
+                {"role": "user", "content": body.message},
+                {"role": "assistant", "content": reply},
+            ])
+        yield sse_event("done", {"reply": reply, "session_id": chat.id if chat else None})
+
+    # Background tasks (compaction) run after the stream has finished
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/rfps/{rfp_id}/chat", response_model=ProposalsChatResponse)
+def chat_with_rfp_proposals(rfp_id: str, body: ProposalsChatRequest, background_tasks: BackgroundTasks):
+    """One question answered across every proposal submitted for the RFP."""
+    if not rfp_service.get_rfp(rfp_id):
+        raise HTTPException(status_code=404, detail="RFP not found")
+
+    if not _wants_session(body.session_id, body.conversation_history):
+        result = chat_service.ask_about_rfp(rfp_id, body.message, body.conversation_history)
+        return ProposalsChatResponse(**result)
+
+    chat = chat_session_service.open_session(body.session_id, "rfp", rfp_id)
+    result = chat_service.ask_about_rfp(rfp_id, body.message, chat.turns, chat.summary)
+    chat_session_service.append_turns(chat.id, [
+        {"role": "user", "content": body.message},
+        {"role": "assistant", "content": result["reply"]},
+    ])
+    background_tasks.add_task(chat_session_service.compact_session, chat.id)
+    return ProposalsChatResponse(**result, session_id=chat.id)
+
+
+@router.get("/chat/sessions/{session_id}", response_model=ChatSession)
+def get_chat_session(session_id: str):
+    chat = chat_session_service.get_chat_session(session_id)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return chat
 
 
 @router.post("/chat/rfp", response_model=RFPChatResponse)
-def chat_for_rfp_creation(body: RFPChatRequest):
+def chat_for_rfp_creation(body: RFPChatRequest, background_tasks: BackgroundTasks):
     """
-    Stateful chat for creating an RFP. 
+    Stateful chat for creating an RFP.
     Receives current state + message -> Returns new state + reply.
     """
     from backend.services import rfp_consultant
-    
+
+    if not _wants_session(body.session_id, body.conversation_history):
+        result = rfp_consultant.consult_on_rfp(
+            message=body.message,
+            current_state=body.current_state,
+            history=body.conversation_history
+        )
+        return RFPChatResponse(reply=result["reply"], updated_state=result["updated_state"])
+
+    chat = chat_session_service.open_session(body.session_id, "rfp_consultant")
     result = rfp_consultant.consult_on_rfp(
         message=body.message,
         current_state=body.current_state,
-        history=body.conversation_history
+        history=chat.turns,
+        summary=chat.summary
     )
-    
+    chat_session_service.append_turns(chat.id, [
+        {"role": "user", "content": body.message},
+        {"role": "assistant", "content": result["reply"]},
+    ])
+    background_tasks.add_task(chat_session_service.compact_session, chat.id)
+
     return RFPChatResponse(
         reply=result["reply"],
-        updated_state=result["updated_state"]
+        updated_state=result["updated_state"],
+        session_id=chat.id
     )
 
+
+@router.post("/chat/rfp/stream")
+def stream_chat_for_rfp_creation(body: RFPChatRequest, background_tasks: BackgroundTasks):
+    """
+    Streaming variant of chat_for_rfp_creation (Server-Sent Events): `token`
+    events with reply deltas, then `done` with {reply, updated_state, session_id}.
+    """
+    from backend.services import rfp_consultant
+
+    chat = None
+    history, summary = body.conversation_history, ""
+    if _wants_session(body.session_id, body.conversation_history):
+        chat = chat_session_service.open_session(body.session_id, "rfp_consultant")
+        history, summary = chat.turns, chat.summary
+        background_tasks.add_task(chat_session_service.compact_session, chat.id)
+
+    def events():
+        for event, data in rfp_consultant.stream_consult_on_rfp(body.message, body.current_state, history, summary):
+            if event == "token":
+                yield sse_event("token", data)
+                continue
+            if chat:
+                chat_session_service.append_turns(chat.id, [
+                    {"role": "user", "content": body.message},
+                    {"role": "assistant", "content": data["reply"]},
+                ])
+            response = RFPChatResponse(
+                reply=data["reply"],
+                updated_state=data["updated_state"],
+                session_id=chat.id if chat else None
+            )
+            yield sse_event("done", response.model_dump())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.templating import Jinja2Templates
 
-from backend.services import proposal_service, review_service, rfp_service
+from backend.schemas.rfp import RfpSummary
+from backend.services import proposal_service, review_service, rfp_service, stats_service
+from backend.src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 templates = Jinja2Templates(directory="apps/web/templates")
 
@@ -10,26 +14,22 @@ router = APIRouter(tags=["pages"], include_in_schema=False)
 
 @router.get("/dashboard")
 def dashboard(request: Request):
-    rfps = rfp_service.list_rfps()
-    proposals = proposal_service.list_proposals()
-    total_rfps = len(rfps)
-    open_rfps = len([r for r in rfps if r.status == "open"])
-    expired_rfps = len([r for r in rfps if r.status == "expired"])
-    total_proposals = len(proposals)
-
-    # Aggregate stats per RFP for the detailed list
-    enriched_rfps = []
-    print(f"DEBUG: Total RFPs from service: {len(rfps)}")
-    for r in rfps:
-        p_list = proposal_service.list_proposals(rfp_id=r.id)
-        accepted_count = len([p for p in p_list if p.status == "approved"])
-        enriched_rfps.append({
-            "rfp": r,
-            "total_proposals": len(p_list),
-            "accepted_proposals": accepted_count
-        })
-    print(f"DEBUG: Enriched RFPs count: {len(enriched_rfps)}")
-    print(f"DEBUG: Enriched RFPs: {enriched_rfps}")
+    stats = stats_service.get_dashboard_stats()
+    total_rfps = stats["rfps"]["total"]
+    open_rfps = stats["rfps"]["by_status"].get("open", 0)
+    expired_rfps = stats["rfps"]["by_status"].get("expired", 0)
+    total_proposals = stats["proposals"]["total"]
+
+    # RFP listing columns and per-RFP totals both come from the aggregate
+    # query; no full RFP rows (requirements, form rows, caches) are loaded
+    enriched_rfps = [
+        {
+            "rfp": RfpSummary(id=row["rfp_id"], **{k: row[k] for k in RfpSummary.model_fields if k != "id"}),
+            "total_proposals": row["total_proposals"],
+            "accepted_proposals": row["accepted_proposals"],
+        }
+        for row in stats["per_rfp"]
+    ]
 
     return templates.TemplateResponse(
         "dashboard.html",
@@ -45,10 +45,17 @@ def dashboard(request: Request):
 
 
 @router.get("/rfps")
-def rfp_list(request: Request):
-    rfps = rfp_service.list_rfps()
+def rfp_list(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    try:
+        page = rfp_service.list_rfp_summaries(cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return templates.TemplateResponse(
-        "rfp_list.html", {"request": request, "rfps": rfps}
+        "rfp_list.html", {"request": request, "rfps": page.items, "next_cursor": page.next_cursor}
     )
 
 
@@ -1,39 +1,41 @@
+import asyncio
 from pathlib import Path
 from datetime import date
+from typing import Literal
+from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import Response, StreamingResponse
 
 from backend.config.settings import settings
-from backend.schemas.proposal import Proposal, ProposalCreate
+from backend.schemas.proposal import Proposal, ProposalCreate, ProposalPage
 from backend.schemas.review import ReviewResult
 from backend.services import notification_service, proposal_service, rfp_service
 from backend.services.ingest.extractor import extract_text
 from backend.services.ingest.parser import extract_emails
 from backend.services.ingest.ai_extractor import extract_details_with_ai
+from backend.services.ingest.amounts import minor_to_float, parse_amount
+from backend.src.utils.downloads import attachment_headers
+from backend.src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.workers import db_writer
 
 router = APIRouter(tags=["proposals"])
 
 
+def _as_list(value) -> list:
+    """AI bullet fields come back as a list, a single string or nothing."""
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
 def parse_price_to_float(value) -> float | None:
     """
     Safely parse a price value to float.
-    Handles: '$1,295,648.70', '1295648.70', 1295648.70, None
+    Handles: '$1,295,648.70', '1295648.70', 1295648.70, '(1,200.00)', 'EUR 950', None
     """
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        # Remove $, commas, whitespace
-        cleaned = value.replace('$', '').replace(',', '').strip()
-        if not cleaned:
-            return None
-        try:
-            return float(cleaned)
-        except ValueError:
-            return None
-    return None
-
+    minor, currency, _ = parse_amount(value)
+    return minor_to_float(minor, currency)
 
 
 @router.get("/proposals", response_model=list[Proposal])
@@ -41,6 +43,23 @@ def list_proposals(rfp_id: str | None = None):
     return proposal_service.list_proposals(rfp_id=rfp_id)
 
 
+@router.get("/proposals/summary", response_model=ProposalPage)
+def list_proposal_summaries(
+    rfp_id: str | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Lightweight proposal listing (no extracted text, form data or bullet
+    arrays), newest first. Pass `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        return proposal_service.list_proposal_summaries(rfp_id=rfp_id, status=status, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/proposals", response_model=Proposal, status_code=201)
 def create_proposal(payload: ProposalCreate):
     if not rfp_service.get_rfp(payload.rfp_id):
@@ -50,6 +69,7 @@ def create_proposal(payload: ProposalCreate):
 
 @router.post("/proposals/upload", response_model=Proposal, status_code=201)
 async def upload_proposal(
+    background_tasks: BackgroundTasks,
     rfp_id: str = Form(...),
     contractor: str = Form(...),
     price: float | None = Form(None),
@@ -59,25 +79,23 @@ async def upload_proposal(
     contractor_email: str | None = Form(None),
     file: UploadFile = File(...),
 ):
-    """Create a proposal plus upload a PDF for AI to read."""
-    if not rfp_service.get_rfp(rfp_id):
-        raise HTTPException(status_code=404, detail="RFP not found")
+    """
+    Create a proposal plus upload a PDF for AI to read.
 
-    payload = ProposalCreate(
-        rfp_id=rfp_id,
-        contractor=contractor,
-        contractor_email=contractor_email,
-        price=price,
-        currency=currency,
-        start_date=start_date,
-        summary=summary,
-    )
-    proposal = proposal_service.create_proposal(payload)
+    Extraction runs first and the finished proposal (fields, form rows,
+    text) is written in a single transaction at the end, so a failed upload
+    never leaves a half-filled row behind. The id is generated up front for
+    the file name and vector collection.
+    """
+    rfp = await rfp_service.get_rfp_async(rfp_id)
+    if not rfp:
+        raise HTTPException(status_code=404, detail="RFP not found")
+    proposal_id = str(uuid4())
 
     # Save file to storage and extract text
     base = Path(settings.storage_path) / "proposals" / rfp_id
     base.mkdir(parents=True, exist_ok=True)
-    pdf_path = base / f"{proposal.id}.pdf"
+    pdf_path = base / f"{proposal_id}.pdf"
     with pdf_path.open("wb") as f:
         f.write(await file.read())
 
@@ -113,15 +131,14 @@ async def upload_proposal(
         from backend.src.agents.ingestion import ingest_document
         
         # Get the RFP's form schema (already extracted when RFP was uploaded)
-        rfp = rfp_service.get_rfp(rfp_id)
-        rfp_schema = rfp.proposal_form_schema if rfp else None
+        rfp_schema = rfp.proposal_form_schema
         
         if rfp_schema and rfp_schema.get('fixed_columns'):
             print(f"--- Extracting vendor form using RFP's SCHEMA (not re-discovering) ---")
             print(f"  RFP Schema: fixed={rfp_schema.get('fixed_columns')}, vendor={rfp_schema.get('vendor_columns')}")
             
             # Ingest vendor proposal PDF into a unique collection
-            vendor_collection = f"Vendor_Proposal_{proposal.id}"
+            vendor_collection = f"Vendor_Proposal_{proposal_id}"
             ingest_document(str(pdf_path), collection_name=vendor_collection, reset=True)
             
             # Use FormStructureAnalyzer but with RFP's schema
@@ -173,7 +190,7 @@ async def upload_proposal(
             from backend.src.agents.form_structure_analyzer import FormStructureAnalyzer
             from backend.src.agents.ingestion import ingest_document
             
-            vendor_collection = f"Vendor_Proposal_{proposal.id}"
+            vendor_collection = f"Vendor_Proposal_{proposal_id}"
             ingest_document(str(pdf_path), collection_name=vendor_collection, reset=True)
             
             analyzer = FormStructureAnalyzer()
@@ -238,89 +255,54 @@ async def upload_proposal(
         if emails:
             contractor_email = emails[0]
     
-    proposal_service.update_extracted_text(proposal.id, text)
-    
-    # Update fields that might have been populated by AI or extraction
-    # We always update if we have new values to ensure persistence
-    refreshed = proposal_service.get_proposal(proposal.id)
-    if refreshed:
-        from backend.models.db import get_session
-        from backend.models.entities import ProposalModel
-        with get_session() as session:
-            db_p = session.get(ProposalModel, proposal.id)
-            if db_p:
-                if contractor_email:
-                    db_p.contractor_email = contractor_email
-                
-                # Update other fields if they were extracted and differ
-                if contractor and contractor != db_p.contractor:
-                    db_p.contractor = contractor
-                if price is not None and price != db_p.price:
-                    parsed_price = parse_price_to_float(price)
-                    if parsed_price is not None:
-                        db_p.price = parsed_price
-                if currency and currency != db_p.currency:
-                    db_p.currency = currency
-                if start_date and start_date != db_p.start_date:
-                    if isinstance(start_date, str):
-                        try:
-                            db_p.start_date = date.fromisoformat(start_date)
-                        except ValueError:
-                            pass
-                    else:
-                         db_p.start_date = start_date
-                if summary and summary != db_p.summary:
-                    db_p.summary = summary
-                
-                # Update NEW enhanced extraction fields (JSON arrays)
-                if experience:
-                    db_p.experience = experience if isinstance(experience, list) else [experience]
-                if scope_understanding:
-                    db_p.scope_understanding = scope_understanding if isinstance(scope_understanding, list) else [scope_understanding]
-                if materials:
-                    db_p.materials = materials if isinstance(materials, list) else [materials]
-                if timeline:
-                    db_p.timeline = timeline if isinstance(timeline, list) else [timeline]
-                if warranty:
-                    db_p.warranty = warranty if isinstance(warranty, list) else [warranty]
-                if safety:
-                    db_p.safety = safety if isinstance(safety, list) else [safety]
-                if cost_breakdown:
-                    db_p.cost_breakdown = cost_breakdown if isinstance(cost_breakdown, list) else [cost_breakdown]
-                if termination_term:
-                    db_p.termination_term = termination_term if isinstance(termination_term, list) else [termination_term]
-                if references:
-                    db_p.references = references if isinstance(references, list) else [references]
-                
-                # Legacy fields (backward compatibility)
-                if methodology:
-                    db_p.methodology = methodology
-                if warranties:
-                    db_p.warranties = warranties
-                if timeline_details:
-                    db_p.timeline_details = timeline_details
-
-                # Save dynamic dimensions
-                if dimensions := extracted_data.get("dimensions"):
-                    if isinstance(dimensions, dict):
-                        db_p.dimensions = dimensions
-                
-                # Save vendor proposal form data (NEW)
-                if proposal_form_data := extracted_data.get("proposal_form_data"):
-                    if isinstance(proposal_form_data, list):
-                        db_p.proposal_form_data = proposal_form_data
-                    
-                session.add(db_p)
-                session.commit()
+    if isinstance(start_date, str):
+        try:
+            start_date = date.fromisoformat(start_date)
+        except ValueError:
+            start_date = None
 
+    dimensions = extracted_data.get("dimensions")
+    payload = ProposalCreate(
+        rfp_id=rfp_id,
+        contractor=contractor,
+        contractor_email=contractor_email,
+        price=price,
+        currency=currency or "USD",
+        start_date=start_date,
+        summary=summary,
+        experience=_as_list(experience),
+        scope_understanding=_as_list(scope_understanding),
+        materials=_as_list(materials),
+        timeline=_as_list(timeline),
+        warranty=_as_list(warranty),
+        safety=_as_list(safety),
+        cost_breakdown=_as_list(cost_breakdown),
+        termination_term=_as_list(termination_term),
+        references=_as_list(references),
+        methodology=methodology or None,
+        warranties=warranties or None,
+        timeline_details=timeline_details or None,
+        extracted_text=text,
+        dimensions=dimensions if isinstance(dimensions, dict) else {},
+        proposal_form_data=vendor_form_data if isinstance(vendor_form_data, list) else [],
+    )
+    # Price normalization, form-row normalization and the compressed text all go in this one
+    # transaction, run on the writer thread so concurrent uploads never race for the write lock
+    proposal = await asyncio.wrap_future(
+        db_writer.submit(proposal_service.create_proposal, payload, proposal_id=proposal_id)
+    )
+
+    # Warm the stored AI review so the comparison page reads it instead of evaluating
+    from backend.services import review_service
+    background_tasks.add_task(review_service.warm_review, proposal.id)
 
-    # Return refreshed proposal with extracted_text set
-    return proposal_service.get_proposal(proposal.id)
+    # create_proposal returns the stored proposal with extracted_text set
+    return proposal
 
 
 @router.get("/proposals/{proposal_id}", response_model=Proposal)
 def get_proposal(proposal_id: str):
-    proposal = proposal_service.get_proposal(proposal_id)
+    proposal = proposal_service.get_proposal(proposal_id, with_text=True)
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
     return proposal
@@ -365,7 +347,16 @@ def reject_proposal(proposal_id: str):
 
 
 @router.get("/proposals/{rfp_id}/matrix")
-async def get_proposal_matrix(rfp_id: str):
+async def get_proposal_matrix(
+    rfp_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first line item to return"),
+    limit: int | None = Query(None, ge=1, description="Max line items to return (all if omitted)"),
+    vendors: str | None = Query(None, description="Comma-separated proposal IDs to include"),
+    sort_by: str | None = Query(None, description="Proposal ID whose line totals order the rows"),
+    sort_dir: Literal["asc", "desc"] = "asc",
+    filter_status: Literal["quoted", "tbd", "n/a", "not_quoted"] | None = Query(None, description="Keep rows with this quote status"),
+    filter_vendor: str | None = Query(None, description="Proposal ID the status filter applies to (any vendor if omitted); alone, keeps the rows this vendor responded to"),
+):
     """
     Returns a unified comparison matrix of the RFP line items 
     vs the filled values from each vendor proposal.
@@ -374,82 +365,40 @@ async def get_proposal_matrix(rfp_id: str):
     - Majority voting: >50% match with RFP → Fixed column
     - AI semantic check: For ambiguous columns
     - Cached per RFP + proposal set
+
+    WINDOWING:
+    - Rows are filtered, sorted, then sliced with offset/limit; follow
+      `next_offset` until it is null to page through the matrix.
+    - `vendors` projects the vendor columns onto a subset of proposals.
+    - `filter_status` keeps rows where any vendor (or `filter_vendor`)
+      has that quote status; `filter_vendor` alone keeps the rows that
+      vendor has a line for (any status but not_quoted).
+    - Vendor grand totals always cover every line item, and the grand
+      total row is appended to the last window only.
     """
-    from backend.services.column_classifier import (
-        classify_columns_majority_voting,
-        classify_with_ai_fallback,
-        get_cached_classification,
-        build_cache
-    )
-    from backend.models.db import get_session
-    from backend.models.entities import RfpModel
+    from backend.services import matrix_service
 
-    rfp = rfp_service.get_rfp(rfp_id)
-    if not rfp:
+    layout = await matrix_service.load_matrix_layout(rfp_id)
+    if not layout:
         raise HTTPException(status_code=404, detail="RFP not found")
-        
-    proposals = proposal_service.list_proposals(rfp_id=rfp_id)
-    rfp_rows = rfp.proposal_form_rows or []
-    
-    # Consensus Logic: If RFP has no rows, try to elect a structure from proposals
-    if not rfp_rows and proposals:
-        try:
-            from backend.src.agents.comparison_matrix_builder import ComparisonMatrixBuilder
-            from backend.src.agents.vendor_data_extractor import VendorProposalData, FilledFormRow
-            
-            # Convert DB proposals to VendorProposalData objects for the builder
-            vendor_proposals = []
-            for p in proposals:
-                if p.proposal_form_data:
-                    filled_rows = []
-                    for row in p.proposal_form_data:
-                        # Convert dict back to FilledFormRow key-value pairs
-                        # Note: proposal_form_data in DB is a list of dicts with keys matching schema
-                        # We need to adapt it to what FilledFormRow expects if it's different
-                        # But ComparisonMatrixBuilder uses checking of 'values' dict mostly.
-                        # Let's check how VendorProposalData expects it.
-                        # It expects filled_rows to be list of DynamicFilledRow/FilledFormRow
-                        
-                        # Simplification: Assume the dict in DB *IS* the row data
-                        # We need to map it to a structure with 'values' dict or similar
-                        
-                        # Strategy: Adapt DB dict to 'values' dict
-                        values_dict = {
-                            k: (str(v) if v is not None else "") 
-                            for k, v in row.items() 
-                            if k not in ["item_id", "description", "section"]
-                        }
-                        
-                        filled_rows.append(FilledFormRow(
-                            section=row.get("section", ""),
-                            item_id=row.get("item_id", ""),
-                            description=row.get("description", ""),
-                            values=values_dict
-                        ))
-                    
-                    vendor_proposals.append(VendorProposalData(
-                        proposal_id=str(p.id),
-                        rfp_id=str(rfp.id),
-                        vendor_name=p.contractor or "Unknown",
-                        filled_rows=filled_rows
-                    ))
-            
-            # Elect structure
-            if vendor_proposals:
-                builder = ComparisonMatrixBuilder()
-                elected_structure = builder._elect_structure_from_proposals(vendor_proposals)
-                
-                if elected_structure and elected_structure.rows:
-                    print(f"✓ Elected consensus structure from proposals: {len(elected_structure.rows)} rows")
-                    # Convert elected rows back to list of dicts for this endpoint
-                    rfp_rows = [r.model_dump() for r in elected_structure.rows]
-                    
-                    # Also update valid columns if possible
-                    # But the rest of the function determines that.
-        except Exception as e:
-            print(f"⚠ Consensus election failed: {e}")
-
-    if not rfp_rows:
+
+    rfp = layout.rfp
+    proposal_ids = {p.id for p in layout.proposals}
+
+    # --- Column projection ---
+    proposals = layout.proposals
+    if vendors:
+        selected = [v.strip() for v in vendors.split(",") if v.strip()]
+        unknown = [v for v in selected if v not in proposal_ids]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown proposal IDs in vendors: {unknown}")
+        proposals = [p for p in layout.proposals if p.id in selected]
+
+    for param, value in (("sort_by", sort_by), ("filter_vendor", filter_vendor)):
+        if value and value not in proposal_ids:
+            raise HTTPException(status_code=400, detail=f"Unknown proposal ID in {param}: {value}")
+
+    if not layout.rfp_rows:
         return {
             "rfp_title": rfp.title,
             "fixed_columns": [],
@@ -458,128 +407,171 @@ async def get_proposal_matrix(rfp_id: str):
             "rows": [],
             "message": "No RFP proposal form rows found"
         }
-    
-    # Get proposal IDs with form data
-    proposals_with_data = [p for p in proposals if p.proposal_form_data]
-    proposal_ids_with_data = [p.id for p in proposals_with_data]
-    
-    # --- Check cache ---
-    cached = get_cached_classification(rfp.comparison_matrix_cache or {}, proposal_ids_with_data)
-    
-    if cached:
-        fixed_columns, vendor_columns = cached
-        print(f"✓ Using cached classification: fixed={fixed_columns}, vendor={vendor_columns}")
-    else:
-        # --- Run classification ---
-        print("→ Running column classification...")
-        
-        # Prepare vendor data for classifier
-        vendor_data = [
-            {"id": p.id, "proposal_form_data": p.proposal_form_data}
-            for p in proposals
-        ]
-        
-        # First try majority voting only (faster)
-        fixed_columns, vendor_columns, ambiguous = classify_columns_majority_voting(
-            rfp_rows, vendor_data, threshold=0.5
-        )
-        
-        # If we have ambiguous columns, use AI fallback
-        if ambiguous:
-            print(f"  → Ambiguous columns detected: {ambiguous}, running AI check...")
-            fixed_columns, vendor_columns = await classify_with_ai_fallback(
-                rfp_rows, vendor_data, threshold=0.5
-            )
-        
-        print(f"  ✓ Classification: fixed={fixed_columns}, vendor={vendor_columns}")
-        
-        # --- Save cache ---
-        new_cache = build_cache(fixed_columns, vendor_columns, proposal_ids_with_data)
-        with get_session() as session:
-            db_rfp = session.get(RfpModel, rfp_id)
-            if db_rfp:
-                db_rfp.comparison_matrix_cache = new_cache
-                session.add(db_rfp)
-                session.commit()
-                print(f"  ✓ Saved classification cache for RFP {rfp_id[:8]}")
-    
-    # --- Helper functions ---
-    def get_vendor_row(proposal, item_id):
-        """Find vendor row matching RFP item_id."""
-        for row in (proposal.proposal_form_data or []):
-            if str(row.get('item_id', '')).strip() == str(item_id).strip():
-                return row
-        return None
-    
-    def parse_number(value):
-        if not value or str(value).upper() in ('TBD', 'N/A', '-', '$-', ''):
-            return None
-        try:
-            cleaned = str(value).replace('$', '').replace(',', '').strip()
-            return float(cleaned)
-        except (ValueError, TypeError):
-            return None
-    
+
+    fixed_columns = layout.fixed_columns
+    vendor_columns = layout.vendor_columns
+
     # Find Total column for grand total
-    total_column = next((c for c in vendor_columns if 'total' in c.lower()), None)
+    total_column = layout.total_column
     vendor_grand_totals = {p.id: 0.0 for p in proposals}
-    
+
+    # --- Align every row once; grand totals cover the full set ---
+    aligned = []
+    for rfp_row, vendor_rows in matrix_service.iter_aligned_rows(layout):
+        aligned.append((rfp_row, vendor_rows))
+        for p in proposals:
+            total_num = matrix_service.row_total(vendor_rows[p.id], total_column)
+            if total_num is not None:
+                vendor_grand_totals[p.id] += total_num
+
+    # --- Filter ---
+    if filter_status or filter_vendor:
+        status_vendors = [filter_vendor] if filter_vendor else [p.id for p in proposals]
+
+        def keep(vendor_rows) -> bool:
+            statuses = [matrix_service.quote_status(vendor_rows[pid], total_column) for pid in status_vendors]
+            if filter_status:
+                return filter_status in statuses
+            return any(status != "not_quoted" for status in statuses)
+
+        aligned = [(rfp_row, vendor_rows) for rfp_row, vendor_rows in aligned if keep(vendor_rows)]
+
+    # --- Sort (rows without a numeric total always go last) ---
+    if sort_by:
+        def sort_key(entry):
+            value = matrix_service.row_total(entry[1][sort_by], total_column)
+            if value is None:
+                return (1, 0.0)
+            return (0, -value if sort_dir == "desc" else value)
+        aligned.sort(key=sort_key)
+
+    # --- Window ---
+    total_rows = len(aligned)
+    end = total_rows if limit is None else min(offset + limit, total_rows)
+    window = aligned[offset:end]
+    next_offset = end if end < total_rows else None
+
     # --- Build matrix rows ---
     matrix_rows = []
     
-    for rfp_row in rfp_rows:
-        item_id = rfp_row.get('item_id')
-        
+    for rfp_row, vendor_rows in window:
         # Fixed values from RFP
         fixed_values = {col: rfp_row.get(col) for col in fixed_columns}
         
         # Vendor-specific values
-        vendor_values = {}
-        for p in proposals:
-            vendor_row = get_vendor_row(p, item_id)
-            values = {}
-            
-            for col in vendor_columns:
-                if vendor_row:
-                    values[col] = vendor_row.get(col) or "-"
-                else:
-                    values[col] = "Not Quoted"
-            
-            # Add to grand total
-            if total_column and vendor_row:
-                total_num = parse_number(vendor_row.get(total_column) or vendor_row.get('total'))
-                if total_num is not None:
-                    vendor_grand_totals[p.id] += total_num
-            
-            vendor_values[p.id] = values
+        vendor_values = {
+            p.id: {col: matrix_service.vendor_cell(vendor_rows[p.id], col) for col in vendor_columns}
+            for p in proposals
+        }
         
         matrix_rows.append({
             "fixed_values": fixed_values,
             "vendor_values": vendor_values
         })
     
-    # --- Grand Total row ---
-    grand_total_fixed = {col: ("GRAND TOTAL" if col in ('description', 'item_id') else "") for col in fixed_columns}
-    grand_total_vendor = {}
-    
-    for p in proposals:
-        values = {}
-        if total_column:
-            values[total_column] = f"${vendor_grand_totals[p.id]:,.2f}"
-        grand_total_vendor[p.id] = values
-    
-    matrix_rows.append({
-        "is_grand_total": True,
-        "fixed_values": grand_total_fixed,
-        "vendor_values": grand_total_vendor
-    })
+    # --- Grand Total row (last window only) ---
+    if next_offset is None:
+        grand_total_fixed = {col: ("GRAND TOTAL" if col in ('description', 'item_id') else "") for col in fixed_columns}
+        grand_total_vendor = {}
+        
+        for p in proposals:
+            values = {}
+            if total_column:
+                values[total_column] = f"${vendor_grand_totals[p.id]:,.2f}"
+            grand_total_vendor[p.id] = values
+        
+        matrix_rows.append({
+            "is_grand_total": True,
+            "fixed_values": grand_total_fixed,
+            "vendor_values": grand_total_vendor
+        })
         
     return {
         "rfp_title": rfp.title,
         "fixed_columns": fixed_columns,
         "vendor_columns": vendor_columns,
         "proposals": [{"id": p.id, "vendor": p.contractor, "status": p.status} for p in proposals],
-        "rows": matrix_rows
+        "rows": matrix_rows,
+        "total_rows": total_rows,
+        "offset": offset,
+        "next_offset": next_offset,
+        "vendor_grand_totals": vendor_grand_totals if total_column else {},
     }
 
 
+@router.get("/proposals/{rfp_id}/matrix/analytics")
+async def get_proposal_matrix_analytics(rfp_id: str):
+    """
+    Bid leveling statistics for the comparison matrix.
+
+    Per line item: quote count, min/median/max, spread, low bidder,
+    z-score outliers and vendors with no quote. Per vendor: quoted and
+    missing items, low bids, outliers and a front-loading index
+    (unbalanced bidding when early items are priced well above the market).
+    Cached until any line item or vendor value changes.
+    """
+    from backend.services import bid_analytics, matrix_service
+
+    layout = await matrix_service.load_matrix_layout(rfp_id)
+    if not layout:
+        raise HTTPException(status_code=404, detail="RFP not found")
+    return bid_analytics.get_analytics(layout)
+
+
+@router.get("/proposals/{rfp_id}/matrix/export.xlsx")
+async def export_proposal_matrix_xlsx(rfp_id: str):
+    """
+    Streams the comparison matrix as an Excel workbook.
+
+    Worksheet rows are serialized straight into the streamed zip with
+    shared named styles, so the workbook is written with constant memory
+    and nothing is written to disk (the matrix layout itself is loaded in
+    full first).
+    """
+    from backend.services import matrix_export, matrix_service
+
+    layout = await matrix_service.load_matrix_layout(rfp_id)
+    if not layout:
+        raise HTTPException(status_code=404, detail="RFP not found")
+
+    filename = f"Comparison_{layout.rfp.title.replace(' ', '_')}.xlsx"
+    return StreamingResponse(
+        matrix_export.stream_matrix_xlsx(layout),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers=attachment_headers(filename)
+    )
+
+
+@router.get("/proposals/{rfp_id}/matrix/export.{fmt}")
+async def export_proposal_matrix_table(
+    rfp_id: str,
+    fmt: Literal["csv", "arrow", "parquet"],
+    table: Literal["line_items", "totals"] = "line_items",
+):
+    """
+    Exports the aligned line-item matrix (one record per item and vendor)
+    or the vendor totals as CSV, Arrow IPC stream or Parquet.
+    """
+    from backend.services import matrix_export, matrix_service
+
+    layout = await matrix_service.load_matrix_layout(rfp_id)
+    if not layout:
+        raise HTTPException(status_code=404, detail="RFP not found")
+
+    filename = f"Comparison_{layout.rfp.title.replace(' ', '_')}_{table}.{fmt}"
+    headers = attachment_headers(filename)
+
+    if fmt == "csv":
+        return StreamingResponse(
+            matrix_export.stream_matrix_csv(layout, table),
+            media_type="text/csv",
+            headers=headers
+        )
+
+    try:
+        content = matrix_export.matrix_arrow_bytes(layout, fmt, table)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Arrow/Parquet export requires pyarrow")
+
+    media_type = "application/vnd.apache.parquet" if fmt == "parquet" else "application/vnd.apache.arrow.stream"
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -1,10 +1,12 @@
 from typing import List
 from io import BytesIO
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Query
 from fastapi.responses import StreamingResponse
 
-from backend.schemas.rfp import Rfp as RFP, RfpCreate as RFPCreate, RfpBase as RFPUpdate
+from backend.schemas.rfp import Rfp as RFP, RfpCreate as RFPCreate, RfpBase as RFPUpdate, RfpPage
 from backend.services import rfp_service, proposal_service, report_service
+from backend.src.utils.downloads import attachment_headers
+from backend.src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(tags=["rfps"])
 
@@ -14,6 +16,19 @@ def list_rfps():
     return rfp_service.list_rfps()
 
 
+@router.get("/rfps/summary", response_model=RfpPage)
+def list_rfp_summaries(
+    status: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Lightweight RFP listing, newest first; pass `next_cursor` back as `cursor` for the next page."""
+    try:
+        return rfp_service.list_rfp_summaries(status=status, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/rfps", response_model=RFP, status_code=201)
 def create_rfp(payload: RFPCreate):
     print(f"DEBUG: Received RFP create payload: {payload.model_dump()}")
@@ -21,9 +36,14 @@ def create_rfp(payload: RFPCreate):
 
 
 @router.delete("/rfps/{rfp_id}", status_code=204)
-def delete_rfp(rfp_id: str):
-    if not rfp_service.delete_rfp(rfp_id):
+def delete_rfp(rfp_id: str, background_tasks: BackgroundTasks):
+    """Delete an RFP with its proposals; vector collections and PDFs are removed after the response."""
+    from backend.services import cleanup_service
+
+    proposal_ids = rfp_service.delete_rfp(rfp_id)
+    if proposal_ids is None:
         raise HTTPException(status_code=404, detail="RFP not found")
+    background_tasks.add_task(cleanup_service.remove_rfp_artifacts, rfp_id, proposal_ids)
     return {"ok": True}
 
 @router.get("/rfps/{rfp_id}/pdf")
@@ -41,10 +61,30 @@ def download_rfp_pdf(rfp_id: str):
     return StreamingResponse(
         buffer, 
         media_type="application/pdf", 
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=attachment_headers(filename)
     )
 
 
+@router.get("/rfps/{rfp_id}/coverage")
+def get_requirement_coverage(rfp_id: str, verify: bool = False):
+    """
+    Requirement × proposal coverage matrix from embeddings.
+
+    Each cell holds the best-matching proposal snippet, its page, a cosine
+    score and a status (covered / borderline / not_covered). No LLM is used
+    unless `verify=true`, which settles borderline cells only.
+    """
+    from backend.services import coverage_service
+
+    try:
+        coverage = coverage_service.build_coverage(rfp_id, verify=verify)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=f"Vector store unavailable: {e}")
+    if coverage is None:
+        raise HTTPException(status_code=404, detail="RFP not found")
+    return coverage
+
+
 @router.get("/rfps/{rfp_id}", response_model=RFP)
 def get_rfp(rfp_id: str):
     rfp = rfp_service.get_rfp(rfp_id)
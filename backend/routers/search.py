@@ -0,0 +1,20 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
+
+from backend.schemas.search import SearchResults
+from backend.services import search_service
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=SearchResults)
+def search(
+    q: str = Query(..., min_length=1),
+    type: Optional[Literal["proposal", "rfp"]] = None,
+    rfp_id: Optional[str] = None,
+    limit: int = Query(search_service.DEFAULT_LIMIT, ge=1, le=100),
+):
+    """Full-text search over RFPs and proposals, best match first, with highlighted snippets."""
+    results = search_service.search(q, doc_type=type, rfp_id=rfp_id, limit=limit)
+    return SearchResults(query=q, results=results)
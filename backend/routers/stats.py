@@ -0,0 +1,20 @@
+from typing import Dict
+
+from fastapi import APIRouter
+
+from backend.schemas.stats import CacheMetrics, DashboardStats
+from backend.services import entity_cache, stats_service
+
+router = APIRouter(tags=["stats"])
+
+
+@router.get("/stats/dashboard", response_model=DashboardStats)
+def get_dashboard_stats():
+    """RFP/proposal counts by status, proposals and acceptances per RFP, price ranges."""
+    return stats_service.get_dashboard_stats()
+
+
+@router.get("/stats/cache", response_model=Dict[str, CacheMetrics])
+def get_cache_metrics():
+    """Size and hit rate of the RFP and proposal entity caches (this process only)."""
+    return entity_cache.metrics()
@@ -0,0 +1,23 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class Dimension(BaseModel):
+    id: str
+    name: str
+    description: str
+    weight: int = 10
+    keywords: List[str] = []
+    type: str = "dynamic"  # 'general' or 'dynamic'
+
+
+# The six standard dimensions every RFP is evaluated on
+GENERAL_DIMENSIONS: List[Dimension] = [
+    Dimension(id="experience", name="Experience", description="Vendor track record", type="general", keywords=["experience", "years", "projects"]),
+    Dimension(id="cost", name="Cost", description="Total project cost", type="general", keywords=["price", "cost", "budget"]),
+    Dimension(id="materials_warranty", name="Materials/Warranty", description="Material quality and warranty terms", type="general", keywords=["materials", "warranty", "guarantee"]),
+    Dimension(id="schedule", name="Schedule", description="Project timeline", type="general", keywords=["schedule", "timeline", "completion"]),
+    Dimension(id="safety", name="Safety", description="Safety practices and compliance", type="general", keywords=["safety", "osha", "compliance"]),
+    Dimension(id="responsiveness", name="Responsiveness", description="Communication and availability", type="general", keywords=["responsive", "communication", "availability"]),
+]
@@ -1,15 +1,55 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
 class ChatRequest(BaseModel):
     proposal_id: str
     message: str = Field(..., example="What are the payment terms?")
+    # Legacy: client-held history, only used when no session_id is sent
     conversation_history: list[dict] = Field(default_factory=list)
+    session_id: Optional[str] = None
 
 
 
 class ChatResponse(BaseModel):
     reply: str
+    session_id: Optional[str] = None
+
+
+class ProposalsChatRequest(BaseModel):
+    """Question across all proposals for an RFP."""
+    message: str = Field(..., example="Which vendors exclude mobilization?")
+    conversation_history: list[dict] = Field(default_factory=list)
+    session_id: Optional[str] = None
+
+
+class ChatSource(BaseModel):
+    proposal_id: str
+    vendor: str
+    page: Optional[int] = None
+    score: float
+
+
+class ProposalsChatResponse(BaseModel):
+    reply: str
+    sources: list[ChatSource] = []
+    session_id: Optional[str] = None
+
+
+class ChatSession(BaseModel):
+    id: str
+    kind: str
+    subject_id: Optional[str] = None
+    summary: str = ""
+    turns: list[dict] = []  # Recent turns: {role: 'user'|'assistant', content: str}
+    summarized_turns: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
 
 
 # --- RFP Creation Chat Schemas ---
@@ -25,8 +65,10 @@ class RFPChatRequest(BaseModel):
     message: str
     current_state: RFPState
     conversation_history: list[dict] = []  # List of {role: 'user'|'ai', text: str}
+    session_id: Optional[str] = None
 
 class RFPChatResponse(BaseModel):
     reply: str
     updated_state: RFPState
+    session_id: Optional[str] = None
 
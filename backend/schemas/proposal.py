@@ -10,6 +10,8 @@ class ProposalBase(BaseModel):
     contractor_email: Optional[str] = Field(None, example="bid-team@example.com")
     price: Optional[float] = Field(None, example=45000.0)
     currency: str = Field(default="USD")
+    price_minor: Optional[int] = Field(None, description="Price in integer minor units (e.g. cents)")
+    price_status: Optional[str] = Field(None, description="quoted, tbd, n/a or not_quoted")
     start_date: Optional[date] = None
     summary: Optional[str] = None
     
@@ -46,3 +48,24 @@ class Proposal(ProposalBase):
     class Config:
         from_attributes = True
 
+
+
+class ProposalSummary(BaseModel):
+    """Listing projection: no extracted text, form data or bullet arrays."""
+    id: str
+    rfp_id: str
+    contractor: str
+    contractor_email: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "USD"
+    price_status: Optional[str] = None
+    start_date: Optional[date] = None
+    summary: Optional[str] = None
+    has_experience: bool = False
+    status: str
+    created_at: datetime
+
+
+class ProposalPage(BaseModel):
+    items: List[ProposalSummary]
+    next_cursor: Optional[str] = None
@@ -41,3 +41,19 @@ class Rfp(RfpBase):
     class Config:
         from_attributes = True
 
+
+
+class RfpSummary(BaseModel):
+    """Listing projection: no requirements, proposal form or cached analysis columns."""
+    id: str
+    title: str
+    budget: Optional[int] = None
+    currency: str = "USD"
+    deadline: Optional[date] = None
+    status: str
+    created_at: datetime
+
+
+class RfpPage(BaseModel):
+    items: List[RfpSummary]
+    next_cursor: Optional[str] = None
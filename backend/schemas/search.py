@@ -0,0 +1,17 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    doc_type: str
+    doc_id: str
+    rfp_id: Optional[str] = None
+    title: str
+    snippet: str
+    rank: float
+
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchHit]
@@ -0,0 +1,46 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class RfpProposalStats(BaseModel):
+    rfp_id: str
+    title: str
+    status: str
+    budget: Optional[float] = None
+    currency: str = "USD"
+    deadline: Optional[date] = None
+    created_at: datetime
+    total_proposals: int
+    accepted_proposals: int
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    price_avg: Optional[float] = None
+
+
+class RfpCounts(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    with_proposals: int
+
+
+class ProposalCounts(BaseModel):
+    total: int
+    by_status: Dict[str, int]  # Lower-cased status
+    accepted: int
+
+
+class DashboardStats(BaseModel):
+    rfps: RfpCounts
+    proposals: ProposalCounts
+    per_rfp: List[RfpProposalStats]
+    generated_at: datetime
+
+
+class CacheMetrics(BaseModel):
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_rate: Optional[float] = None
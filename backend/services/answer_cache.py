@@ -0,0 +1,64 @@
+"""
+Semantic Answer Cache
+
+Stores proposal chat answers under a version of their inputs (the proposal
+and the RFP digest, see chat_service.answer_version) and the embedding of
+the question. A new question whose embedding is close enough to a cached
+one (cosine >= ANSWER_CACHE_THRESHOLD) on the same version gets the stored
+answer without an LLM call; editing the proposal or the RFP retires old
+answers. Only questions asked without prior turns are cached, since
+follow-ups depend on the conversation. Lookups are read-only.
+"""
+
+from typing import Optional
+
+import numpy as np
+from sqlmodel import delete, select
+
+from backend.models.db import get_session
+from backend.models.entities import AnswerCacheModel
+
+ANSWER_CACHE_THRESHOLD = 0.92
+
+
+def lookup(proposal_id: str, version: str, query_vector: np.ndarray) -> Optional[str]:
+    """The cached answer to the most similar question, if it clears the threshold."""
+    with get_session() as session:
+        rows = session.exec(
+            select(AnswerCacheModel).where(
+                AnswerCacheModel.proposal_id == proposal_id,
+                AnswerCacheModel.proposal_version == version,
+            )
+        ).all()
+        # Vectors from a different embedding model cannot be compared
+        rows = [r for r in rows if len(r.question_vector) == query_vector.shape[-1]]
+        if not rows:
+            return None
+
+        vectors = np.asarray([r.question_vector for r in rows], dtype=np.float32)
+        similarity = vectors @ query_vector.reshape(-1)
+        best = int(similarity.argmax())
+        if similarity[best] < ANSWER_CACHE_THRESHOLD:
+            return None
+
+        print(f"✓ Answer cache hit for proposal {proposal_id[:8]} (similarity {similarity[best]:.3f})")
+        return rows[best].answer
+
+
+def store(proposal_id: str, version: str, question: str, query_vector: np.ndarray, answer: str) -> None:
+    with get_session() as session:
+        session.add(AnswerCacheModel(
+            proposal_id=proposal_id,
+            proposal_version=version,
+            question=question,
+            question_vector=[float(x) for x in query_vector.reshape(-1)],
+            answer=answer,
+        ))
+        session.commit()
+
+
+def invalidate(proposal_id: str) -> None:
+    """Drop every cached answer for a proposal (e.g. after re-extraction)."""
+    with get_session() as session:
+        session.exec(delete(AnswerCacheModel).where(AnswerCacheModel.proposal_id == proposal_id))
+        session.commit()
@@ -0,0 +1,199 @@
+"""
+Bid Leveling Analytics
+
+Per-line-item statistics across vendors for an RFP's comparison matrix:
+lowest and median bid, spread, z-score outliers, missing quotes, and a
+front-loading index per vendor to spot unbalanced bids.
+
+Aligned line items are loaded once into NumPy arrays (rows × vendors, NaN
+where a vendor has no numeric amount) and every statistic is computed in
+a few vectorized passes. Results are cached per matrix version.
+"""
+
+import threading
+import warnings
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from backend.services import matrix_service
+from backend.services.matrix_service import MatrixLayout
+
+# Modified z-score (median/MAD based) above which a line total is an outlier.
+# A plain z-score cannot exceed sqrt(n-1), so with a handful of vendors a
+# single wild bid would never be flagged.
+OUTLIER_Z = 3.5
+# Floor of the robust scale, as a share of the row median. When most vendors
+# bid the same amount MAD is 0 and would make every other bid infinitely far
+# out (or, guarded, never an outlier); the floor keeps z meaningful and stops
+# a few percent of difference in a tight cluster from being flagged.
+MIN_SCALE_SHARE = 0.10
+# A vendor whose early-item unit costs run this much above the market is front-loaded
+FRONT_LOAD_THRESHOLD = 1.5
+
+_CACHE_SIZE = 32
+_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _unit_cost_column(layout: MatrixLayout) -> Optional[str]:
+    """Vendor column holding the unit price (e.g. 'unit_cost', 'Unit Price')."""
+    for col in layout.vendor_columns:
+        lowered = col.lower()
+        if 'unit' in lowered and any(hint in lowered for hint in ('cost', 'price', 'rate')):
+            return col
+    return None
+
+
+def _load_arrays(layout: MatrixLayout):
+    """Aligned (rfp_rows, totals, unit_costs) with NaN for missing amounts."""
+    total_column = layout.total_column
+    unit_column = _unit_cost_column(layout)
+    n_vendors = len(layout.proposals)
+
+    rfp_rows: List[dict] = []
+    totals: List[float] = []
+    units: List[float] = []
+    for rfp_row, vendor_rows in matrix_service.iter_aligned_rows(layout):
+        rfp_rows.append(rfp_row)
+        for p in layout.proposals:
+            vendor_row = vendor_rows[p.id]
+            total = matrix_service.row_total(vendor_row, total_column)
+            unit = matrix_service.cell_amount(vendor_row, unit_column)
+            totals.append(np.nan if total is None else total)
+            units.append(np.nan if unit is None else unit)
+
+    shape = (len(rfp_rows), n_vendors)
+    return (
+        rfp_rows,
+        np.array(totals, dtype=float).reshape(shape),
+        np.array(units, dtype=float).reshape(shape),
+    )
+
+
+def _front_loading_index(units: np.ndarray) -> np.ndarray:
+    """
+    Per-vendor ratio of relative unit pricing on the first third of line
+    items to the remaining items (1.0 = balanced, NaN if not computable).
+
+    Each unit cost is first divided by the row median, so items of very
+    different size weigh the same.
+    """
+    n_rows, n_vendors = units.shape
+    if n_rows < 3 or n_vendors < 2:
+        return np.full(n_vendors, np.nan)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        medians = np.nanmedian(units, axis=1, keepdims=True)
+        medians[medians <= 0] = np.nan
+        ratios = units / medians
+        split = n_rows // 3
+        early = np.nanmean(ratios[:split], axis=0)
+        late = np.nanmean(ratios[split:], axis=0)
+        return early / late
+
+
+def _finite(value) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+def compute_analytics(layout: MatrixLayout, version: Optional[str] = None) -> dict:
+    """
+    Compute bid leveling statistics for a loaded matrix layout.
+
+    Outliers need at least three quotes on a line: with two, both bids sit
+    equally far from the median and neither can be singled out.
+    """
+    proposals = layout.proposals
+    vendor_ids = [p.id for p in proposals]
+    rfp_rows, totals, units = _load_arrays(layout)
+
+    result = {
+        "rfp_id": layout.rfp.id,
+        "version": version or layout.version,
+        "total_column": layout.total_column,
+        "unit_cost_column": _unit_cost_column(layout),
+        "rows": [],
+        "vendors": [],
+    }
+    if not vendor_ids:
+        return result
+
+    quoted = ~np.isnan(totals)
+    n_quoted = quoted.sum(axis=1)
+
+    with warnings.catch_warnings():
+        # All-NaN rows (nobody quoted) legitimately produce NaN statistics
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        row_min = np.nanmin(totals, axis=1)
+        row_max = np.nanmax(totals, axis=1)
+        row_median = np.nanmedian(totals, axis=1)
+        deviation = totals - row_median[:, None]
+        mad = np.nanmedian(np.abs(deviation), axis=1, keepdims=True)
+        # MAD / 0.6745 estimates the standard deviation for normal data
+        scale = np.maximum(mad / 0.6745, MIN_SCALE_SHARE * np.abs(row_median)[:, None])
+        z = deviation / np.where(scale > 0, scale, np.nan)
+
+    spread = row_max - row_min
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = np.where(row_median > 0, spread / row_median * 100, np.nan)
+    outliers = np.abs(np.nan_to_num(z)) > OUTLIER_Z
+    low_idx = np.argmin(np.where(quoted, totals, np.inf), axis=1)
+    front_loading = _front_loading_index(units)
+
+    rows = []
+    for i, rfp_row in enumerate(rfp_rows):
+        rows.append({
+            "item_id": rfp_row.get("item_id"),
+            "description": rfp_row.get("description"),
+            "quotes": int(n_quoted[i]),
+            "min": _finite(row_min[i]),
+            "median": _finite(row_median[i]),
+            "max": _finite(row_max[i]),
+            "spread": _finite(spread[i]),
+            "spread_pct": _finite(spread_pct[i]),
+            "low_bidder": vendor_ids[low_idx[i]] if n_quoted[i] else None,
+            "outliers": [
+                {"proposal_id": vendor_ids[j], "value": float(totals[i, j]), "z_score": round(float(z[i, j]), 2)}
+                for j in np.flatnonzero(outliers[i])
+            ],
+            "missing": [vendor_ids[j] for j in np.flatnonzero(~quoted[i])],
+        })
+
+    vendors = []
+    for j, p in enumerate(proposals):
+        index = _finite(front_loading[j])
+        vendors.append({
+            "proposal_id": p.id,
+            "vendor": p.contractor,
+            "items_quoted": int(quoted[:, j].sum()),
+            "items_missing": int((~quoted[:, j]).sum()),
+            "low_bids": int(((low_idx == j) & (n_quoted > 0)).sum()),
+            "outliers": int(outliers[:, j].sum()),
+            "front_loading_index": round(index, 3) if index is not None else None,
+            "unbalanced": bool(index is not None and index > FRONT_LOAD_THRESHOLD),
+        })
+
+    result["rows"] = rows
+    result["vendors"] = vendors
+    return result
+
+
+def get_analytics(layout: MatrixLayout) -> dict:
+    """Cached compute_analytics, keyed by RFP and matrix version."""
+    version = layout.version
+    key = (layout.rfp.id, version)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = compute_analytics(layout, version)
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
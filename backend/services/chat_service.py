@@ -1,6 +1,25 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from backend.services import proposal_service, rfp_service
-from backend.src.utils.llm_client import complete
+from typing import Iterator, Optional
+
+import numpy as np
+
+from backend.schemas.proposal import Proposal
+from backend.schemas.rfp import Rfp
+from backend.services import answer_cache, proposal_service, rfp_digest, rfp_service, vector_store
+from backend.src.utils.hashing import content_hash
+from backend.src.utils.llm_client import complete, stream
+from backend.src.utils.tokens import truncate_to_tokens
+
+# Context packs kept in memory, keyed by (proposal id, proposal version)
+_PACK_CACHE_SIZE = 128
+_pack_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_pack_lock = threading.Lock()
+
+# PDF chunks retrieved per question
+CHAT_TOP_K = 5
 
 
 def _load_chat_prompt() -> str:
@@ -12,14 +31,8 @@ def _load_chat_prompt() -> str:
     return "You are a helpful assistant analyzing RFP proposals. Provide clear, structured responses using markdown formatting."
 
 
-def ask_about_proposal(proposal_id: str, message: str, history: list[dict] = []) -> str:
-    proposal = proposal_service.get_proposal(proposal_id)
-    if not proposal:
-        return "Proposal not found."
-    
-    rfp = rfp_service.get_rfp(proposal.rfp_id)
-    
-    # Build comprehensive context from ALL stored DB fields
+def _build_context_pack(proposal: Proposal) -> str:
+    """Static markdown context for a proposal, built from ALL stored DB fields."""
     context_parts = [
         "# Proposal Information (from Database)",
         f"**Contractor**: {proposal.contractor}",
@@ -70,6 +83,8 @@ def ask_about_proposal(proposal_id: str, message: str, history: list[dict] = [])
             
             # Iterate ALL keys dynamically - no hardcoded field names
             for key, value in row.items():
+                if key == 'normalized':
+                    continue  # Parsed amounts; the raw cells are already listed
                 if key == 'values':
                     # Handle nested 'values' structure (new format with ColumnValuePair)
                     if isinstance(value, list) and value:
@@ -88,20 +103,6 @@ def ask_about_proposal(proposal_id: str, message: str, history: list[dict] = [])
             if row_parts:
                 context_parts.append(f"  • Row {i+1}: {', '.join(row_parts)}")
     
-    # Add RFP context
-    if rfp:
-        context_parts.append(f"\n# RFP Information")
-        context_parts.append(f"**Title**: {rfp.title}")
-        if rfp.budget is not None:
-             context_parts.append(f"**Budget**: ${rfp.budget:,.0f} {rfp.currency}")
-        else:
-             context_parts.append(f"**Budget**: TBD")
-        
-        if rfp.requirements:
-            context_parts.append("\n**RFP Requirements**:")
-            for req in rfp.requirements:
-                context_parts.append(f"  • {req.text}")
-    
     # Skip extracted_text - we now have structured data!
     # Only use as fallback if no structured data
     has_structured_data = any([
@@ -111,11 +112,83 @@ def ask_about_proposal(proposal_id: str, message: str, history: list[dict] = [])
         proposal.summary
     ])
     
-    if not has_structured_data and proposal.extracted_text:
+    raw_text = proposal_service.get_extracted_text(proposal.id) if not has_structured_data else None
+    if raw_text:
         context_parts.append(f"\n# Raw Proposal Text (fallback)")
-        context_parts.append(proposal.extracted_text[:2000])
+        context_parts.append(raw_text[:2000])
     
-    context_str = "\n".join(context_parts)
+    return "\n".join(context_parts)
+
+
+def proposal_version(proposal: Proposal) -> str:
+    """Hash of every stored proposal field; changes whenever the proposal is re-extracted or edited."""
+    return content_hash(proposal.model_dump(mode="json"))
+
+
+def answer_version(proposal: Proposal, rfp: Optional[Rfp]) -> str:
+    """Version of what a chat answer is built from: the proposal and the RFP digest in the prompt."""
+    return content_hash([proposal_version(proposal), rfp_digest.digest_version(rfp) if rfp else None])
+
+
+def _context_pack(proposal: Proposal) -> str:
+    """The proposal's context pack, cached per proposal version."""
+    key = (proposal.id, proposal_version(proposal))
+    with _pack_lock:
+        if key in _pack_cache:
+            _pack_cache.move_to_end(key)
+            return _pack_cache[key]
+
+    pack = _build_context_pack(proposal)
+    with _pack_lock:
+        _pack_cache[key] = pack
+        while len(_pack_cache) > _PACK_CACHE_SIZE:
+            _pack_cache.popitem(last=False)
+    return pack
+
+
+def _embed_question(message: str) -> Optional[np.ndarray]:
+    """Unit vector of the question, or None if the embedding model is unavailable."""
+    try:
+        return vector_store.embed_texts([message])[0]
+    except Exception as e:
+        print(f"⚠ Question embedding skipped: {e}")
+        return None
+
+
+def _retrieve_excerpts(proposal_id: str, query: Optional[np.ndarray]) -> list[dict]:
+    """Top-k chunks of the proposal PDF relevant to the question ([] if not indexed)."""
+    if query is None:
+        return []
+    try:
+        return vector_store.search(vector_store.proposal_collection_name(proposal_id), query, k=CHAT_TOP_K)
+    except Exception as e:
+        print(f"⚠ Chat retrieval skipped: {e}")
+        return []
+
+
+def _conversation_block(recent_history: list[dict], summary: str) -> str:
+    """Session summary and recent turns for the prompt ('' if there are none)."""
+    block = ""
+    if summary:
+        block += f"Summary of Earlier Conversation:\n{summary}\n\n"
+    if recent_history:
+        block += "Recent Conversation History:\n"
+        for msg in recent_history:
+            role = "User" if msg.get("role") == "user" else "Assistant"
+            block += f"{role}: {msg.get('content')}\n"
+        block += "\n"
+    return block
+
+
+CHAT_ERROR_REPLY = "I apologize, but I encountered an error processing your request. Please try again or rephrase your question."
+
+
+def _build_prompts(
+    proposal: Proposal, rfp: Optional[Rfp], message: str, history: list[dict], summary: str, query: Optional[np.ndarray]
+) -> tuple[str, str]:
+    """(system prompt, user prompt) for one chat turn about a proposal."""
+    context_str = _context_pack(proposal)
+    excerpts = _retrieve_excerpts(proposal.id, query)
     system_prompt = _load_chat_prompt()
 
     # Limit history to last 5 turns
@@ -130,6 +203,7 @@ IMPORTANT INSTRUCTIONS:
 - If asked about prices, quantities, or line items, refer to the Vendor Bid Form.
 - If you can't find the information in the database or summary, don't create false information. Politely tell the user that the information may not be provided in the document and they can contact the vendor for clarification.
 - If asked about experience, warranty, or methodology, use those specific sections.
+- When you use the Relevant Excerpts, cite their page numbers, e.g. (p. 4).
 
 COMPARISON CAPABILITIES:
 - You have BOTH the RFP Information (requirements, budget) AND the Proposal Information (vendor bid form, pricing, experience).
@@ -138,20 +212,169 @@ COMPARISON CAPABILITIES:
 - For example: "Does vendor address requirement X?" → Check if the proposal data covers that RFP requirement.
 - Highlight any gaps or matches between what the RFP asks for and what the proposal offers."""
     
+    # RFP digest first: a stable prefix shared by every chat about this RFP
+    final_prompt = ""
+    if rfp:
+        final_prompt += f"# RFP Information\n---\n{rfp_digest.get_digest(rfp)}\n---\n\n"
+
     # Clear separation of context and query
-    final_prompt = f"Complete Proposal Data (from Database):\n---\n{context_str}\n---\n\n"
-    if recent_history:
-        final_prompt += "Recent Conversation History:\n"
-        for msg in recent_history:
-            role = "User" if msg.get("role") == "user" else "Assistant"
-            final_prompt += f"{role}: {msg.get('content')}\n"
-        final_prompt += "\n"
-    
+    final_prompt += f"Complete Proposal Data (from Database):\n---\n{context_str}\n---\n\n"
+    if excerpts:
+        final_prompt += "Relevant Excerpts from the Proposal PDF:\n---\n"
+        for excerpt in excerpts:
+            page = f"[p. {excerpt['page']}] " if excerpt.get("page") else ""
+            final_prompt += f"{page}{excerpt['text'].strip()}\n\n"
+        final_prompt += "---\n\n"
+    final_prompt += _conversation_block(recent_history, summary)
     final_prompt += f"LATEST USER QUESTION (Answer using the data above): {message}"
-    
+    return concise_system, final_prompt
+
+
+def _cacheable(history: list[dict], summary: str, query: Optional[np.ndarray]) -> bool:
+    """Only standalone questions are cached; follow-ups depend on the conversation."""
+    return query is not None and not history and not summary
+
+
+def ask_about_proposal(proposal_id: str, message: str, history: list[dict] = [], summary: str = "") -> str:
+    proposal = proposal_service.get_proposal(proposal_id)
+    if not proposal:
+        return "Proposal not found."
+
+    rfp = rfp_service.get_rfp(proposal.rfp_id)
+    query = _embed_question(message)
+    version = answer_version(proposal, rfp)
+    if _cacheable(history, summary, query):
+        cached = answer_cache.lookup(proposal.id, version, query)
+        if cached:
+            return cached
+
+    system, prompt = _build_prompts(proposal, rfp, message, history, summary, query)
     try:
-        return complete(concise_system, final_prompt, temperature=0.5)
+        reply = complete(system, prompt, temperature=0.5)
     except Exception as e:
         print(f"DEBUG: Chat Error: {e}")
-        return f"I apologize, but I encountered an error processing your request. Please try again or rephrase your question."
+        return CHAT_ERROR_REPLY
 
+    if _cacheable(history, summary, query):
+        answer_cache.store(proposal.id, version, message, query, reply)
+    return reply
+
+
+def stream_about_proposal(proposal_id: str, message: str, history: list[dict] = [], summary: str = "") -> Iterator[str]:
+    """Like ask_about_proposal(), but yields the reply in text deltas as the model produces it."""
+    proposal = proposal_service.get_proposal(proposal_id)
+    if not proposal:
+        yield "Proposal not found."
+        return
+
+    rfp = rfp_service.get_rfp(proposal.rfp_id)
+    query = _embed_question(message)
+    version = answer_version(proposal, rfp)
+    if _cacheable(history, summary, query):
+        cached = answer_cache.lookup(proposal.id, version, query)
+        if cached:
+            yield cached
+            return
+
+    system, prompt = _build_prompts(proposal, rfp, message, history, summary, query)
+    parts = []
+    try:
+        for delta in stream(system, prompt, temperature=0.5):
+            parts.append(delta)
+            yield delta
+    except Exception as e:
+        print(f"DEBUG: Chat Error: {e}")
+        if not parts:
+            yield CHAT_ERROR_REPLY
+        return
+
+    if _cacheable(history, summary, query) and parts:
+        answer_cache.store(proposal.id, version, message, query, "".join(parts))
+
+
+# --- Cross-proposal chat (all bids for an RFP) ---
+
+RFP_CHAT_MAX_EXCERPTS = 12
+# Per-vendor cap on excerpts; with many vendors the quota shrinks to
+# RFP_CHAT_MAX_EXCERPTS // vendors (at least 1) so the prompt stays bounded.
+RFP_CHAT_VENDOR_MAX = 4
+RFP_CHAT_EXCERPT_TOKENS = 200
+MAX_PARALLEL_RETRIEVAL = 8
+
+RFP_CHAT_SYSTEM_PROMPT = """You are an expert assistant comparing ALL vendor proposals submitted for one RFP.
+You get the RFP summary, a roster of vendors, and the proposal excerpts most relevant to the question, labelled by vendor and page.
+
+- Answer the user's latest question directly and concisely, across vendors.
+- Name the vendor for every claim and cite pages, e.g. (Vendor A, p. 4).
+- Use a markdown table when comparing several vendors.
+- If the excerpts do not show something for a vendor, say it was not found in the retrieved excerpts rather than guessing."""
+
+
+def _merge_excerpts(per_proposal: dict[str, list[dict]]) -> list[dict]:
+    """Highest-scoring excerpts across proposals, at most `quota` per proposal."""
+    if not per_proposal:
+        return []
+    quota = max(1, min(RFP_CHAT_VENDOR_MAX, RFP_CHAT_MAX_EXCERPTS // len(per_proposal)))
+    candidates = [
+        {**excerpt, "proposal_id": pid}
+        for pid, excerpts in per_proposal.items()
+        for excerpt in excerpts[:quota]
+    ]
+    candidates.sort(key=lambda e: e["score"], reverse=True)
+    return candidates[:RFP_CHAT_MAX_EXCERPTS]
+
+
+def ask_about_rfp(rfp_id: str, message: str, history: list[dict] = [], summary: str = "") -> dict:
+    """
+    Answer a question across every proposal for an RFP in one completion.
+
+    Each proposal's index is searched in parallel; the merged excerpts are
+    capped per vendor and overall, so the prompt size does not grow with
+    the number of bids. Returns {reply, sources: [{proposal_id, vendor, page, score}]}.
+    """
+    rfp = rfp_service.get_rfp(rfp_id)
+    if not rfp:
+        return {"reply": "RFP not found.", "sources": []}
+    proposals = proposal_service.list_proposals(rfp_id=rfp_id)
+    if not proposals:
+        return {"reply": "No proposals have been submitted for this RFP yet.", "sources": []}
+    vendors = {p.id: p.contractor or "Unknown vendor" for p in proposals}
+
+    query = _embed_question(message)
+    per_proposal: dict[str, list[dict]] = {}
+    if query is not None:
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_RETRIEVAL, len(proposals))) as pool:
+            results = pool.map(lambda p: _retrieve_excerpts(p.id, query), proposals)
+            per_proposal = {p.id: excerpts for p, excerpts in zip(proposals, results) if excerpts}
+    excerpts = _merge_excerpts(per_proposal)
+
+    roster = []
+    for p in proposals:
+        price = f"${p.price:,.2f} {p.currency}" if p.price else "price not stated"
+        indexed = "" if p.id in per_proposal else " (no indexed PDF)"
+        roster.append(f"- {vendors[p.id]}: {price}, status {p.status}{indexed}")
+
+    # RFP digest first: the same stable prefix as single-proposal chat
+    prompt = f"# RFP Information\n---\n{rfp_digest.get_digest(rfp)}\n---\n\n"
+    prompt += f"# Vendors ({len(proposals)} proposals)\n" + "\n".join(roster) + "\n\n"
+    if excerpts:
+        prompt += "Relevant Excerpts from the Proposals:\n---\n"
+        for excerpt in excerpts:
+            page = f", p. {excerpt['page']}" if excerpt.get("page") else ""
+            text = truncate_to_tokens(excerpt["text"].strip(), RFP_CHAT_EXCERPT_TOKENS)
+            prompt += f"[{vendors[excerpt['proposal_id']]}{page}] {text}\n\n"
+        prompt += "---\n\n"
+    prompt += _conversation_block(history[-10:] if history else [], summary)
+    prompt += f"LATEST USER QUESTION (Answer using the data above): {message}"
+
+    try:
+        reply = complete(RFP_CHAT_SYSTEM_PROMPT, prompt, temperature=0.3)
+    except Exception as e:
+        print(f"⚠ RFP chat failed for {rfp_id[:8]}: {e}")
+        reply = CHAT_ERROR_REPLY
+
+    sources = [
+        {"proposal_id": e["proposal_id"], "vendor": vendors[e["proposal_id"]], "page": e.get("page"), "score": e["score"]}
+        for e in excerpts
+    ]
+    return {"reply": reply, "sources": sources}
@@ -0,0 +1,113 @@
+"""
+Chat Sessions
+
+Server-side conversation state for proposal chat and the RFP consultant.
+The client sends only a session id and its new message; the server keeps
+the last few turns verbatim and folds older turns into a running summary,
+so the history part of each prompt stays roughly constant in size however
+long the conversation runs.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from backend.models.db import get_session, write_session
+from backend.models.entities import ChatSessionModel
+from backend.schemas.chat import ChatSession
+from backend.src.utils.llm_client import complete
+from backend.src.utils.tokens import truncate_to_tokens
+
+# Compact once more than COMPACT_AFTER_TURNS messages are stored verbatim,
+# keeping the newest KEEP_RECENT_TURNS of them.
+COMPACT_AFTER_TURNS = 8
+KEEP_RECENT_TURNS = 4
+SUMMARY_MAX_TOKENS = 300
+# Per-turn cap when a turn is folded into the summary prompt
+TURN_MAX_TOKENS = 400
+
+SUMMARY_SYSTEM_PROMPT = """You maintain the running summary of a conversation between a user and an assistant.
+Merge the new turns into the existing summary. Keep facts, figures, decisions, open questions and user preferences; drop pleasantries.
+Write plain prose, at most 200 words. Return only the summary."""
+
+
+def open_session(session_id: Optional[str], kind: str, subject_id: Optional[str] = None) -> ChatSession:
+    """
+    The session `session_id` if it exists for this kind and subject;
+    otherwise a new, empty session.
+    """
+    with get_session() as session:
+        if session_id:
+            db_chat = session.get(ChatSessionModel, session_id)
+            if db_chat and db_chat.kind == kind and db_chat.subject_id == subject_id:
+                return ChatSession.model_validate(db_chat)
+        db_chat = ChatSessionModel(kind=kind, subject_id=subject_id)
+        session.add(db_chat)
+        session.commit()
+        session.refresh(db_chat)
+        return ChatSession.model_validate(db_chat)
+
+
+def get_chat_session(session_id: str) -> Optional[ChatSession]:
+    with get_session() as session:
+        db_chat = session.get(ChatSessionModel, session_id)
+        return ChatSession.model_validate(db_chat) if db_chat else None
+
+
+def append_turns(session_id: str, turns: List[dict]) -> None:
+    """
+    Append turns ({role: 'user'|'assistant', content}) to a session. The
+    read-modify-write of the turns list holds the write lock (BEGIN
+    IMMEDIATE on SQLite, a row lock elsewhere) so concurrent appends and
+    compactions cannot drop each other's turns.
+    """
+    with write_session() as session:
+        db_chat = session.get(ChatSessionModel, session_id, with_for_update=True)
+        if not db_chat:
+            return
+        # Reassign so SQLAlchemy sees the JSON column change
+        db_chat.turns = list(db_chat.turns or []) + turns
+        db_chat.updated_at = datetime.utcnow()
+        session.add(db_chat)
+        session.commit()
+
+
+def _summarize(summary: str, turns: List[dict]) -> str:
+    """Fold `turns` into `summary`; falls back to appending clipped turns if the LLM fails."""
+    transcript = "\n".join(
+        f"{'User' if t.get('role') == 'user' else 'Assistant'}: {truncate_to_tokens(t.get('content') or '', TURN_MAX_TOKENS)}"
+        for t in turns
+    )
+    prompt = f"Existing summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"
+    try:
+        merged = complete(SUMMARY_SYSTEM_PROMPT, prompt, temperature=0.0).strip()
+    except Exception as e:
+        print(f"⚠ Chat summary failed, keeping a clipped transcript: {e}")
+        merged = f"{summary}\n{transcript}".strip()
+    return truncate_to_tokens(merged, SUMMARY_MAX_TOKENS)
+
+
+def compact_session(session_id: str) -> None:
+    """
+    Fold all but the newest KEEP_RECENT_TURNS turns into the summary once
+    more than COMPACT_AFTER_TURNS are stored. Run after the reply is sent.
+    The LLM summary is built outside any transaction; the rewrite of the
+    turns then holds the write lock like append_turns.
+    """
+    chat = get_chat_session(session_id)
+    if not chat or len(chat.turns) <= COMPACT_AFTER_TURNS:
+        return
+
+    folded = chat.turns[:-KEEP_RECENT_TURNS]
+    summary = _summarize(chat.summary, folded)
+
+    with write_session() as session:
+        db_chat = session.get(ChatSessionModel, session_id, with_for_update=True)
+        if not db_chat or (db_chat.summarized_turns or 0) != chat.summarized_turns:
+            return  # Deleted, or compacted concurrently
+        # Turns appended while summarizing sit after the folded ones; keep them
+        db_chat.turns = list(db_chat.turns or [])[len(folded):]
+        db_chat.summary = summary
+        db_chat.summarized_turns = (db_chat.summarized_turns or 0) + len(folded)
+        session.add(db_chat)
+        session.commit()
+    print(f"✓ Compacted chat session {session_id[:8]} ({len(folded)} turns summarized)")
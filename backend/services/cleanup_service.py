@@ -0,0 +1,183 @@
+"""
+Storage Cleanup
+
+Removes what lives outside the database for deleted RFPs and proposals:
+Chroma collections (Vendor_Proposal_{id}, Proposal_{id}, Requirements_{id})
+and uploaded PDFs under storage/proposals/{rfp_id}. remove_rfp_artifacts()
+runs as a background task after an RFP is deleted; collect_garbage() (see
+jobs/gc.py) finds anything a failed upload or an older delete left behind,
+including cache rows whose proposal is gone, and compacts the vector store.
+"""
+
+import re
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+from sqlalchemy import text
+from sqlmodel import delete, select
+
+from backend.config.settings import settings
+from backend.models.db import get_session, write_session
+from backend.models.entities import (
+    AnswerCacheModel,
+    ChatSessionModel,
+    ProposalModel,
+    ProposalReviewModel,
+    ProposalTextModel,
+    RfpModel,
+    SavedComparisonModel,
+    ScoreCacheModel,
+)
+from backend.services import vector_store
+
+_UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+# Collections keyed by a proposal or RFP id. Proposal_{vendor name} collections
+# from the standalone agents are not tied to a row and are left alone.
+_PROPOSAL_COLLECTION = re.compile(rf"^(?:Vendor_Proposal|Proposal)_({_UUID})$")
+_RFP_COLLECTION = re.compile(rf"^Requirements_({_UUID})$")
+
+_PROPOSAL_CACHE_MODELS = (ScoreCacheModel, ProposalReviewModel, AnswerCacheModel, ProposalTextModel)
+
+# Uploads write the PDF and collections before the proposal row exists;
+# anything belonging to a PDF younger than this is treated as in flight.
+UPLOAD_GRACE_SECONDS = 3600
+
+
+def _proposals_dir() -> Path:
+    return Path(settings.storage_path) / "proposals"
+
+
+def remove_rfp_artifacts(rfp_id: str, proposal_ids: List[str]) -> None:
+    """Delete the vector collections and PDFs of a deleted RFP and its proposals."""
+    names = [vector_store.requirements_collection_name(rfp_id)]
+    for proposal_id in proposal_ids:
+        names += [vector_store.proposal_collection_name(proposal_id), vector_store.estimate_collection_name(proposal_id)]
+    try:
+        deleted = vector_store.delete_collections(names)
+    except Exception as e:
+        print(f"⚠ Vector cleanup for RFP {rfp_id[:8]} failed, jobs/gc.py will retry: {e}")
+        deleted = 0
+    shutil.rmtree(_proposals_dir() / rfp_id, ignore_errors=True)
+    print(f"✓ Cleaned up RFP {rfp_id[:8]}: {deleted} collection(s), stored PDFs")
+
+
+def _live_ids() -> tuple[Set[str], Set[str]]:
+    """RFP ids and proposal ids in use, counting uploads still in progress."""
+    with get_session() as session:
+        rfp_ids = set(session.exec(select(RfpModel.id)).all())
+        proposal_ids = set(session.exec(select(ProposalModel.id)).all())
+
+    base = _proposals_dir()
+    if base.is_dir():
+        cutoff = time.time() - UPLOAD_GRACE_SECONDS
+        for pdf in base.glob("*/*.pdf"):
+            if pdf.stat().st_mtime > cutoff:
+                proposal_ids.add(pdf.stem)
+                rfp_ids.add(pdf.parent.name)
+    return rfp_ids, proposal_ids
+
+
+def _orphaned_collections(rfp_ids: Set[str], proposal_ids: Set[str]) -> List[str]:
+    orphans = []
+    for name in vector_store.list_collection_names():
+        proposal_match = _PROPOSAL_COLLECTION.match(name)
+        rfp_match = _RFP_COLLECTION.match(name)
+        if proposal_match and proposal_match.group(1) not in proposal_ids:
+            orphans.append(name)
+        elif rfp_match and rfp_match.group(1) not in rfp_ids:
+            orphans.append(name)
+    return orphans
+
+
+def _orphaned_files(rfp_ids: Set[str], proposal_ids: Set[str]) -> List[Path]:
+    base = _proposals_dir()
+    if not base.is_dir():
+        return []
+    orphans = []
+    for rfp_dir in base.iterdir():
+        if not rfp_dir.is_dir():
+            continue
+        if rfp_dir.name not in rfp_ids:
+            orphans.append(rfp_dir)
+            continue
+        orphans += [pdf for pdf in rfp_dir.glob("*.pdf") if pdf.stem not in proposal_ids]
+    return orphans
+
+
+def _delete_orphaned_rows(session) -> int:
+    """Cache, chat and search rows whose RFP or proposal no longer exists (checked in the same transaction)."""
+    from backend.services.search_service import FTS_TABLE, is_available
+
+    live_proposals = select(ProposalModel.id)
+    live_rfps = select(RfpModel.id)
+    statements = [delete(model).where(model.proposal_id.not_in(live_proposals)) for model in _PROPOSAL_CACHE_MODELS]
+    statements += [
+        delete(ChatSessionModel).where(ChatSessionModel.kind == "proposal", ChatSessionModel.subject_id.not_in(live_proposals)),
+        delete(ChatSessionModel).where(ChatSessionModel.kind == "rfp", ChatSessionModel.subject_id.not_in(live_rfps)),
+        delete(SavedComparisonModel).where(SavedComparisonModel.rfp_id.not_in(live_rfps)),
+    ]
+    removed = sum(session.exec(stmt).rowcount for stmt in statements)
+
+    stale_docs = (
+        "SELECT id FROM search_docs WHERE "
+        "(doc_type = 'proposal' AND doc_id NOT IN (SELECT id FROM proposals)) OR "
+        "(doc_type = 'rfp' AND doc_id NOT IN (SELECT id FROM rfps))"
+    )
+    if is_available():
+        session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({stale_docs})"))
+    removed += session.execute(text(f"DELETE FROM search_docs WHERE id IN ({stale_docs})")).rowcount
+    return removed
+
+
+def compact_vector_store() -> bool:
+    """VACUUM Chroma's SQLite catalog so space from deleted collections is returned."""
+    catalog = Path(vector_store.CHROMA_PATH) / "chroma.sqlite3"
+    if not catalog.exists():
+        return False
+    conn = sqlite3.connect(catalog)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return True
+
+
+def collect_garbage(dry_run: bool = False) -> Dict[str, int]:
+    """
+    Remove orphaned collections, PDFs and database rows, then compact the
+    vector store. With dry_run=True only counts what would be removed.
+    """
+    rfp_ids, proposal_ids = _live_ids()
+
+    try:
+        collections = _orphaned_collections(rfp_ids, proposal_ids)
+    except Exception as e:
+        print(f"⚠ Could not list vector collections: {e}")
+        collections = []
+    files = _orphaned_files(rfp_ids, proposal_ids)
+
+    if dry_run:
+        return {"collections": len(collections), "files": len(files), "rows": 0, "compacted": 0}
+
+    deleted_collections = vector_store.delete_collections(collections) if collections else 0
+    for path in files:
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+    with write_session() as session:
+        rows = _delete_orphaned_rows(session)
+        session.commit()
+
+    compacted = False
+    if deleted_collections:
+        try:
+            compacted = compact_vector_store()
+        except sqlite3.Error as e:
+            print(f"⚠ Vector store compaction skipped: {e}")
+
+    return {"collections": deleted_collections, "files": len(files), "rows": rows, "compacted": int(compacted)}
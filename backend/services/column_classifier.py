@@ -42,7 +42,7 @@ def classify_columns_majority_voting(
     
     # Get all column names from RFP rows
     sample_row = rfp_rows[0]
-    all_columns = [k for k in sample_row.keys() if k not in ('values',)]
+    all_columns = [k for k in sample_row.keys() if k not in ('values', 'normalized')]
     
     # Filter to proposals with actual form data
     proposals_with_data = [p for p in vendor_proposals if p.get('proposal_form_data')]
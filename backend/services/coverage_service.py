@@ -0,0 +1,150 @@
+"""
+Requirement Coverage Service
+
+Builds a requirement × proposal coverage matrix from embeddings: each RFP
+requirement is embedded once (stored in a Requirements_{rfp_id} collection
+under a hash of its text), and every proposal's stored chunk embeddings are
+compared against all requirements in a single matrix product. No LLM tokens
+are spent unless verification of borderline cells is requested.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.schemas.proposal import Proposal
+from backend.schemas.rfp import Rfp
+from backend.services import proposal_service, rfp_service, vector_store
+from backend.src.utils.hashing import content_hash
+from backend.src.utils.llm_client import complete_json
+from backend.src.utils.tokens import truncate_to_tokens
+
+# Cosine similarity of the best chunk: at or above COVERED is covered, below
+# NOT_COVERED is not, anything between is borderline.
+COVERED_THRESHOLD = 0.55
+NOT_COVERED_THRESHOLD = 0.40
+SNIPPET_MAX_TOKENS = 120
+
+MAX_PARALLEL_VERIFY = 8
+
+VERIFY_SYSTEM_PROMPT = """You check whether a vendor proposal addresses RFP requirements.
+For each numbered requirement you get the most relevant excerpt from the proposal.
+Answer only from the excerpt.
+
+Return JSON: {"results": [{"n": 1, "covered": true, "reason": "short reason"}]}"""
+
+
+def _requirement_vectors(rfp: Rfp) -> np.ndarray:
+    """Unit vectors aligned with rfp.requirements (only new texts are embedded)."""
+    texts = [req.text for req in rfp.requirements]
+    ids = [content_hash(text) for text in texts]
+    # Duplicate texts share one stored vector
+    return vector_store.embed_and_store(vector_store.requirements_collection_name(rfp.id), ids, texts)
+
+
+def _status(score: float) -> str:
+    if score >= COVERED_THRESHOLD:
+        return "covered"
+    if score < NOT_COVERED_THRESHOLD:
+        return "not_covered"
+    return "borderline"
+
+
+def _proposal_cells(proposal: Proposal, req_vectors: np.ndarray) -> Optional[List[dict]]:
+    """Best-matching chunk per requirement, or None if the proposal is not indexed."""
+    chunks = vector_store.get_chunks(vector_store.proposal_collection_name(proposal.id))
+    if not chunks or chunks.vectors.shape[1] != req_vectors.shape[1]:
+        return None
+
+    similarity = chunks.vectors @ req_vectors.T  # chunks × requirements
+    best = similarity.argmax(axis=0)
+    scores = similarity[best, np.arange(similarity.shape[1])]
+
+    cells = []
+    for chunk_index, score in zip(best, scores):
+        cells.append({
+            "score": round(float(score), 3),
+            "status": _status(float(score)),
+            "snippet": truncate_to_tokens(chunks.texts[chunk_index].strip(), SNIPPET_MAX_TOKENS),
+            "page": vector_store.page_label(chunks.metadatas[chunk_index]),
+        })
+    return cells
+
+
+def _verify_borderline(rfp: Rfp, cells: List[dict]) -> None:
+    """Ask the LLM about a proposal's borderline cells (one call) and update them in place."""
+    pending = [(i, cell) for i, cell in enumerate(cells) if cell["status"] == "borderline"]
+    if not pending:
+        return
+    prompt = "\n\n".join(
+        f"{n}. Requirement: {rfp.requirements[i].text}\nExcerpt: {cell['snippet']}"
+        for n, (i, cell) in enumerate(pending, start=1)
+    )
+    try:
+        response = complete_json(VERIFY_SYSTEM_PROMPT, prompt, temperature=0.0)
+    except Exception as e:
+        print(f"⚠ Coverage verification failed: {e}")
+        return
+    answers = {r.get("n"): r for r in response.get("results", []) if isinstance(r, dict)}
+    for n, (_, cell) in enumerate(pending, start=1):
+        answer = answers.get(n)
+        if answer is None:
+            continue
+        cell["status"] = "covered" if answer.get("covered") else "not_covered"
+        cell["verified"] = True
+        cell["reason"] = answer.get("reason")
+
+
+def build_coverage(rfp_id: str, verify: bool = False) -> Optional[dict]:
+    """
+    Requirement × proposal coverage for an RFP (None if the RFP does not exist).
+
+    Cells carry the best similarity score, a status (covered, borderline,
+    not_covered), the best-matching snippet and its page. With verify=True
+    borderline cells are settled by one LLM call per proposal.
+    """
+    rfp = rfp_service.get_rfp(rfp_id)
+    if not rfp:
+        return None
+    proposals = proposal_service.list_proposals(rfp_id=rfp_id)
+
+    req_vectors = _requirement_vectors(rfp) if rfp.requirements else None
+    cells: Dict[str, Optional[List[dict]]] = {
+        p.id: _proposal_cells(p, req_vectors) if req_vectors is not None else None
+        for p in proposals
+    }
+
+    if verify:
+        indexed = [c for c in cells.values() if c]
+        if indexed:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_VERIFY, len(indexed))) as pool:
+                list(pool.map(lambda c: _verify_borderline(rfp, c), indexed))
+
+    summary = []
+    for p in proposals:
+        proposal_cells = cells[p.id]
+        if proposal_cells is None:
+            summary.append({"id": p.id, "vendor": p.contractor, "indexed": False, "coverage_pct": None, "borderline": 0})
+            continue
+        covered = sum(c["status"] == "covered" for c in proposal_cells)
+        summary.append({
+            "id": p.id,
+            "vendor": p.contractor,
+            "indexed": True,
+            "coverage_pct": round(covered / len(proposal_cells) * 100, 1) if proposal_cells else None,
+            "borderline": sum(c["status"] == "borderline" for c in proposal_cells),
+        })
+
+    return {
+        "rfp_id": rfp.id,
+        "proposals": summary,
+        "requirements": [
+            {
+                "id": req.id,
+                "text": req.text,
+                "cells": {pid: c[i] for pid, c in cells.items() if c},
+            }
+            for i, req in enumerate(rfp.requirements)
+        ],
+    }
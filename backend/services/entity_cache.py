@@ -0,0 +1,136 @@
+"""
+Entity Cache
+
+Bounded LRU read-through caches for validated Rfp and Proposal objects,
+so hot paths (upload, chat, approve/reject, matrix, compare) stop
+re-querying and re-validating the same rows.
+
+Entries are dropped when a transaction that wrote the row commits (ORM
+insert/update/delete events, the same hooks stats_service uses); bulk
+statements that bypass the ORM must call invalidate() themselves. Each
+cache also keeps a version stamp: an invalidation while a row is being
+loaded bumps it, and the stale result is not stored. Writes made by other
+processes (jobs, other uvicorn workers) are picked up within TTL_SECONDS.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from backend.models.entities import ProposalModel, RfpModel
+
+MAX_ENTRIES = 512
+TTL_SECONDS = 30.0
+
+_PENDING_KEY = "entity_cache_pending"
+
+
+class ReadThroughCache:
+    """LRU of validated models by id; callers get deep copies so cached objects are never mutated."""
+
+    def __init__(self, name: str, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (expires_at, model)
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: str) -> tuple:
+        """(cached copy or None, version stamp to store a loaded value under)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].model_copy(deep=True), self._version
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None, self._version
+
+    def _store(self, key: str, value: Optional[BaseModel], version: int) -> Optional[BaseModel]:
+        if value is None:  # misses are not cached: the row may be created next
+            return None
+        with self._lock:
+            # Invalidated while loading: the value may predate the write
+            if self._version == version:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value.model_copy(deep=True)
+
+    def get(self, key: str, load: Callable[[str], Optional[BaseModel]]) -> Optional[BaseModel]:
+        cached, version = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._store(key, load(key), version)
+
+    async def get_async(self, key: str, load) -> Optional[BaseModel]:
+        cached, version = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._store(key, await load(key), version)
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Drop `keys` (everything if None)."""
+        with self._lock:
+            self._version += 1
+            if keys is None:
+                self._entries.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+rfps = ReadThroughCache("rfps")
+proposals = ReadThroughCache("proposals")
+
+_CACHES = {RfpModel: rfps, ProposalModel: proposals}
+
+
+def metrics() -> dict:
+    return {cache.name: cache.metrics() for cache in _CACHES.values()}
+
+
+def _record_write(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add((type(target), target.id))
+
+
+for _model in _CACHES:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _record_write)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session) -> None:
+    for model, key in session.info.pop(_PENDING_KEY, ()):
+        _CACHES[model].invalidate([key])
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session) -> None:
+    if session.in_nested_transaction():
+        return  # only a savepoint was rolled back; the outer transaction goes on
+    session.info.pop(_PENDING_KEY, None)
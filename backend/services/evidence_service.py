@@ -0,0 +1,91 @@
+"""
+Evidence Retrieval
+
+Picks the top-k chunks of a proposal PDF for each evaluation dimension, so
+scoring prompts carry grounded snippets (with page numbers) instead of
+every extracted bullet list.
+
+A chunk's relevance to a dimension is the cosine similarity between the
+chunk and the dimension's description, plus a bonus for the share of the
+dimension's keywords that appear in the chunk. All (chunk, dimension)
+pairs of a proposal are scored in one matrix product.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.schemas.analysis import Dimension
+from backend.services import vector_store
+from backend.src.utils.tokens import truncate_to_tokens
+
+EVIDENCE_TOP_K = 3
+# Weight of the keyword-overlap share (0..1) added to cosine similarity
+KEYWORD_WEIGHT = 0.15
+SNIPPET_MAX_TOKENS = 200
+
+
+def dimension_query(dim: Dimension) -> str:
+    """Text embedded to represent a dimension."""
+    keywords = ", ".join(dim.keywords)
+    return f"{dim.name}: {dim.description}. Keywords: {keywords}"
+
+
+def embed_dimensions(dimensions: List[Dimension]) -> np.ndarray:
+    """One unit vector per dimension (single embedding call)."""
+    return vector_store.embed_texts([dimension_query(d) for d in dimensions])
+
+
+def evidence_version(proposal_id: str) -> Optional[str]:
+    """Stamp of the proposal's indexed chunks (None if not indexed); changes on re-ingest."""
+    return vector_store.collection_stamp(vector_store.proposal_collection_name(proposal_id))
+
+
+def _keyword_share(texts: List[str], dimensions: List[Dimension]) -> np.ndarray:
+    """(chunks × dimensions) share of each dimension's keywords found in each chunk."""
+    lowered = [t.lower() for t in texts]
+    share = np.zeros((len(texts), len(dimensions)), dtype=np.float32)
+    for j, dim in enumerate(dimensions):
+        keywords = [k.lower() for k in dim.keywords if k]
+        if not keywords:
+            continue
+        for i, text in enumerate(lowered):
+            share[i, j] = sum(k in text for k in keywords) / len(keywords)
+    return share
+
+
+def retrieve_evidence(
+    proposal_id: str,
+    dimensions: List[Dimension],
+    dimension_vectors: np.ndarray,
+    k: int = EVIDENCE_TOP_K,
+) -> Optional[Dict[str, List[dict]]]:
+    """
+    Top-k snippets per dimension: {dim_id: [{text, page, score}]}.
+
+    Returns None when the proposal has no indexed chunks (or they were
+    embedded with a different model), so callers can fall back to the
+    extracted fields.
+    """
+    chunks = vector_store.get_chunks(vector_store.proposal_collection_name(proposal_id))
+    if not chunks or chunks.vectors.shape[1] != dimension_vectors.shape[1]:
+        return None
+
+    relevance = chunks.vectors @ dimension_vectors.T
+    relevance += KEYWORD_WEIGHT * _keyword_share(chunks.texts, dimensions)
+
+    top_k = min(k, len(chunks))
+    evidence = {}
+    for j, dim in enumerate(dimensions):
+        column = relevance[:, j]
+        best = np.argpartition(-column, top_k - 1)[:top_k]
+        best = best[np.argsort(-column[best])]
+        evidence[dim.id] = [
+            {
+                "text": truncate_to_tokens(chunks.texts[i].strip(), SNIPPET_MAX_TOKENS),
+                "page": vector_store.page_label(chunks.metadatas[i]),
+                "score": round(float(column[i]), 3),
+            }
+            for i in best
+        ]
+    return evidence
@@ -0,0 +1,164 @@
+"""
+Normalization of money cells extracted from proposal forms.
+
+Extraction stores each raw cell as the vendor wrote it ("$1,295,648.70",
+"TBD", "$-"). This module turns those strings into integer minor units plus
+a currency and a quote status once, at write time, so readers can do
+arithmetic without string parsing.
+"""
+
+import re
+from decimal import Decimal, ROUND_HALF_UP
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+
+class QuoteStatus(str, Enum):
+    QUOTED = "quoted"
+    TBD = "tbd"
+    NOT_APPLICABLE = "n/a"
+    NOT_QUOTED = "not_quoted"
+
+
+# Key added to each proposal_form_data row: {column: {minor, currency, status}}
+NORMALIZED_KEY = "normalized"
+
+# Row keys that never hold amounts
+_TEXT_KEYS = {"section", "item_id", "description", "unit", "values", NORMALIZED_KEY}
+_AMOUNT_HINTS = ("cost", "price", "total", "amount", "rate", "fee", "sum")
+
+# Currencies whose minor unit is not 1/100
+_MINOR_EXPONENT = {"JPY": 0, "KRW": 0, "VND": 0, "KWD": 3, "BHD": 3, "OMR": 3}
+# "$" is left to the proposal's own currency (USD, CAD, AUD ... all use it)
+_SYMBOLS = {"€": "EUR", "£": "GBP", "¥": "JPY"}
+_KNOWN_CODES = set(_MINOR_EXPONENT) | {
+    "USD", "EUR", "GBP", "CAD", "AUD", "NZD", "CHF", "MXN", "INR", "PKR", "AED", "SAR",
+}
+
+_TBD_WORDS = {"TBD", "TBA", "TO BE DETERMINED", "TO BE CONFIRMED", "TBC"}
+_NA_WORDS = {"N/A", "NA", "N.A.", "NOT APPLICABLE", "NONE"}
+_NOT_QUOTED_WORDS = {"", "-", "--", "NOT QUOTED", "NQ", "NO BID"}
+# Accounting-format zero, e.g. "$ -"
+_ACCOUNTING_ZERO = re.compile(r"^[$€£¥]\s*-+$")
+# A whole cell holding one amount: optional parentheses, sign and currency
+# symbol/code around digits with proper thousands grouping and an optional
+# decimal part. Anything else ("See note 4", "5%", "2 @ $500") is not an amount.
+_AMOUNT = re.compile(
+    r"""^(?P<open>\()?\s*(?P<sign>-)?\s*
+    (?:(?P<prefix>[$€£¥]|[A-Z]{3})\s*)?
+    (?P<inner_sign>-)?\s*
+    (?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)
+    \s*(?P<suffix>[€£¥]|[A-Z]{3})?
+    \s*(?P<close>\))?$""",
+    re.VERBOSE,
+)
+
+
+def minor_exponent(currency: str) -> int:
+    return _MINOR_EXPONENT.get((currency or "USD").upper(), 2)
+
+
+def minor_to_float(minor: Optional[int], currency: str = "USD") -> Optional[float]:
+    """Convert integer minor units back to a float amount."""
+    if minor is None:
+        return None
+    return minor / (10 ** minor_exponent(currency))
+
+
+def parse_amount(value: Any, default_currency: str = "USD") -> Tuple[Optional[int], str, QuoteStatus]:
+    """
+    Parse a raw cell into (minor_units, currency, status).
+
+    Handles '$1,295,648.70', '(1,200.00)', '-$50', 'EUR 950', '950 EUR',
+    1295648.7, 'TBD', 'N/A' and '$-' (accounting zero). Only a cell that is
+    a single well-formed amount is quoted; any other text ('Included in
+    item 3.2', '5%', '1.295,70') is reported as N/A with no amount.
+    """
+    currency = (default_currency or "USD").upper()
+    if value is None:
+        return None, currency, QuoteStatus.NOT_QUOTED
+    if isinstance(value, bool):
+        return None, currency, QuoteStatus.NOT_APPLICABLE
+    if isinstance(value, (int, float)):
+        amount = Decimal(str(value))
+    else:
+        text = str(value).strip()
+        upper = text.upper()
+        if upper in _NOT_QUOTED_WORDS:
+            return None, currency, QuoteStatus.NOT_QUOTED
+        if upper in _TBD_WORDS:
+            return None, currency, QuoteStatus.TBD
+        if upper in _NA_WORDS:
+            return None, currency, QuoteStatus.NOT_APPLICABLE
+
+        if _ACCOUNTING_ZERO.match(text):
+            return 0, _SYMBOLS.get(text[0], currency), QuoteStatus.QUOTED
+
+        match = _AMOUNT.match(upper)
+        if not match or bool(match["open"]) != bool(match["close"]):
+            return None, currency, QuoteStatus.NOT_APPLICABLE
+        if match["sign"] and match["inner_sign"]:
+            return None, currency, QuoteStatus.NOT_APPLICABLE
+        for marker in (match["prefix"], match["suffix"]):
+            if not marker or marker == "$":
+                continue
+            code = _SYMBOLS.get(marker, marker)
+            if code not in _KNOWN_CODES:
+                return None, currency, QuoteStatus.NOT_APPLICABLE
+            currency = code
+
+        amount = Decimal(match["number"].replace(",", ""))
+        negative = bool(match["open"] or match["sign"] or match["inner_sign"])
+        if negative:
+            amount = -abs(amount)
+
+    if not amount.is_finite():
+        return None, currency, QuoteStatus.NOT_APPLICABLE
+    scale = Decimal(10) ** minor_exponent(currency)
+    minor = int((amount * scale).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    return minor, currency, QuoteStatus.QUOTED
+
+
+def normalize_amount(value: Any, default_currency: str = "USD") -> dict:
+    """JSON-friendly form of parse_amount, as stored next to raw cells."""
+    minor, currency, status = parse_amount(value, default_currency)
+    return {"minor": minor, "currency": currency, "status": status.value}
+
+
+def is_amount_column(name: str) -> bool:
+    """Heuristic used across the app: cost/price/total-like columns hold money."""
+    lowered = (name or "").lower()
+    return lowered not in _TEXT_KEYS and any(hint in lowered for hint in _AMOUNT_HINTS)
+
+
+def normalize_form_row(row: dict, default_currency: str = "USD") -> dict:
+    """Return `row` with a 'normalized' entry for each amount column."""
+    normalized = {}
+    for key, value in row.items():
+        if key in _TEXT_KEYS or isinstance(value, (dict, list)):
+            continue
+        if is_amount_column(key):
+            normalized[key] = normalize_amount(value, default_currency)
+
+    # Dynamic columns stored as [{column, value}, ...]
+    values = row.get("values")
+    if isinstance(values, list):
+        for pair in values:
+            if not isinstance(pair, dict):
+                continue
+            column = pair.get("column")
+            if column and column not in normalized and is_amount_column(column):
+                normalized[column] = normalize_amount(pair.get("value"), default_currency)
+
+    return {**row, NORMALIZED_KEY: normalized}
+
+
+def normalize_form_rows(rows: List[dict], default_currency: str = "USD") -> List[dict]:
+    return [normalize_form_row(row, default_currency) for row in rows if isinstance(row, dict)]
+
+
+def normalized_cell(row: Optional[dict], column: str) -> Optional[dict]:
+    """The stored normalized entry for `column` of a form row, if any."""
+    if not row:
+        return None
+    return (row.get(NORMALIZED_KEY) or {}).get(column)
@@ -0,0 +1,469 @@
+"""
+Comparison Matrix Export
+
+Streams a MatrixLayout to Excel without building a DataFrame, a report
+file or a temporary file: worksheet rows are serialized straight into a
+zip entry (styles come from openpyxl named styles) and the workbook zip is
+piped to the HTTP response as it is written.
+
+Also serializes the aligned line items and vendor totals as CSV and as
+Arrow/Parquet for notebook and BI use.
+"""
+
+import csv
+import io
+import math
+import queue
+import threading
+import zipfile
+from typing import Iterator, List
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.stylesheet import write_stylesheet
+from openpyxl.utils import get_column_letter
+from openpyxl.xml.functions import tostring
+
+from backend.services import matrix_service
+from backend.services.matrix_service import MatrixLayout
+
+CHUNK_SIZE = 64 * 1024
+# Max chunks buffered between the workbook writer and the response
+MAX_PENDING_CHUNKS = 16
+
+_THIN = Side(style='thin')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+
+def _named_styles() -> list[NamedStyle]:
+    """Shared styles, registered once per workbook instead of per-cell objects."""
+    return [
+        NamedStyle(name="matrix_title", font=Font(bold=True, size=14)),
+        NamedStyle(name="matrix_vendor", font=Font(bold=True)),
+        NamedStyle(
+            name="matrix_header",
+            font=Font(color="FFFFFF", bold=True),
+            fill=PatternFill(start_color="0066B2", end_color="0066B2", fill_type="solid"),
+            alignment=Alignment(horizontal='center', wrap_text=True),
+            border=_BORDER,
+        ),
+        NamedStyle(name="matrix_section", font=Font(bold=True), border=_BORDER),
+        NamedStyle(name="matrix_cell", border=_BORDER),
+        NamedStyle(
+            name="matrix_currency",
+            border=_BORDER,
+            alignment=Alignment(horizontal='right'),
+            number_format='"$"#,##0.00',
+        ),
+        NamedStyle(
+            name="matrix_total",
+            font=Font(bold=True),
+            border=_BORDER,
+            alignment=Alignment(horizontal='right'),
+            number_format='"$"#,##0.00',
+        ),
+    ]
+
+
+class _Styles:
+    """
+    Named styles registered on an (empty, in-memory) openpyxl workbook, which
+    then provides the style index of each name and the styles.xml part.
+    """
+
+    def __init__(self):
+        self._wb = Workbook()
+        for style in _named_styles():
+            self._wb.add_named_style(style)
+        cell = self._wb.active.cell(row=1, column=1)
+        self.ids = {}
+        for style in _named_styles():
+            cell.style = style.name
+            self.ids[style.name] = cell.style_id
+
+    def xml(self) -> bytes:
+        return tostring(write_stylesheet(self._wb))
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '<Relationship Id="rId2" Target="styles.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_SHEET_TOP = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="3" topLeftCell="A4" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<cols><col min="1" max="1" width="8" customWidth="1"/><col min="2" max="2" width="50" customWidth="1"/></cols>'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+SHEET_TITLE = "Bid Comparison"
+
+
+class _SheetWriter:
+    """Serializes rows of (value, style name) cells as worksheet XML into a binary stream."""
+
+    def __init__(self, out, styles: _Styles):
+        self._out = out
+        self._style_ids = styles.ids
+        self._columns: List[str] = []
+        self._row = 0
+
+    def _column(self, index: int) -> str:
+        while len(self._columns) <= index:
+            self._columns.append(get_column_letter(len(self._columns) + 1))
+        return self._columns[index]
+
+    def _cell(self, ref: str, value, style: str) -> str:
+        s = self._style_ids[style]
+        if isinstance(value, bool):
+            return f'<c r="{ref}" s="{s}" t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return f'<c r="{ref}" s="{s}"><v>{value!r}</v></c>'
+        text = escape(ILLEGAL_CHARACTERS_RE.sub("", str(value)))
+        return f'<c r="{ref}" s="{s}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+    def append(self, cells: list) -> None:
+        """Write one row; `cells` holds (value, style) pairs or None for an empty cell."""
+        self._row += 1
+        parts = [f'<row r="{self._row}">']
+        for index, cell in enumerate(cells):
+            if cell is None or cell[0] is None:
+                continue
+            parts.append(self._cell(f"{self._column(index)}{self._row}", *cell))
+        parts.append("</row>")
+        self._out.write("".join(parts).encode("utf-8"))
+
+
+def _value_cell(value) -> tuple:
+    """Currency strings become numbers so the sheet can be summed in Excel."""
+    if isinstance(value, str) and value.startswith('$'):
+        number = matrix_service.parse_number(value)
+        if number is not None:
+            return (number, "matrix_currency")
+    return (value, "matrix_cell")
+
+
+def _write_sheet(layout: MatrixLayout, ws: _SheetWriter) -> None:
+    fixed_columns = layout.fixed_columns
+    vendor_columns = layout.vendor_columns
+    proposals = layout.proposals
+    total_column = layout.total_column
+
+    ws.append([(layout.rfp.title, "matrix_title")])
+
+    # Vendor names above each vendor block
+    vendor_header = [None] * len(fixed_columns)
+    for p in proposals:
+        vendor_header.append((p.contractor, "matrix_vendor"))
+        vendor_header.extend([None] * (len(vendor_columns) - 1))
+    ws.append(vendor_header)
+
+    header = [(col, "matrix_header") for col in fixed_columns]
+    for p in proposals:
+        header.extend((f"{p.contractor} {col}", "matrix_header") for col in vendor_columns)
+    ws.append(header)
+
+    grand_totals = {p.id: 0.0 for p in proposals}
+    current_section = None
+
+    for rfp_row, vendor_rows in matrix_service.iter_aligned_rows(layout):
+        section = rfp_row.get('section')
+        if section and section != current_section and fixed_columns:
+            current_section = section
+            ws.append([(section, "matrix_section")])
+
+        row = [(rfp_row.get(col), "matrix_cell") for col in fixed_columns]
+        for p in proposals:
+            vendor_row = vendor_rows[p.id]
+            row.extend(_value_cell(matrix_service.vendor_cell(vendor_row, col)) for col in vendor_columns)
+            total_num = matrix_service.row_total(vendor_row, total_column)
+            if total_num is not None:
+                grand_totals[p.id] += total_num
+        ws.append(row)
+
+    if total_column:
+        total_row = [("GRAND TOTAL" if col in ('description', 'item_id') else "", "matrix_section")
+                     for col in fixed_columns]
+        for p in proposals:
+            for col in vendor_columns:
+                if col == total_column:
+                    total_row.append((grand_totals[p.id], "matrix_total"))
+                else:
+                    total_row.append(("", "matrix_cell"))
+        ws.append(total_row)
+
+
+def write_matrix_workbook(layout: MatrixLayout, fileobj) -> None:
+    """
+    Write the comparison matrix of `layout` as an .xlsx into `fileobj`,
+    which may be unseekable.
+
+    The worksheet XML is generated row by row straight into its zip entry
+    (openpyxl's write-only mode would spool it to a temporary file first),
+    so nothing touches the disk and memory does not grow with the matrix.
+    """
+    styles = _Styles()
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(title=SHEET_TITLE))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", styles.xml())
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(_SHEET_TOP.encode("utf-8"))
+            _write_sheet(layout, _SheetWriter(sheet, styles))
+            sheet.write(_SHEET_TAIL.encode("utf-8"))
+
+
+class _QueueWriter(io.RawIOBase):
+    """Unseekable file object that hands fixed-size chunks to a bounded queue."""
+
+    def __init__(self, chunks: "queue.Queue", cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._put(bytes(self._buffer[:CHUNK_SIZE]))
+            del self._buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def flush_remaining(self) -> None:
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _put(self, item) -> None:
+        # Block while the client is slow, but give up once it has gone away
+        while not self._cancelled.is_set():
+            try:
+                self._chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+        raise BrokenPipeError("Export cancelled by client")
+
+
+_DONE = object()
+
+
+def stream_matrix_xlsx(layout: MatrixLayout) -> Iterator[bytes]:
+    """
+    Yield the .xlsx bytes of the comparison matrix as they are produced.
+
+    The workbook is written on a background thread into a bounded queue, so
+    memory stays flat regardless of row or vendor count.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=MAX_PENDING_CHUNKS)
+    cancelled = threading.Event()
+    errors: list[BaseException] = []
+
+    def produce():
+        writer = _QueueWriter(chunks, cancelled)
+        try:
+            write_matrix_workbook(layout, writer)
+            writer.flush_remaining()
+        except BaseException as e:  # surfaced to the consumer below
+            errors.append(e)
+        finally:
+            try:
+                writer._put(_DONE)
+            except BrokenPipeError:
+                pass
+
+    producer = threading.Thread(target=produce, name="matrix-xlsx-export", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        cancelled.set()
+        # Unblock the producer if it is waiting on a full queue
+        while not chunks.empty():
+            chunks.get_nowait()
+
+
+# --- Columnar exports (CSV / Arrow / Parquet) ---
+
+LINE_ITEM_TABLE = "line_items"
+TOTALS_TABLE = "totals"
+
+
+def _line_item_header(layout: MatrixLayout) -> List[str]:
+    return (
+        ["row_index"]
+        + list(layout.fixed_columns)
+        + ["proposal_id", "vendor", "quote_status"]
+        + list(layout.vendor_columns)
+        + ["line_total"]
+    )
+
+
+def _iter_line_item_records(layout: MatrixLayout) -> Iterator[list]:
+    """
+    One flat record per (line item, vendor), in _line_item_header order.
+
+    Vendor cells keep their raw values; unquoted items are null and flagged
+    by quote_status instead of carrying the 'Not Quoted' display text.
+    """
+    fixed_columns = layout.fixed_columns
+    vendor_columns = layout.vendor_columns
+    total_column = layout.total_column
+    for index, (rfp_row, vendor_rows) in enumerate(matrix_service.iter_aligned_rows(layout)):
+        fixed = [rfp_row.get(col) for col in fixed_columns]
+        for p in layout.proposals:
+            vendor_row = vendor_rows[p.id]
+            yield (
+                [index] + fixed
+                + [p.id, p.contractor, matrix_service.quote_status(vendor_row, total_column)]
+                + ([vendor_row.get(col) for col in vendor_columns] if vendor_row else [None] * len(vendor_columns))
+                + [matrix_service.row_total(vendor_row, total_column)]
+            )
+
+
+def _totals_header() -> List[str]:
+    return ["proposal_id", "vendor", "status", "items_quoted", "items_total", "grand_total"]
+
+
+def _totals_records(layout: MatrixLayout) -> List[list]:
+    """Vendor grand totals over every line item of the matrix."""
+    total_column = layout.total_column
+    grand_totals = {p.id: 0.0 for p in layout.proposals}
+    quoted = {p.id: 0 for p in layout.proposals}
+    for _, vendor_rows in matrix_service.iter_aligned_rows(layout):
+        for pid, vendor_row in vendor_rows.items():
+            if vendor_row:
+                quoted[pid] += 1
+            total_num = matrix_service.row_total(vendor_row, total_column)
+            if total_num is not None:
+                grand_totals[pid] += total_num
+    return [
+        [p.id, p.contractor, p.status, quoted[p.id], len(layout.rfp_rows),
+         grand_totals[p.id] if total_column else None]
+        for p in layout.proposals
+    ]
+
+
+def stream_matrix_csv(layout: MatrixLayout, table: str = LINE_ITEM_TABLE, batch_rows: int = 1000) -> Iterator[str]:
+    """Yield the matrix as CSV text in batches of `batch_rows` records."""
+    if table == TOTALS_TABLE:
+        header, records = _totals_header(), iter(_totals_records(layout))
+    else:
+        header, records = _line_item_header(layout), _iter_line_item_records(layout)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    pending = 0
+    for record in records:
+        writer.writerow(record)
+        pending += 1
+        if pending >= batch_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def build_matrix_arrow_table(layout: MatrixLayout, table: str = LINE_ITEM_TABLE):
+    """
+    Build a pyarrow.Table with one column array per field.
+
+    Records are appended straight into per-column lists, so no per-row dicts
+    are built on the way to Arrow. Requires pyarrow.
+    """
+    import pyarrow as pa
+
+    if table == TOTALS_TABLE:
+        header, records = _totals_header(), _totals_records(layout)
+        types = [pa.string(), pa.string(), pa.string(), pa.int32(), pa.int32(), pa.float64()]
+    else:
+        header, records = _line_item_header(layout), _iter_line_item_records(layout)
+        types = (
+            [pa.int32()]
+            + [pa.string()] * len(layout.fixed_columns)
+            + [pa.string()] * 3
+            + [pa.string()] * len(layout.vendor_columns)
+            + [pa.float64()]
+        )
+
+    columns: List[list] = [[] for _ in header]
+    appenders = [c.append for c in columns]
+    for record in records:
+        for append, value in zip(appenders, record):
+            append(value)
+
+    string_positions = {i for i, t in enumerate(types) if t == pa.string()}
+    arrays = [
+        pa.array([None if v is None else str(v) for v in values] if i in string_positions else values, type=types[i])
+        for i, values in enumerate(columns)
+    ]
+    schema = pa.schema(
+        [pa.field(name, t) for name, t in zip(header, types)],
+        metadata={"rfp_id": layout.rfp.id, "rfp_title": layout.rfp.title, "table": table},
+    )
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def matrix_arrow_bytes(layout: MatrixLayout, fmt: str, table: str = LINE_ITEM_TABLE) -> bytes:
+    """Serialize the matrix as an Arrow IPC stream ('arrow') or Parquet ('parquet')."""
+    import pyarrow as pa
+
+    arrow_table = build_matrix_arrow_table(layout, table)
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(arrow_table, sink, compression="zstd")
+    else:
+        with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    return sink.getvalue().to_pybytes()
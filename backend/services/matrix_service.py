@@ -0,0 +1,258 @@
+"""
+Comparison Matrix Service
+
+Resolves the layout of an RFP's comparison matrix (line items, fixed columns,
+vendor columns) once, so the JSON matrix endpoint and the file exports all
+align vendor rows the same way.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from backend.models.db import write_session
+from backend.models.entities import RfpModel
+from backend.schemas.proposal import Proposal
+from backend.schemas.rfp import Rfp
+from backend.services import proposal_service, rfp_service
+from backend.services.ingest.amounts import NORMALIZED_KEY, QuoteStatus, minor_to_float, normalized_cell
+from backend.src.utils.hashing import content_hash
+from backend.workers import db_writer
+
+
+class MatrixLayout(BaseModel):
+    """Everything needed to render an RFP's line-item comparison matrix."""
+    rfp: Rfp
+    proposals: List[Proposal]
+    rfp_rows: List[dict]
+    fixed_columns: List[str] = []
+    vendor_columns: List[str] = []
+
+    @property
+    def total_column(self) -> Optional[str]:
+        """Vendor column holding the line total, used for grand totals."""
+        return next((c for c in self.vendor_columns if 'total' in c.lower()), None)
+
+    @property
+    def version(self) -> str:
+        """Content hash of the line items, columns and vendor form data."""
+        return content_hash({
+            "rows": self.rfp_rows,
+            "fixed": self.fixed_columns,
+            "vendor": self.vendor_columns,
+            "proposals": [(p.id, p.proposal_form_data) for p in self.proposals],
+        })
+
+
+def parse_number(value) -> Optional[float]:
+    """Parse a matrix cell like '$1,295.70' into a float (None for TBD, N/A, '-')."""
+    if not value or str(value).upper() in ('TBD', 'N/A', '-', '$-', ''):
+        return None
+    try:
+        cleaned = str(value).replace('$', '').replace(',', '').strip()
+        return float(cleaned)
+    except (ValueError, TypeError):
+        return None
+
+
+def _elect_rows_from_proposals(rfp: Rfp, proposals: List[Proposal]) -> List[dict]:
+    """Consensus Logic: if the RFP has no rows, elect a structure from the proposals."""
+    from backend.src.agents.comparison_matrix_builder import ComparisonMatrixBuilder
+    from backend.src.agents.vendor_data_extractor import VendorProposalData, FilledFormRow
+
+    # Convert DB proposals to VendorProposalData objects for the builder
+    vendor_proposals = []
+    for p in proposals:
+        if not p.proposal_form_data:
+            continue
+        filled_rows = []
+        for row in p.proposal_form_data:
+            # Adapt the DB dict to the 'values' dict FilledFormRow expects
+            values_dict = {
+                k: (str(v) if v is not None else "")
+                for k, v in row.items()
+                if k not in ["item_id", "description", "section", NORMALIZED_KEY]
+            }
+            filled_rows.append(FilledFormRow(
+                section=row.get("section", ""),
+                item_id=row.get("item_id", ""),
+                description=row.get("description", ""),
+                values=values_dict
+            ))
+        vendor_proposals.append(VendorProposalData(
+            proposal_id=str(p.id),
+            rfp_id=str(rfp.id),
+            vendor_name=p.contractor or "Unknown",
+            filled_rows=filled_rows
+        ))
+
+    if not vendor_proposals:
+        return []
+
+    builder = ComparisonMatrixBuilder()
+    elected_structure = builder._elect_structure_from_proposals(vendor_proposals)
+    if elected_structure and elected_structure.rows:
+        print(f"✓ Elected consensus structure from proposals: {len(elected_structure.rows)} rows")
+        return [r.model_dump() for r in elected_structure.rows]
+    return []
+
+
+async def load_matrix_layout(rfp_id: str) -> Optional[MatrixLayout]:
+    """
+    Load the RFP, its proposals and the classified matrix columns.
+
+    COLUMN CLASSIFICATION:
+    - Majority voting: >50% match with RFP → Fixed column
+    - AI semantic check: For ambiguous columns
+    - Cached per RFP + proposal set
+
+    Returns None if the RFP does not exist. If there are no line items the
+    layout is returned with empty rows and columns.
+    """
+    from backend.services.column_classifier import (
+        classify_columns_majority_voting,
+        classify_with_ai_fallback,
+        get_cached_classification,
+        build_cache
+    )
+
+    rfp = await rfp_service.get_rfp_async(rfp_id)
+    if not rfp:
+        return None
+
+    proposals = await proposal_service.list_proposals_async(rfp_id=rfp_id)
+    rfp_rows = rfp.proposal_form_rows or []
+
+    if not rfp_rows and proposals:
+        try:
+            rfp_rows = _elect_rows_from_proposals(rfp, proposals)
+        except Exception as e:
+            print(f"⚠ Consensus election failed: {e}")
+
+    if not rfp_rows:
+        return MatrixLayout(rfp=rfp, proposals=proposals, rfp_rows=[])
+
+    # Get proposal IDs with form data
+    proposal_ids_with_data = [p.id for p in proposals if p.proposal_form_data]
+
+    # --- Check cache ---
+    cached = get_cached_classification(rfp.comparison_matrix_cache or {}, proposal_ids_with_data)
+
+    if cached:
+        fixed_columns, vendor_columns = cached
+        print(f"✓ Using cached classification: fixed={fixed_columns}, vendor={vendor_columns}")
+    else:
+        # --- Run classification ---
+        print("→ Running column classification...")
+
+        vendor_data = [
+            {"id": p.id, "proposal_form_data": p.proposal_form_data}
+            for p in proposals
+        ]
+
+        # First try majority voting only (faster)
+        fixed_columns, vendor_columns, ambiguous = classify_columns_majority_voting(
+            rfp_rows, vendor_data, threshold=0.5
+        )
+
+        # If we have ambiguous columns, use AI fallback
+        if ambiguous:
+            print(f"  → Ambiguous columns detected: {ambiguous}, running AI check...")
+            fixed_columns, vendor_columns = await classify_with_ai_fallback(
+                rfp_rows, vendor_data, threshold=0.5
+            )
+
+        print(f"  ✓ Classification: fixed={fixed_columns}, vendor={vendor_columns}")
+
+        # --- Save cache ---
+        new_cache = build_cache(fixed_columns, vendor_columns, proposal_ids_with_data)
+        if await db_writer.run_async(_save_classification_cache, rfp_id, new_cache):
+            print(f"  ✓ Saved classification cache for RFP {rfp_id[:8]}")
+
+    return MatrixLayout(
+        rfp=rfp,
+        proposals=proposals,
+        rfp_rows=rfp_rows,
+        fixed_columns=fixed_columns,
+        vendor_columns=vendor_columns,
+    )
+
+
+def _save_classification_cache(rfp_id: str, cache: dict) -> bool:
+    """Store the column classification on the RFP (runs on the db_writer thread)."""
+    with write_session() as session:
+        db_rfp = session.get(RfpModel, rfp_id)
+        if not db_rfp:
+            return False
+        db_rfp.comparison_matrix_cache = cache
+        session.add(db_rfp)
+        session.commit()
+        return True
+
+
+def index_vendor_rows(proposal: Proposal) -> Dict[str, dict]:
+    """Map a proposal's form rows by item_id (first occurrence wins)."""
+    index: Dict[str, dict] = {}
+    for row in (proposal.proposal_form_data or []):
+        index.setdefault(str(row.get('item_id', '')).strip(), row)
+    return index
+
+
+def iter_aligned_rows(layout: MatrixLayout) -> Iterator[Tuple[dict, Dict[str, Optional[dict]]]]:
+    """
+    Yield (rfp_row, {proposal_id: vendor_row or None}) for every RFP line item.
+
+    Vendor rows are indexed once per proposal, so alignment is linear in the
+    number of cells instead of rescanning each proposal for every item.
+    """
+    lookups = {p.id: index_vendor_rows(p) for p in layout.proposals}
+    for rfp_row in layout.rfp_rows:
+        item_id = str(rfp_row.get('item_id')).strip()
+        yield rfp_row, {pid: lookup.get(item_id) for pid, lookup in lookups.items()}
+
+
+def vendor_cell(vendor_row: Optional[dict], column: str):
+    """Display value of a vendor column ('Not Quoted' when the item is missing)."""
+    if not vendor_row:
+        return "Not Quoted"
+    return vendor_row.get(column) or "-"
+
+
+def cell_amount(vendor_row: Optional[dict], column: Optional[str]) -> Optional[float]:
+    """Numeric value of any amount column of a vendor row, if it has one."""
+    if not column or not vendor_row:
+        return None
+    cell = normalized_cell(vendor_row, column)
+    if cell is not None:
+        return minor_to_float(cell.get('minor'), cell.get('currency'))
+    return parse_number(vendor_row.get(column))
+
+
+def _total_cell(vendor_row: dict, total_column: str) -> Optional[dict]:
+    """Normalized entry for the row's line total, if extraction stored one."""
+    return normalized_cell(vendor_row, total_column) or normalized_cell(vendor_row, 'total')
+
+
+def row_total(vendor_row: Optional[dict], total_column: Optional[str]) -> Optional[float]:
+    """Numeric line total of a vendor row, if it has one."""
+    if not total_column or not vendor_row:
+        return None
+    cell = _total_cell(vendor_row, total_column)
+    if cell is not None:
+        return minor_to_float(cell.get('minor'), cell.get('currency'))
+    # Rows stored before amounts were normalized
+    return parse_number(vendor_row.get(total_column) or vendor_row.get('total'))
+
+
+def quote_status(vendor_row: Optional[dict], total_column: Optional[str] = None) -> str:
+    """
+    Quote status of a line item: 'not_quoted' when the vendor has no row,
+    otherwise the normalized status of its total ('quoted', 'tbd', 'n/a').
+    """
+    if not vendor_row:
+        return QuoteStatus.NOT_QUOTED.value
+    if total_column:
+        cell = _total_cell(vendor_row, total_column)
+        if cell is not None and cell.get('status') != QuoteStatus.NOT_QUOTED.value:
+            return cell['status']
+    return QuoteStatus.QUOTED.value
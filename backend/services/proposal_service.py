@@ -1,10 +1,14 @@
 from typing import List, Optional
 
+from sqlalchemy import func
 from sqlmodel import select
 
-from backend.models.db import get_session
+from backend.models.db import get_async_session, get_session, write_session
 from backend.models.entities import ProposalModel
-from backend.schemas.proposal import Proposal, ProposalCreate
+from backend.schemas.proposal import Proposal, ProposalCreate, ProposalPage, ProposalSummary
+from backend.services import answer_cache, entity_cache, text_store
+from backend.services.ingest.amounts import normalize_form_rows, parse_amount
+from backend.src.utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_after
 
 
 def list_proposals(rfp_id: Optional[str] = None) -> List[Proposal]:
@@ -16,31 +20,120 @@ def list_proposals(rfp_id: Optional[str] = None) -> List[Proposal]:
         return [Proposal.model_validate(p) for p in proposals]
 
 
-def create_proposal(payload: ProposalCreate) -> Proposal:
+async def list_proposals_async(rfp_id: Optional[str] = None) -> List[Proposal]:
+    """list_proposals for async routes: the query does not block the event loop."""
+    async with get_async_session() as session:
+        stmt = select(ProposalModel).order_by(ProposalModel.created_at.desc())
+        if rfp_id:
+            stmt = stmt.where(ProposalModel.rfp_id == rfp_id)
+        proposals = (await session.exec(stmt)).all()
+        return [Proposal.model_validate(p) for p in proposals]
+
+
+def list_proposal_summaries(
+    rfp_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> ProposalPage:
+    """
+    One page of proposal listings, newest first.
+
+    Selects only the listing columns (heavy text/JSON columns are never
+    read) and pages by keyset on (created_at, id). Raises ValueError for a
+    malformed cursor.
+    """
+    has_experience = func.coalesce(func.json_array_length(ProposalModel.experience), 0) > 0
+    stmt = select(
+        ProposalModel.id,
+        ProposalModel.rfp_id,
+        ProposalModel.contractor,
+        ProposalModel.contractor_email,
+        ProposalModel.price,
+        ProposalModel.currency,
+        ProposalModel.price_status,
+        ProposalModel.start_date,
+        ProposalModel.summary,
+        has_experience.label("has_experience"),
+        ProposalModel.status,
+        ProposalModel.created_at,
+    )
+    if rfp_id:
+        stmt = stmt.where(ProposalModel.rfp_id == rfp_id)
+    if status:
+        stmt = stmt.where(ProposalModel.status == status)
+    if cursor:
+        stmt = stmt.where(keyset_after(ProposalModel, cursor))
+    # One extra row tells whether another page exists
+    stmt = stmt.order_by(ProposalModel.created_at.desc(), ProposalModel.id.desc()).limit(limit + 1)
+
+    with get_session() as session:
+        rows = session.exec(stmt).all()
+    items = [ProposalSummary.model_validate(dict(row._mapping)) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return ProposalPage(items=items, next_cursor=next_cursor)
+
+
+def create_proposal(payload: ProposalCreate, proposal_id: Optional[str] = None) -> Proposal:
+    """
+    Insert a proposal and its extracted text in one transaction.
+
+    `proposal_id` lets callers that name files or collections after the
+    proposal pick the id before anything is stored.
+    """
     data = payload.model_dump()
+    if proposal_id:
+        data["id"] = proposal_id
+    if data.get("price") is not None and data.get("price_minor") is None:
+        minor, _, status = parse_amount(data["price"], data.get("currency") or "USD")
+        data["price_minor"], data["price_status"] = minor, status.value
+    if data.get("proposal_form_data"):
+        data["proposal_form_data"] = normalize_form_rows(data["proposal_form_data"], data.get("currency") or "USD")
+    text = data.pop("extracted_text", None)
     proposal = ProposalModel(**data)
-    with get_session() as session:
+    with write_session() as session:
         session.add(proposal)
+        session.flush()
+        if text:
+            text_store.store_text(session, proposal.id, text)
         session.commit()
         session.refresh(proposal)
-        return Proposal.model_validate(proposal)
+        result = Proposal.model_validate(proposal)
+    result.extracted_text = text
+    return result
 
 
-def get_proposal(proposal_id: str) -> Optional[Proposal]:
+def _load_proposal(proposal_id: str) -> Optional[Proposal]:
     with get_session() as session:
         proposal = session.get(ProposalModel, proposal_id)
         return Proposal.model_validate(proposal) if proposal else None
 
 
+def get_proposal(proposal_id: str, with_text: bool = False) -> Optional[Proposal]:
+    """
+    A proposal, served from the entity cache; its extracted text (stored
+    separately, never cached) is only loaded with with_text=True.
+    """
+    result = entity_cache.proposals.get(proposal_id, _load_proposal)
+    if result and with_text:
+        result.extracted_text = text_store.load_text(proposal_id)
+    return result
+
+
+def get_extracted_text(proposal_id: str) -> Optional[str]:
+    """Full text extracted from the proposal PDF, loaded on demand."""
+    return text_store.load_text(proposal_id)
+
+
 def update_extracted_text(proposal_id: str, text: str) -> None:
     """Attach extracted text to a proposal after PDF ingest."""
     with get_session() as session:
         proposal = session.get(ProposalModel, proposal_id)
         if not proposal:
             return
-        proposal.extracted_text = text
-        session.add(proposal)
+        text_store.store_text(session, proposal_id, text)
         session.commit()
+    answer_cache.invalidate(proposal_id)
 
 
 
@@ -66,10 +159,13 @@ def update_proposal_details(proposal_id: str, updates: dict) -> None:
         
         # update fields if present in updates dict
         for key, value in updates.items():
-            if hasattr(proposal, key):
+            if key == "extracted_text":
+                text_store.store_text(session, proposal_id, value)
+            elif hasattr(proposal, key):
                 setattr(proposal, key, value)
         
         session.add(proposal)
         session.commit()
+    answer_cache.invalidate(proposal_id)
 
 
@@ -1,88 +1,160 @@
-from statistics import mean
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
+from sqlmodel import select
+
+from backend.models.db import get_session, write_session
+from backend.models.entities import ProposalReviewModel
+from backend.schemas.proposal import Proposal
 from backend.schemas.review import Comparison, ComparisonRow, ReviewResult, Finding
-from backend.services import proposal_service, rfp_service
+from backend.schemas.rfp import Rfp
+from backend.services import proposal_service, rfp_digest, rfp_service, text_store
+from backend.src.utils.hashing import content_hash
 from backend.src.utils.llm_client import complete_json
+from backend.workers import db_writer
 
 from pathlib import Path
 
 PROMPT_PATH = Path(__file__).parent / "review" / "prompts" / "evaluate_proposal.txt"
+SYSTEM_PROMPT = "You are an RFP proposal evaluator. Return STRICT JSON only."
+
+# Stale reviews evaluated concurrently on a read
+MAX_PARALLEL_REVIEWS = 8
+# A failed evaluation is stored as an empty review and served until it is
+# this old, so reads during a provider outage do not each call the LLM again
+REVIEW_RETRY_SECONDS = 300
 
 
-def _evaluate_with_ai(requirements: list[dict], proposal_text: str, summary_hint: str | None) -> dict:
-    req_text = "\n".join([f"- {r.text}" for r in requirements]) if requirements else "None provided."
-    system = "You are an RFP proposal evaluator. Return STRICT JSON only."
+def _evaluate_with_ai(rfp_context: str, proposal_text: str, summary_hint: str | None) -> dict:
     instructions = PROMPT_PATH.read_text(encoding="utf-8")
+    # Instructions, then the RFP digest: a stable prefix shared by every proposal of the RFP
     prompt = (
         f"{instructions}\n\n"
-        "RFP requirements:\n"
-        f"{req_text}\n\n"
+        "RFP digest:\n"
+        f"{rfp_context}\n\n"
         "Proposal text:\n"
         f"{proposal_text or 'Not provided.'}\n\n"
         "Existing summary (may be empty):\n"
         f"{summary_hint or ''}\n"
     )
-    return complete_json(system, prompt)
+    return complete_json(SYSTEM_PROMPT, prompt)
+
+
+# --- Review store ---
+
+def _prompt_version() -> str:
+    return content_hash([SYSTEM_PROMPT, PROMPT_PATH.read_text(encoding="utf-8")])
+
+
+def _proposal_hashes(proposals: List[Proposal]) -> Dict[str, str]:
+    """Version of the proposal inputs the review prompt reads (stored text hash, summary)."""
+    text_hashes = text_store.text_hashes([p.id for p in proposals])
+    return {p.id: content_hash([text_hashes[p.id], p.summary or ""]) for p in proposals}
+
+
+def _load_fresh_reviews(hashes: Dict[str, str], requirements_hash: str, prompt_version: str) -> Dict[str, dict]:
+    """Stored reviews that are still valid (failures only until their retry time), keyed by proposal id."""
+    if not hashes:
+        return {}
+    retry_before = datetime.utcnow() - timedelta(seconds=REVIEW_RETRY_SECONDS)
+    with get_session() as session:
+        stmt = select(ProposalReviewModel).where(ProposalReviewModel.proposal_id.in_(list(hashes)))
+        return {
+            r.proposal_id: r.result
+            for r in session.exec(stmt).all()
+            if r.proposal_hash == hashes[r.proposal_id]
+            and r.requirements_hash == requirements_hash
+            and r.prompt_version == prompt_version
+            and (r.result or r.created_at > retry_before)
+        }
+
+
+def _save_review(p: Proposal, proposal_hash: str, requirements_hash: str, prompt_version: str, result: dict) -> None:
+    with write_session() as session:
+        session.merge(ProposalReviewModel(
+            proposal_id=p.id,
+            proposal_hash=proposal_hash,
+            requirements_hash=requirements_hash,
+            prompt_version=prompt_version,
+            result=result,
+        ))
+        session.commit()
+
+
+def _get_reviews(rfp: Optional[Rfp], proposals: List[Proposal]) -> Dict[str, dict]:
+    """
+    AI reviews for `proposals`, served from the store.
+
+    Only missing or stale entries are evaluated, in parallel. A failed
+    evaluation yields an empty review, stored so that it is retried only
+    after REVIEW_RETRY_SECONDS.
+    """
+    rfp_context = rfp_digest.get_digest(rfp) if rfp else "No RFP details available."
+    requirements_hash = rfp_digest.digest_version(rfp) if rfp else ""
+    prompt_version = _prompt_version()
+    hashes = _proposal_hashes(proposals)
+    reviews = _load_fresh_reviews(hashes, requirements_hash, prompt_version)
+    stale = [p for p in proposals if p.id not in reviews]
+    if not stale:
+        return reviews
+
+    def evaluate(p: Proposal) -> dict:
+        try:
+            text = proposal_service.get_extracted_text(p.id) or ""
+            ai = _evaluate_with_ai(rfp_context, text, p.summary)
+        except Exception as e:
+            print(f"⚠ Review failed for proposal {p.id[:8]}, retrying in {REVIEW_RETRY_SECONDS}s: {e}")
+            ai = {}
+        # Parallel evaluations hand their writes to the single writer thread
+        db_writer.run(_save_review, p, hashes[p.id], requirements_hash, prompt_version, ai)
+        return ai
 
+    print(f"→ Evaluating {len(stale)} stale review(s)")
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_REVIEWS, len(stale))) as pool:
+        for p, ai in zip(stale, pool.map(evaluate, stale)):
+            reviews[p.id] = ai
+    return reviews
+
+
+def warm_review(proposal_id: str) -> None:
+    """Evaluate and store a proposal's review ahead of the first read (run after upload)."""
+    proposal = proposal_service.get_proposal(proposal_id)
+    if not proposal:
+        return
+    _get_reviews(rfp_service.get_rfp(proposal.rfp_id), [proposal])
+
+
+def _as_text(value) -> Optional[str]:
+    """Comparison rows show text; extraction stores some fields as bullet lists."""
+    if isinstance(value, list):
+        return "\n".join(str(v) for v in value) or None
+    return value
 
 
 def build_comparison(rfp_id: str) -> Comparison:
     rfp = rfp_service.get_rfp(rfp_id)
-    requirements = rfp.requirements if rfp else []
     proposals = proposal_service.list_proposals(rfp_id=rfp_id)
-    prices = [p.price for p in proposals if p.price is not None]
-    median_price = mean(prices) if prices else None
+
+    reviews = _get_reviews(rfp, proposals)
 
     rows = []
     for p in proposals:
-        # 1. Run AI Evaluation
-        try:
-            ai = _evaluate_with_ai(requirements, p.extracted_text or "", p.summary)
-        except Exception as e:
-            print(f"DEBUG: Review Error for proposal {p.id}: {e}")
-            ai = {}
-
-        # 2. Extract Fields
-        coverage = ai.get("coverage_pct")
-        risk = ai.get("risk")
+        ai = reviews.get(p.id) or {}
         price = ai.get("price") if ai.get("price") is not None else p.price
-        overall_score = ai.get("overall_score")
-        
-        # New text fields
-        updates = {
-            "experience": ai.get("experience") or p.experience,
-            "methodology": ai.get("methodology") or p.methodology,
-            "warranties": ai.get("warranties") or p.warranties,
-            "timeline_details": ai.get("timeline_details") or p.timeline_details,
-            "summary": ai.get("summary") or p.summary
-        }
-        
-        # 3. Save to DB (Cache/Persist)
-        # We only update if we got new values from AI, otherwise keep existing
-        has_updates = any(
-            ai.get(k) and ai.get(k) != getattr(p, k) 
-            for k in ["experience", "methodology", "warranties", "timeline_details", "summary"]
-        )
-        
-        if has_updates:
-            proposal_service.update_proposal_details(p.id, updates)
-            # Update local object for the view
-            for k, v in updates.items():
-                setattr(p, k, v)
 
         rows.append(
             ComparisonRow(
                 proposal_id=p.id,
                 contractor=p.contractor,
                 price=price,
-                coverage=coverage,
-                risk=risk,
-                overall_score=overall_score,
-                experience=p.experience,
-                methodology=p.methodology,
-                warranties=p.warranties,
-                timeline_details=p.timeline_details,
+                coverage=ai.get("coverage_pct"),
+                risk=ai.get("risk"),
+                overall_score=ai.get("overall_score"),
+                experience=_as_text(ai.get("experience") or p.experience),
+                methodology=_as_text(ai.get("methodology") or p.methodology),
+                warranties=_as_text(ai.get("warranties") or p.warranties),
+                timeline_details=_as_text(ai.get("timeline_details") or p.timeline_details),
             )
         )
     return Comparison(rfp_id=rfp_id, rows=rows)
@@ -94,12 +166,7 @@ def get_review_summary(proposal_id: str) -> Optional[dict]:
     if not proposal:
         return None
     rfp = rfp_service.get_rfp(proposal.rfp_id)
-    requirements = rfp.requirements if rfp else []
-    try:
-        ai = _evaluate_with_ai(requirements, proposal.extracted_text or "", proposal.summary)
-    except Exception as e:
-        print(f"DEBUG: Single Review Error: {e}")
-        ai = {}
+    ai = _get_reviews(rfp, [proposal]).get(proposal_id) or {}
 
     result = ReviewResult(
         proposal_id=proposal_id,
@@ -116,4 +183,3 @@ def get_review_summary(proposal_id: str) -> Optional[dict]:
     )
 
     return result.model_dump()
-
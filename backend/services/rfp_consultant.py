@@ -1,4 +1,7 @@
 import json
+import re
+from typing import Iterator
+
 from backend.schemas.chat import RFPState
 # from backend.src.utils.llm_client import complete_json
 
@@ -65,7 +68,118 @@ class RFPConsultantResponse(BaseModel):
     updated_state: RFPStateOutput = Field(description="The updated RFP state object")
     generate_proposal_form: Optional[bool] = Field(default=None, description="Whether to generate a proposal form")
 
-def consult_on_rfp(message: str, current_state: RFPState, history: list[dict]) -> dict:
+def _history_text(history: list[dict], summary: str = "") -> str:
+    """Conversation history for the prompt, led by the session summary if any."""
+    # Turns come from the client ({role: 'ai', text}) or a server session ({role: 'assistant', content})
+    history_text = f"Summary of earlier conversation: {summary}\n" if summary else ""
+    for msg in history[-20:]:
+        role = "AI" if msg.get("role") in ("ai", "assistant") else "User"
+        text = msg.get("text") or msg.get("content", "")
+        history_text += f"{role}: {text}\n"
+    return history_text
+
+
+def _prompt() -> ChatPromptTemplate:
+    # Use LangChain variable substitution for current_state_json instead of string replacement
+    # This prevents the JSON braces in state_json from confusing the PromptTemplate
+    return ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("user", """Conversation History:
+{history_text}
+
+User's Latest Message:
+{message}""")
+    ])
+
+
+def _fallback_result(current_state: RFPState, reply: str = "") -> dict:
+    return {
+        "reply": reply or "I'm having trouble processing that specific request. Please try again later.",
+        "updated_state": current_state.model_dump(),
+        "generate_proposal_form": None
+    }
+
+
+def _partial_json_string(buffer: str, key: str) -> Optional[str]:
+    """
+    Decoded value of string field `key` in a possibly incomplete JSON
+    object, as far as it has been received (None until it starts).
+    """
+    match = re.search(r'"%s"\s*:\s*"' % re.escape(key), buffer)
+    if not match:
+        return None
+    start = match.end()
+    escaped = False
+    for i in range(start, len(buffer)):
+        if escaped:
+            escaped = False
+        elif buffer[i] == "\\":
+            escaped = True
+        elif buffer[i] == '"':
+            return json.loads(buffer[start - 1:i + 1])
+    # Unterminated: drop a trailing partial escape (at most "\uXXX") and decode the rest
+    raw = buffer[start:]
+    for cut in range(6):
+        try:
+            return json.loads('"' + raw[:len(raw) - cut] + '"')
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _parse_response(content: str, current_state: RFPState, reply: str) -> dict:
+    """Validate the full streamed JSON; keep the streamed reply if it does not parse."""
+    start, end = content.find("{"), content.rfind("}")
+    try:
+        data = json.loads(content[start:end + 1] if start != -1 and end > start else content)
+        return RFPConsultantResponse.model_validate(data).model_dump()
+    except Exception as e:
+        print(f"⚠ Consultant stream did not return valid JSON: {e}")
+        return _fallback_result(current_state, reply)
+
+
+def stream_consult_on_rfp(
+    message: str, current_state: RFPState, history: list[dict], summary: str = ""
+) -> Iterator[tuple[str, dict]]:
+    """
+    Streaming variant of consult_on_rfp().
+
+    The model streams its JSON answer; the `reply` field is decoded from the
+    partial JSON as it arrives and yielded as ("token", {"text": delta})
+    events, followed by one ("result", {reply, updated_state,
+    generate_proposal_form}) event once the object is complete.
+    """
+    # JSON mode instead of structured output, so the raw text can be streamed
+    llm = get_chat_llm(temperature=0.7).bind(response_format={"type": "json_object"})
+    chain = _prompt() | llm
+
+    content, sent = "", ""
+    try:
+        for chunk in chain.stream({
+            "current_state_json": current_state.model_dump_json(),
+            "history_text": _history_text(history, summary),
+            "message": message
+        }):
+            content += chunk.content or ""
+            reply = _partial_json_string(content, "reply")
+            if reply and reply.startswith(sent) and len(reply) > len(sent):
+                yield "token", {"text": reply[len(sent):]}
+                sent = reply
+    except Exception as e:
+        print(f"AI Error: {e}")
+        result = _fallback_result(current_state, sent)
+        if not sent:
+            yield "token", {"text": result["reply"]}
+        yield "result", result
+        return
+
+    result = _parse_response(content, current_state, sent)
+    if result["reply"].startswith(sent) and len(result["reply"]) > len(sent):
+        yield "token", {"text": result["reply"][len(sent):]}
+    yield "result", result
+
+
+def consult_on_rfp(message: str, current_state: RFPState, history: list[dict], summary: str = "") -> dict:
     """
     Sends message + state to LLM, returns {reply: str, updated_state: dict, generate_proposal_form: bool|null}
     """
@@ -83,33 +197,16 @@ def consult_on_rfp(message: str, current_state: RFPState, history: list[dict]) -
         state_json = current_state.model_dump_json()
         
         # Construct conversation history string
-        history_text = ""
-        for msg in history[-20:]:
-            role = "AI" if msg.get("role") == "ai" else "User"
-            text = msg.get("text", "")
-            history_text += f"{role}: {text}\n"
-
         # Initialize LLM with default settings (GPT-4o)
         llm = get_chat_llm(temperature=0.7)
         # Use OpenAI native structured output (requires explicit Pydantic models, no generic dict)
         structured_llm = llm.with_structured_output(RFPConsultantResponse)
-        
-        # Use LangChain variable substitution for current_state_json instead of string replacement
-        # This prevents the JSON braces in state_json from confusing the PromptTemplate
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", SYSTEM_PROMPT),
-            ("user", """Conversation History:
-{history_text}
 
-User's Latest Message:
-{message}""")
-        ])
-        
-        chain = prompt | structured_llm
-        
+        chain = _prompt() | structured_llm
+
         response = chain.invoke({
             "current_state_json": state_json,
-            "history_text": history_text,
+            "history_text": _history_text(history, summary),
             "message": message
         })
         
@@ -127,11 +224,7 @@ User's Latest Message:
             
         print(f"AI Error: {e}")
         # Fallback if AI fails
-        return {
-            "reply": "I'm having trouble processing that specific request. Please try again later.",
-            "updated_state": current_state.model_dump(),
-            "generate_proposal_form": None
-        }
+        return _fallback_result(current_state)
 
 
 def generate_proposal_form_for_rfp(rfp_title: str, rfp_scope: str, requirements: list[str]) -> dict:
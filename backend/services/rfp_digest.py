@@ -0,0 +1,94 @@
+"""
+RFP Digest
+
+A compact, token-bounded summary of an RFP (title, budget, deadline, scope,
+requirements) built deterministically once per RFP version and stored on
+the RFP row. Every AI prompt about an RFP starts with this same digest, so
+prompts stay short and share a stable prefix that provider-side prompt
+caching can reuse.
+"""
+
+from backend.models.db import get_async_session, get_session, write_session
+from backend.models.entities import RfpModel
+from backend.schemas.rfp import Rfp
+from backend.services import rfp_service
+from backend.src.utils.hashing import content_hash
+from backend.src.utils.tokens import count_tokens, truncate_to_tokens
+from backend.workers import db_writer
+
+# Bump when the digest layout changes so stored digests are rebuilt
+DIGEST_FORMAT = 1
+
+DIGEST_MAX_TOKENS = 1200
+SCOPE_MAX_TOKENS = 400
+REQUIREMENT_MAX_TOKENS = 60
+
+
+def digest_version(rfp: Rfp) -> str:
+    """Version of the digest for the current RFP content."""
+    return content_hash([DIGEST_FORMAT, rfp_service.rfp_content_hash(rfp)])
+
+
+def build_digest(rfp: Rfp) -> str:
+    """Render the digest; same RFP content always yields the same text."""
+    budget = f"{rfp.budget:,.0f} {rfp.currency}" if rfp.budget is not None else "TBD"
+    header = "\n".join([
+        f"## RFP: {rfp.title}",
+        f"- Budget: {budget}",
+        f"- Deadline: {rfp.deadline or 'TBD'}",
+    ])
+    scope = truncate_to_tokens((rfp.description or "Not specified").strip(), SCOPE_MAX_TOKENS)
+    digest = f"{header}\n\n### Scope:\n{scope}\n\n### Requirements:\n"
+
+    if not rfp.requirements:
+        return digest + "No requirements specified"
+
+    budget_left = DIGEST_MAX_TOKENS - count_tokens(digest)
+    lines = []
+    for i, req in enumerate(rfp.requirements):
+        line = f"{i + 1}. {truncate_to_tokens(req.text.strip(), REQUIREMENT_MAX_TOKENS)}"
+        cost = count_tokens(line) + 1
+        if cost > budget_left:
+            lines.append(f"... and {len(rfp.requirements) - i} more requirements")
+            break
+        lines.append(line)
+        budget_left -= cost
+    return digest + "\n".join(lines)
+
+
+def _save_digest(rfp_id: str, digest: str, version: str) -> None:
+    """Store a rebuilt digest on the RFP row (runs on the db_writer thread)."""
+    with write_session() as session:
+        db_rfp = session.get(RfpModel, rfp_id)
+        if db_rfp:
+            db_rfp.digest = digest
+            db_rfp.digest_version = version
+            session.add(db_rfp)
+            session.commit()
+            print(f"✓ Built RFP digest for {rfp_id[:8]} ({count_tokens(digest)} tokens)")
+
+
+def get_digest(rfp: Rfp) -> str:
+    """The stored digest for `rfp`, rebuilt and saved if the RFP has changed."""
+    version = digest_version(rfp)
+    with get_session() as session:
+        db_rfp = session.get(RfpModel, rfp.id)
+        if db_rfp and db_rfp.digest and db_rfp.digest_version == version:
+            return db_rfp.digest
+
+    digest = build_digest(rfp)
+    db_writer.run(_save_digest, rfp.id, digest, version)
+    return digest
+
+
+async def get_digest_async(rfp: Rfp) -> str:
+    """get_digest for async callers: reads and saves without blocking the event loop."""
+    version = digest_version(rfp)
+    async with get_async_session() as session:
+        db_rfp = await session.get(RfpModel, rfp.id)
+        if db_rfp and db_rfp.digest and db_rfp.digest_version == version:
+            return db_rfp.digest
+
+    digest = build_digest(rfp)
+    await db_writer.run_async(_save_digest, rfp.id, digest, version)
+    return digest
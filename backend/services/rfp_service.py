@@ -1,10 +1,22 @@
 from typing import List, Optional
 
-from sqlmodel import select
+from sqlmodel import delete, or_, select
 
-from backend.models.db import get_session
-from backend.models.entities import RfpModel
-from backend.schemas.rfp import Rfp, RfpCreate
+from backend.models.db import get_async_session, get_session, write_session
+from backend.models.entities import (
+    AnswerCacheModel,
+    ChatSessionModel,
+    ProposalModel,
+    ProposalReviewModel,
+    ProposalTextModel,
+    RfpModel,
+    SavedComparisonModel,
+    ScoreCacheModel,
+)
+from backend.schemas.rfp import Rfp, RfpCreate, RfpPage, RfpSummary
+from backend.services import entity_cache
+from backend.src.utils.hashing import content_hash
+from backend.src.utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_after
 
 
 def list_rfps() -> List[Rfp]:
@@ -13,6 +25,34 @@ def list_rfps() -> List[Rfp]:
         return [Rfp.model_validate(r) for r in rfps]
 
 
+def list_rfp_summaries(
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> RfpPage:
+    """One page of RFP listings (listing columns only), newest first; keyset on (created_at, id)."""
+    stmt = select(
+        RfpModel.id,
+        RfpModel.title,
+        RfpModel.budget,
+        RfpModel.currency,
+        RfpModel.deadline,
+        RfpModel.status,
+        RfpModel.created_at,
+    )
+    if status:
+        stmt = stmt.where(RfpModel.status == status)
+    if cursor:
+        stmt = stmt.where(keyset_after(RfpModel, cursor))
+    stmt = stmt.order_by(RfpModel.created_at.desc(), RfpModel.id.desc()).limit(limit + 1)
+
+    with get_session() as session:
+        rows = session.exec(stmt).all()
+    items = [RfpSummary.model_validate(dict(row._mapping)) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return RfpPage(items=items, next_cursor=next_cursor)
+
+
 def create_rfp(payload: RfpCreate) -> Rfp:
     data = payload.model_dump()
     rfp = RfpModel(**data)
@@ -23,8 +63,71 @@ def create_rfp(payload: RfpCreate) -> Rfp:
         return Rfp.model_validate(rfp)
 
 
-def get_rfp(rfp_id: str) -> Optional[Rfp]:
+def _load_rfp(rfp_id: str) -> Optional[Rfp]:
     with get_session() as session:
         rfp = session.get(RfpModel, rfp_id)
         return Rfp.model_validate(rfp) if rfp else None
 
+
+async def _load_rfp_async(rfp_id: str) -> Optional[Rfp]:
+    async with get_async_session() as session:
+        rfp = await session.get(RfpModel, rfp_id)
+        return Rfp.model_validate(rfp) if rfp else None
+
+
+def get_rfp(rfp_id: str) -> Optional[Rfp]:
+    """An RFP, served from the entity cache (dropped whenever the row is written)."""
+    return entity_cache.rfps.get(rfp_id, _load_rfp)
+
+
+async def get_rfp_async(rfp_id: str) -> Optional[Rfp]:
+    """get_rfp for async routes: a cache miss does not block the event loop."""
+    return await entity_cache.rfps.get_async(rfp_id, _load_rfp_async)
+
+
+def rfp_content_hash(rfp: Rfp) -> str:
+    """Version of the RFP content that AI outputs (scores, dimensions) depend on."""
+    return content_hash({
+        "title": rfp.title,
+        "description": rfp.description,
+        "requirements": [req.model_dump() for req in rfp.requirements],
+        "budget": rfp.budget,
+        "currency": rfp.currency,
+        "deadline": rfp.deadline,
+    })
+
+
+def delete_rfp(rfp_id: str) -> Optional[List[str]]:
+    """
+    Delete an RFP and everything stored for it in one transaction: its
+    proposals with their texts, reviews, scores and cached answers, chat
+    sessions, the saved comparison and search index entries.
+
+    Returns the ids of the deleted proposals (their vector collections and
+    PDFs are removed separately, see cleanup_service.remove_rfp_artifacts),
+    or None if the RFP does not exist.
+    """
+    from backend.services import search_service, stats_service
+
+    with write_session() as session:
+        rfp = session.get(RfpModel, rfp_id)
+        if not rfp:
+            return None
+        proposal_ids = list(session.exec(select(ProposalModel.id).where(ProposalModel.rfp_id == rfp_id)).all())
+
+        for model in (ScoreCacheModel, ProposalReviewModel, AnswerCacheModel, ProposalTextModel):
+            session.exec(delete(model).where(model.proposal_id.in_(proposal_ids)))
+        session.exec(delete(ChatSessionModel).where(or_(
+            ChatSessionModel.subject_id == rfp_id, ChatSessionModel.subject_id.in_(proposal_ids)
+        )))
+        session.exec(delete(SavedComparisonModel).where(SavedComparisonModel.rfp_id == rfp_id))
+        search_service.remove_rfp_documents(session, rfp_id)
+        session.exec(delete(ProposalModel).where(ProposalModel.rfp_id == rfp_id))
+        session.delete(rfp)
+        session.commit()
+
+    # Bulk deletes bypass the ORM commit hooks
+    entity_cache.proposals.invalidate(proposal_ids)
+    stats_service.invalidate()
+    print(f"✓ Deleted RFP {rfp_id[:8]} with {len(proposal_ids)} proposal(s)")
+    return proposal_ids
@@ -0,0 +1,327 @@
+"""
+Proposal Scoring Service
+
+Scores proposals on comparison dimensions with one AI call per proposal
+(map), run in parallel against the shared RFP digest, then normalizes the
+results deterministically (reduce): overall score is the mean of the
+dimension scores and labels come from fixed thresholds.
+
+Each prompt carries only the proposal snippets retrieved for the requested
+dimensions (evidence_service), falling back to the extracted fields when
+the proposal PDF is not indexed.
+
+Every (proposal, dimension) score is cached in the score_cache table under
+a hash of the proposal content and its indexed chunks, the RFP version and
+the prompt version, so re-comparing with an extra vendor only scores that
+vendor, and re-ingesting a proposal PDF re-scores it.
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlmodel import select
+
+from backend.models.db import get_async_session, write_session
+from backend.models.entities import ScoreCacheModel
+from backend.schemas.analysis import Dimension, GENERAL_DIMENSIONS
+from backend.schemas.proposal import Proposal
+from backend.schemas.rfp import Rfp
+from backend.services import evidence_service, rfp_digest
+from backend.workers import db_writer
+from backend.src.utils.hashing import content_hash
+from backend.src.utils.llm_client import complete_json
+
+# Proposals scored concurrently (each is one blocking LLM call in a thread)
+MAX_PARALLEL_SCORING = 8
+
+SCORE_SYSTEM_PROMPT = """You are a STRICT and CRITICAL RFP Proposal Evaluator.
+
+Your task: Score ONE vendor proposal against the RFP requirements on the specified dimensions.
+
+CRITICAL SCORING GUIDELINES (Be strict - this is a formal evaluation):
+- 85-100: Exceptional - Extensively documented with specific details, exceeds requirements
+- 70-84: Strong - Clearly meets requirements with good supporting evidence
+- 55-69: Adequate - Meets basic requirements but lacks depth or specifics
+- 40-54: Marginal - Some evidence but significant gaps or vague claims
+- 20-39: Weak - Minimal evidence, mostly generic statements
+- 1-19: Very Poor - Almost no relevant information
+- 0: NOT MENTIONED - If field explicitly says "Not mentioned in proposal" or has no relevant data, score MUST be 0
+
+STRICT EVALUATION RULES:
+1. If a dimension has "Not mentioned in proposal" → Score = 0 (zero)
+2. Generic marketing claims without specifics → Score max 40
+3. Vague statements like "years of experience" without numbers → Score max 50
+4. Only award 70+ if there are SPECIFIC, VERIFIABLE details
+5. Be SKEPTICAL - require proof, not just claims
+6. Compare against RFP requirements strictly
+
+DIMENSION EVALUATION:
+- experience: Require specific years, project names/types, certifications with dates
+- cost: Compare to RFP budget - over budget = lower score
+- materials_warranty: Require specific brand names, warranty terms in years/coverage
+- schedule: Require specific dates, milestones, duration
+- safety: Require certifications (OSHA number), incident rates, specific protocols
+- responsiveness: Require specific response times, contact methods, availability hours
+
+Return JSON:
+{
+  "scores": {
+    "dimension_id": { "score": 65, "reasoning": "Specific reason based on evidence (cite pages when given)" }
+  }
+}
+"""
+
+PROMPT_VERSION = content_hash(SCORE_SYSTEM_PROMPT)
+
+
+def score_label(score: int) -> str:
+    """Deterministic label for a 0-100 score."""
+    return "Strong" if score >= 80 else ("Adequate" if score >= 50 else "Weak")
+
+
+def _format_list(items: List[str] | None) -> str:
+    """Format a list of items as bullet points."""
+    if not items:
+        return "- Not mentioned in proposal"
+    return "\n".join([f"- {item}" for item in items])
+
+
+def resolve_dimensions(dimension_ids: List[str], specs: Optional[List[Dimension]] = None) -> List[Dimension]:
+    """
+    Dimension definitions for the requested ids: explicit specs first, then
+    the general dimensions, else a bare definition keyed on the id.
+    """
+    known = {d.id: d for d in GENERAL_DIMENSIONS}
+    known.update({d.id: d for d in specs or []})
+    return [
+        known.get(dim_id) or Dimension(id=dim_id, name=dim_id.replace("_", " ").title(), description="", keywords=[dim_id])
+        for dim_id in dimension_ids
+    ]
+
+
+def _proposal_header(p: Proposal) -> str:
+    return f"""
+## Proposal: {p.contractor}
+- Price: {p.price or 'Not specified'} {p.currency}
+- Start Date: {p.start_date or 'Not specified'}
+"""
+
+
+def _proposal_context(p: Proposal) -> str:
+    """Every extracted field; used when the proposal PDF has no indexed chunks."""
+    return _proposal_header(p) + f"""
+### Experience:
+{_format_list(p.experience)}
+
+### Scope Understanding:
+{_format_list(p.scope_understanding)}
+
+### Materials:
+{_format_list(p.materials)}
+
+### Timeline:
+{_format_list(p.timeline)}
+
+### Warranty:
+{_format_list(p.warranty)}
+
+### Safety:
+{_format_list(p.safety)}
+
+### Cost Breakdown:
+{_format_list(p.cost_breakdown)}
+
+### References:
+{_format_list(p.references)}
+
+### Summary:
+{p.summary or 'No summary'}
+"""
+
+
+def _evidence_context(p: Proposal, dimensions: List[Dimension], evidence: Dict[str, List[dict]]) -> str:
+    """Header plus the retrieved proposal snippets for each dimension, with page numbers."""
+    parts = [_proposal_header(p)]
+    for dim in dimensions:
+        parts.append(f"### Evidence for {dim.id} ({dim.name}):")
+        snippets = evidence.get(dim.id) or []
+        if not snippets:
+            parts.append("- Not mentioned in proposal")
+        for snippet in snippets:
+            page = f"[p. {snippet['page']}] " if snippet.get("page") else ""
+            parts.append(f"- {page}{snippet['text']}")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def _dimension_hash(p: Proposal, dim: Dimension, evidence_version: Optional[str]) -> str:
+    """Version of the inputs behind one (proposal, dimension) score, including the retrievable evidence."""
+    return content_hash([_proposal_context(p), dim.model_dump(), evidence_version])
+
+
+def _evidence_versions(proposals: List[Proposal]) -> Dict[str, Optional[str]]:
+    versions = {}
+    for p in proposals:
+        try:
+            versions[p.id] = evidence_service.evidence_version(p.id)
+        except Exception as e:
+            print(f"⚠ Could not read the vector index for proposal {p.id[:8]}: {e}")
+            versions[p.id] = None
+    return versions
+
+
+def _clamp_score(value) -> int:
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return 50
+
+
+def _score_one(rfp_context: str, proposal_context: str, dimensions: List[Dimension]) -> Dict[str, dict]:
+    """One AI call scoring a single proposal on the given dimensions."""
+    dimensions_text = "\n".join(f"- {d.id}: {d.name}. {d.description}".rstrip() for d in dimensions)
+    prompt = f"""
+{rfp_context}
+
+# PROPOSAL TO EVALUATE:
+{proposal_context}
+
+# DIMENSIONS TO SCORE:
+{dimensions_text}
+
+Evaluate the proposal on each dimension. Return JSON with percentage scores (0-100).
+"""
+    response = complete_json(SCORE_SYSTEM_PROMPT, prompt, temperature=0.2)
+    raw_scores = response.get("scores", {}) if isinstance(response, dict) else {}
+
+    scores = {}
+    for dim in dimensions:
+        data = raw_scores.get(dim.id)
+        if isinstance(data, dict):
+            scores[dim.id] = {"score": _clamp_score(data.get("score", 50)), "reasoning": data.get("reasoning")}
+        elif isinstance(data, (int, float)):
+            scores[dim.id] = {"score": _clamp_score(data), "reasoning": None}
+    return scores
+
+
+async def _load_cached(proposals: List[Proposal], hashes: Dict[str, Dict[str, str]], rfp_version: str) -> Dict[str, Dict[str, dict]]:
+    """Cached scores per proposal for the current proposal/dimension/RFP/prompt versions."""
+    cached: Dict[str, Dict[str, dict]] = {p.id: {} for p in proposals}
+    async with get_async_session() as session:
+        stmt = select(ScoreCacheModel).where(
+            ScoreCacheModel.proposal_id.in_([p.id for p in proposals]),
+            ScoreCacheModel.rfp_version == rfp_version,
+            ScoreCacheModel.prompt_version == PROMPT_VERSION,
+        )
+        for row in (await session.exec(stmt)).all():
+            if row.proposal_hash == hashes[row.proposal_id].get(row.dimension):
+                cached[row.proposal_id][row.dimension] = {"score": row.score, "reasoning": row.reasoning}
+    return cached
+
+
+def _store_scores(proposal_id: str, hashes: Dict[str, str], rfp_version: str, scores: Dict[str, dict]) -> None:
+    """Save fresh scores (runs on the db_writer thread)."""
+    with write_session() as session:
+        for dim, data in scores.items():
+            session.merge(ScoreCacheModel(
+                proposal_id=proposal_id,
+                dimension=dim,
+                proposal_hash=hashes[dim],
+                rfp_version=rfp_version,
+                prompt_version=PROMPT_VERSION,
+                score=data["score"],
+                label=score_label(data["score"]),
+                reasoning=data.get("reasoning"),
+            ))
+        session.commit()
+
+
+def _embed_dimensions_safe(dimensions: List[Dimension]):
+    try:
+        return evidence_service.embed_dimensions(dimensions)
+    except Exception as e:
+        print(f"⚠ Dimension embedding failed, scoring from extracted fields: {e}")
+        return None
+
+
+def _build_context(p: Proposal, dimensions: List[Dimension], dimension_vectors) -> str:
+    """Evidence snippets when the proposal is indexed, else the extracted fields."""
+    if dimension_vectors is not None:
+        try:
+            evidence = evidence_service.retrieve_evidence(p.id, dimensions, dimension_vectors)
+            if evidence:
+                return _evidence_context(p, dimensions, evidence)
+        except Exception as e:
+            print(f"⚠ Evidence retrieval failed for proposal {p.id[:8]}: {e}")
+    return _proposal_context(p)
+
+
+def _proposal_result(p: Proposal, dimensions: List[Dimension], scores: Dict[str, dict]) -> dict:
+    """Normalization pass for one proposal: labels and the overall mean."""
+    dim_scores = {
+        dim.id: {**scores[dim.id], "label": score_label(scores[dim.id]["score"])}
+        for dim in dimensions
+    }
+    overall = round(sum(d["score"] for d in dim_scores.values()) / len(dim_scores)) if dim_scores else 0
+    return {
+        "id": p.id,
+        "vendor": p.contractor,
+        "scores": dim_scores,
+        "overall_score": int(overall),
+    }
+
+
+async def iter_scores(rfp: Rfp, proposals: List[Proposal], dimensions: List[Dimension]) -> AsyncIterator[dict]:
+    """
+    Score each proposal on each dimension, reusing cached scores, yielding
+    each proposal's result as soon as it is ready (fully cached proposals
+    first, then in order of completion).
+
+    Uncached (proposal, dimension) pairs are scored from the top-k proposal
+    snippets retrieved for each dimension. A proposal whose AI call fails
+    gets neutral uncached scores so the comparison still renders.
+    """
+    rfp_version = rfp_digest.digest_version(rfp)
+    rfp_context = await rfp_digest.get_digest_async(rfp)
+    evidence_versions = await asyncio.to_thread(_evidence_versions, proposals)
+    hashes = {p.id: {d.id: _dimension_hash(p, d, evidence_versions[p.id]) for d in dimensions} for p in proposals}
+    scores = await _load_cached(proposals, hashes, rfp_version)
+
+    # Embed the dimensions once, only if something needs scoring
+    dimension_vectors = None
+    if any(d.id not in scores[p.id] for p in proposals for d in dimensions):
+        dimension_vectors = await asyncio.to_thread(_embed_dimensions_safe, dimensions)
+
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_SCORING)
+
+    async def fill_missing(p: Proposal) -> Proposal:
+        missing = [d for d in dimensions if d.id not in scores[p.id]]
+        if not missing:
+            return p
+        async with semaphore:
+            try:
+                context = await asyncio.to_thread(_build_context, p, missing, dimension_vectors)
+                fresh = await asyncio.to_thread(_score_one, rfp_context, context, missing)
+            except Exception as e:
+                print(f"⚠ Scoring failed for proposal {p.id[:8]}: {e}")
+                fresh = {}
+        if fresh:
+            await db_writer.run_async(_store_scores, p.id, hashes[p.id], rfp_version, fresh)
+        scores[p.id].update(fresh)
+        for dim in missing:
+            scores[p.id].setdefault(dim.id, {"score": 50, "reasoning": "AI analysis unavailable"})
+        return p
+
+    for finished in asyncio.as_completed([fill_missing(p) for p in proposals]):
+        p = await finished
+        yield _proposal_result(p, dimensions, scores[p.id])
+    print(f"✓ Scored {len(proposals)} proposals on {len(dimensions)} dimensions")
+
+
+async def score_proposals(rfp: Rfp, proposals: List[Proposal], dimensions: List[Dimension]) -> List[dict]:
+    """
+    All scores at once: [{id, vendor, scores: {dim: {score, label, reasoning}},
+    overall_score}] in the order of `proposals` (see iter_scores).
+    """
+    results = {r["id"]: r async for r in iter_scores(rfp, proposals, dimensions)}
+    return [results[p.id] for p in proposals]
@@ -0,0 +1,276 @@
+"""
+Full-Text Search
+
+An SQLite FTS5 index (search_index) over RFPs (title, description,
+requirements, line items) and proposals (vendor, summary, bullet fields,
+line-item descriptions, extracted PDF text). search_docs maps each FTS
+rowid to its document.
+
+The index is maintained incrementally: ORM insert/update/delete events on
+RFPs, proposals and proposal texts record the affected documents on the
+session, and they are re-indexed just before the transaction commits, in
+that same transaction (under a savepoint, so an indexing error never
+loses the write). Updates that do not touch indexed fields (e.g. a status
+change) are ignored. jobs/reindex_search.py rebuilds everything.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session, object_session
+from sqlmodel import delete, select
+
+from backend.models.db import engine, write_session
+from backend.models.entities import ProposalModel, ProposalTextModel, RfpModel, SearchDocModel
+
+FTS_TABLE = "search_index"
+# bm25 column weights: title matches rank above body matches
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+DEFAULT_LIMIT = 20
+
+PROPOSAL_LIST_FIELDS = (
+    "experience", "scope_understanding", "materials", "timeline", "warranty",
+    "safety", "cost_breakdown", "termination_term", "references",
+)
+PROPOSAL_TEXT_FIELDS = ("contractor", "contractor_email", "summary", "methodology", "warranties", "timeline_details")
+_INDEXED_FIELDS = {
+    RfpModel: {"title", "description", "requirements", "proposal_form_rows"},
+    ProposalModel: {"rfp_id", "proposal_form_data", *PROPOSAL_LIST_FIELDS, *PROPOSAL_TEXT_FIELDS},
+}
+
+_PENDING_KEY = "search_pending"
+
+
+def is_available() -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index() -> None:
+    """Create the FTS5 table (search_docs is created with the other tables)."""
+    if not is_available():
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(title, body, tokenize='porter unicode61')"
+        ))
+
+
+# --- Document text ---
+
+def _lines(values) -> List[str]:
+    return [str(v) for v in values or [] if v]
+
+
+def _line_item_descriptions(rows) -> List[str]:
+    return [str(row["description"]) for row in rows or [] if isinstance(row, dict) and row.get("description")]
+
+
+def _rfp_document(rfp: RfpModel) -> Tuple[str, str]:
+    requirements = [r.get("text", "") if isinstance(r, dict) else str(r) for r in rfp.requirements or []]
+    body = "\n".join([rfp.description or "", *requirements, *_line_item_descriptions(rfp.proposal_form_rows)])
+    return rfp.title or "", body
+
+
+def _proposal_document(proposal: ProposalModel, extracted: Optional[str]) -> Tuple[str, str]:
+    parts = [getattr(proposal, f) or "" for f in PROPOSAL_TEXT_FIELDS[1:]]
+    for field in PROPOSAL_LIST_FIELDS:
+        parts.extend(_lines(getattr(proposal, field)))
+    parts.extend(_line_item_descriptions(proposal.proposal_form_data))
+    parts.append(extracted or "")
+    return proposal.contractor or "", "\n".join(p for p in parts if p)
+
+
+# --- Index maintenance ---
+
+def _find(session, doc_type: str, doc_id: str) -> Optional[SearchDocModel]:
+    return session.exec(
+        select(SearchDocModel).where(SearchDocModel.doc_type == doc_type, SearchDocModel.doc_id == doc_id)
+    ).first()
+
+
+def _remove(session, doc_type: str, doc_id: str) -> None:
+    doc = _find(session, doc_type, doc_id)
+    if doc:
+        session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": doc.id})
+        session.delete(doc)
+
+
+def _write(session, doc_type: str, doc_id: str, rfp_id: Optional[str], title: str, body: str) -> None:
+    doc = _find(session, doc_type, doc_id)
+    if doc:
+        # Keep the rowid; only the FTS content is replaced
+        session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :rowid"), {"rowid": doc.id})
+        doc.rfp_id = rfp_id
+    else:
+        doc = SearchDocModel(doc_type=doc_type, doc_id=doc_id, rfp_id=rfp_id)
+    session.add(doc)
+    session.flush()
+    session.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:rowid, :title, :body)"),
+        {"rowid": doc.id, "title": title, "body": body},
+    )
+
+
+def remove_rfp_documents(session, rfp_id: str) -> None:
+    """Remove an RFP and all its proposals from the index in the caller's transaction (bulk deletes)."""
+    if not is_available():
+        return
+    session.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT id FROM search_docs WHERE rfp_id = :rfp_id)"),
+        {"rfp_id": rfp_id},
+    )
+    session.exec(delete(SearchDocModel).where(SearchDocModel.rfp_id == rfp_id))
+
+
+def _index(session, docs: Set[Tuple[str, str]]) -> None:
+    from backend.services import text_store
+
+    for doc_type, doc_id in docs:
+        if doc_type == "rfp":
+            rfp = session.get(RfpModel, doc_id)
+            if rfp is None:
+                _remove(session, "rfp", doc_id)
+                continue
+            _write(session, "rfp", rfp.id, rfp.id, *_rfp_document(rfp))
+        else:
+            proposal = session.get(ProposalModel, doc_id)
+            if proposal is None:
+                _remove(session, "proposal", doc_id)
+                continue
+            extracted = text_store.read_text(session, doc_id)
+            _write(session, "proposal", proposal.id, proposal.rfp_id, *_proposal_document(proposal, extracted))
+
+
+def index_documents(docs: Set[Tuple[str, str]]) -> None:
+    """(Re)index the given (doc_type, doc_id) documents; missing ones are removed."""
+    if not is_available() or not docs:
+        return
+    with write_session() as session:
+        _index(session, docs)
+        session.commit()
+
+
+def rebuild() -> int:
+    """Drop and rebuild the whole index. Returns the number of documents indexed."""
+    if not is_available():
+        return 0
+    ensure_search_index()
+    with write_session() as session:
+        session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        session.exec(delete(SearchDocModel))
+        session.commit()
+        docs = {("rfp", i) for i in session.exec(select(RfpModel.id)).all()}
+        docs |= {("proposal", i) for i in session.exec(select(ProposalModel.id)).all()}
+    index_documents(docs)
+    return len(docs)
+
+
+def _doc_key(target) -> Tuple[str, str]:
+    if isinstance(target, RfpModel):
+        return "rfp", target.id
+    if isinstance(target, ProposalTextModel):
+        return "proposal", target.proposal_id
+    return "proposal", target.id
+
+
+def _touches_index(target) -> bool:
+    fields = _INDEXED_FIELDS.get(type(target))
+    if fields is None:  # proposal text
+        return True
+    state = inspect(target)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+def _record(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(_doc_key(target))
+
+
+def _record_update(mapper, connection, target) -> None:
+    if _touches_index(target):
+        _record(mapper, connection, target)
+
+
+for _model in (RfpModel, ProposalModel, ProposalTextModel):
+    event.listen(_model, "after_insert", _record)
+    event.listen(_model, "after_update", _record_update)
+    event.listen(_model, "after_delete", _record)
+
+
+@event.listens_for(Session, "before_commit")
+def _index_before_commit(session) -> None:
+    if not is_available():
+        return
+    session.flush()  # record every pending write first
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        with session.begin_nested():
+            _index(session, pending)
+    except Exception as e:
+        print(f"⚠ Search index update failed ({len(pending)} docs), run jobs/reindex_search.py: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session) -> None:
+    if session.in_nested_transaction():
+        return  # only a savepoint was rolled back; the outer transaction goes on
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --- Query ---
+
+def to_match_query(query: str) -> str:
+    """
+    Safe FTS5 MATCH expression: every word must match (AND), each quoted
+    so punctuation in license numbers etc. is not read as syntax; a
+    trailing * keeps prefix matching.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search(
+    query: str,
+    doc_type: Optional[str] = None,
+    rfp_id: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+) -> List[Dict]:
+    """Ranked matches: [{doc_type, doc_id, rfp_id, title, snippet, rank}] (best first)."""
+    match = to_match_query(query)
+    if not match or not is_available():
+        return []
+
+    filters = ""
+    params = {"match": match, "limit": limit}
+    if doc_type:
+        filters += " AND d.doc_type = :doc_type"
+        params["doc_type"] = doc_type
+    if rfp_id:
+        filters += " AND d.rfp_id = :rfp_id"
+        params["rfp_id"] = rfp_id
+
+    sql = text(f"""
+        SELECT d.doc_type, d.doc_id, d.rfp_id,
+               highlight({FTS_TABLE}, 0, '<mark>', '</mark>') AS title,
+               snippet({FTS_TABLE}, 1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25({FTS_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank
+        FROM {FTS_TABLE}
+        JOIN search_docs d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match{filters}
+        ORDER BY rank
+        LIMIT :limit
+    """)
+    with engine.connect() as conn:
+        rows = conn.execute(sql, params).mappings().all()
+    return [{**row, "rank": round(row["rank"], 4)} for row in rows]
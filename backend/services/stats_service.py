@@ -0,0 +1,143 @@
+"""
+Dashboard Statistics
+
+RFP and proposal counts, acceptances and price ranges computed with two
+GROUP BY queries instead of loading every row (and re-listing proposals per
+RFP). The result is cached in memory and dropped whenever a transaction
+that wrote an RFP or proposal commits, so reads are free between writes.
+Writes made by other processes (jobs, other uvicorn workers) don't fire
+those hooks, so a cached result also expires after TTL_SECONDS.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session, object_session
+from sqlmodel import select
+
+from backend.models.db import get_session
+from backend.models.entities import ProposalModel, RfpModel
+
+# Proposal statuses counted as accepted (approve sets "Accepted"; older rows use "approved")
+ACCEPTED_STATUSES = ("accepted", "approved")
+
+TTL_SECONDS = 30.0
+
+_DIRTY_KEY = "stats_dirty"
+_cache_lock = threading.Lock()
+_generation = 0
+_cached: Optional[tuple] = None  # (generation, expires_at, stats)
+
+
+def invalidate() -> None:
+    """Drop the cached stats (called after commits that touch RFPs or proposals)."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+
+
+def _mark_dirty(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+for _model in (RfpModel, ProposalModel):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dirty)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session) -> None:
+    if session.in_nested_transaction():
+        return  # only a savepoint was rolled back; the outer transaction goes on
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def _compute() -> dict:
+    is_accepted = case((func.lower(ProposalModel.status).in_(ACCEPTED_STATUSES), 1), else_=0)
+    per_rfp_stmt = (
+        select(
+            RfpModel.id,
+            RfpModel.title,
+            RfpModel.status,
+            RfpModel.budget,
+            RfpModel.currency,
+            RfpModel.deadline,
+            RfpModel.created_at,
+            func.count(ProposalModel.id),
+            func.coalesce(func.sum(is_accepted), 0),
+            func.min(ProposalModel.price),
+            func.max(ProposalModel.price),
+            func.avg(ProposalModel.price),
+        )
+        .outerjoin(ProposalModel, ProposalModel.rfp_id == RfpModel.id)
+        .group_by(RfpModel.id)
+        .order_by(RfpModel.created_at.desc())
+    )
+    status_stmt = select(func.lower(ProposalModel.status), func.count()).group_by(func.lower(ProposalModel.status))
+
+    with get_session() as session:
+        per_rfp_rows = session.exec(per_rfp_stmt).all()
+        proposal_status_rows = session.exec(status_stmt).all()
+
+    rfps_by_status: dict = {}
+    per_rfp = []
+    for (rfp_id, title, status, budget, currency, deadline, created_at,
+         total, accepted, price_min, price_max, price_avg) in per_rfp_rows:
+        rfps_by_status[status] = rfps_by_status.get(status, 0) + 1
+        per_rfp.append({
+            "rfp_id": rfp_id,
+            "title": title,
+            "status": status,
+            "budget": budget,
+            "currency": currency,
+            "deadline": deadline,
+            "created_at": created_at,
+            "total_proposals": total,
+            "accepted_proposals": int(accepted),
+            "price_min": price_min,
+            "price_max": price_max,
+            "price_avg": round(price_avg, 2) if price_avg is not None else None,
+        })
+
+    proposals_by_status = {status: count for status, count in proposal_status_rows}
+    return {
+        "rfps": {
+            "total": len(per_rfp),
+            "by_status": rfps_by_status,
+            "with_proposals": sum(1 for r in per_rfp if r["total_proposals"]),
+        },
+        "proposals": {
+            "total": sum(proposals_by_status.values()),
+            "by_status": proposals_by_status,
+            "accepted": sum(proposals_by_status.get(s, 0) for s in ACCEPTED_STATUSES),
+        },
+        "per_rfp": per_rfp,
+        "generated_at": datetime.utcnow(),
+    }
+
+
+def get_dashboard_stats() -> dict:
+    """Dashboard stats, recomputed after RFP/proposal writes or once TTL_SECONDS pass."""
+    global _cached
+    with _cache_lock:
+        generation = _generation
+        if _cached and _cached[0] == generation and _cached[1] > time.monotonic():
+            return _cached[2]
+
+    stats = _compute()
+    with _cache_lock:
+        # A write that committed while computing leaves this result stale; don't keep it
+        if _generation == generation:
+            _cached = (generation, time.monotonic() + TTL_SECONDS, stats)
+    return stats
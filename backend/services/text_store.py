@@ -0,0 +1,101 @@
+"""
+Proposal Text Store
+
+Extracted PDF text lives compressed in the proposal_texts side table
+(zstd when the zstandard package is installed, zlib otherwise) instead of
+inline in proposals, and is decompressed only when a caller needs it.
+Rows written before the split still carry inline text; readers fall back
+to it until jobs/move_extracted_text.py has run.
+"""
+
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from backend.models.db import get_session
+from backend.models.entities import ProposalModel, ProposalTextModel
+from backend.src.utils.hashing import content_hash
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def compress(text: str) -> tuple[str, bytes]:
+    """(codec, compressed bytes) for `text`."""
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Text was stored with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def store_text(session: Session, proposal_id: str, text: Optional[str]) -> None:
+    """Write (or clear) a proposal's text in the caller's transaction and empty the inline column."""
+    existing = session.get(ProposalTextModel, proposal_id)
+    if not text:
+        if existing:
+            session.delete(existing)
+    else:
+        codec, data = compress(text)
+        row = existing or ProposalTextModel(proposal_id=proposal_id, codec=codec, data=data, size=0, text_hash="")
+        row.codec, row.data = codec, data
+        row.size = len(text.encode("utf-8"))
+        row.text_hash = content_hash(text)
+        row.updated_at = datetime.utcnow()
+        session.add(row)
+
+    proposal = session.get(ProposalModel, proposal_id)
+    if proposal and proposal.extracted_text is not None:
+        proposal.extracted_text = None
+        session.add(proposal)
+
+
+def read_text(session: Session, proposal_id: str) -> Optional[str]:
+    """load_text in the caller's session (sees its uncommitted writes)."""
+    row = session.get(ProposalTextModel, proposal_id)
+    if row:
+        return decompress(row.codec, row.data)
+    # Not migrated yet: read the legacy inline column only
+    return session.exec(
+        select(ProposalModel.extracted_text).where(ProposalModel.id == proposal_id)
+    ).first()
+
+
+def load_text(proposal_id: str) -> Optional[str]:
+    """A proposal's extracted text, or None if it has none."""
+    with get_session() as session:
+        return read_text(session, proposal_id)
+
+
+def text_hashes(proposal_ids: List[str]) -> Dict[str, str]:
+    """content_hash of each proposal's text ("" when there is none), without loading the text."""
+    if not proposal_ids:
+        return {}
+    hashes = {pid: "" for pid in proposal_ids}
+    with get_session() as session:
+        stmt = select(ProposalTextModel.proposal_id, ProposalTextModel.text_hash).where(
+            ProposalTextModel.proposal_id.in_(proposal_ids)
+        )
+        hashes.update(dict(session.exec(stmt).all()))
+        legacy = session.exec(
+            select(ProposalModel.id, ProposalModel.extracted_text).where(
+                ProposalModel.id.in_(proposal_ids), ProposalModel.extracted_text.is_not(None)
+            )
+        ).all()
+        for pid, text in legacy:
+            hashes[pid] = content_hash(text)
+    return hashes
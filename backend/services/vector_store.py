@@ -0,0 +1,222 @@
+"""
+Vector Store Access
+
+Read-side helpers over the ChromaDB collections written by ingestion:
+collection naming, loading a collection's chunks with their stored
+embeddings as a NumPy matrix, and embedding query texts with the same
+embedding model, so retrieval can be done as plain matrix products.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from backend.src.agents.ingestion import CHROMA_PATH
+from backend.src.utils.hashing import content_hash
+
+# Chunk matrices kept in memory: at most this many collections, and at most
+# this many bytes of embeddings and text in total
+_CHUNK_CACHE_SIZE = 64
+_CHUNK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_chunk_cache: "OrderedDict[tuple, ChunkSet]" = OrderedDict()
+_chunk_cache_bytes = 0
+_chunk_lock = threading.Lock()
+
+
+@dataclass
+class ChunkSet:
+    """Chunks of one collection; `vectors` rows are unit-normalized embeddings."""
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[dict]
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held: the embedding matrix plus the chunk texts."""
+        return self.vectors.nbytes + sum(len(t) for t in self.texts)
+
+
+def proposal_collection_name(proposal_id: str) -> str:
+    """Collection holding a vendor proposal PDF (written by upload_proposal)."""
+    return f"Vendor_Proposal_{proposal_id}"
+
+
+def estimate_collection_name(proposal_id: str) -> str:
+    """Collection written by BidEstimator during upload (named after the PDF, i.e. the proposal id)."""
+    return f"Proposal_{proposal_id}"
+
+
+def requirements_collection_name(rfp_id: str) -> str:
+    """Collection holding one embedding per RFP requirement."""
+    return f"Requirements_{rfp_id}"
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Shared persistent ChromaDB client over data/chromadb."""
+    import chromadb
+    return chromadb.PersistentClient(path=CHROMA_PATH)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _stamp(collection) -> Optional[str]:
+    """Hash of a collection's chunk ids, or None if it is empty."""
+    # Ingestion adds chunks under fresh ids and embed_and_store under content
+    # hashes, so any re-ingest or edit changes the id set
+    ids = collection.get(include=[])["ids"]
+    return content_hash(sorted(ids)) if ids else None
+
+
+def collection_stamp(collection_name: str) -> Optional[str]:
+    """
+    Version of a collection's contents (None if missing or empty), for
+    caches of results derived from its chunks.
+    """
+    try:
+        collection = get_client().get_collection(collection_name)
+    except Exception:
+        return None
+    return _stamp(collection)
+
+
+def _evict(key: tuple) -> None:
+    global _chunk_cache_bytes
+    _chunk_cache_bytes -= _chunk_cache.pop(key).nbytes
+
+
+def get_chunks(collection_name: str) -> Optional[ChunkSet]:
+    """
+    All chunks of a collection with their embeddings, or None if the
+    collection does not exist or is empty.
+
+    Cached per (collection, collection_stamp), so a re-ingested collection
+    is reloaded even when its chunk count is unchanged, while repeat reads
+    only list ids. Least recently used matrices are dropped beyond
+    _CHUNK_CACHE_SIZE collections or _CHUNK_CACHE_MAX_BYTES.
+    """
+    global _chunk_cache_bytes
+    try:
+        collection = get_client().get_collection(collection_name)
+    except Exception:
+        return None
+    stamp = _stamp(collection)
+    if stamp is None:
+        return None
+
+    key = (collection_name, stamp)
+    with _chunk_lock:
+        if key in _chunk_cache:
+            _chunk_cache.move_to_end(key)
+            return _chunk_cache[key]
+
+    data = collection.get(include=["documents", "metadatas", "embeddings"])
+    chunks = ChunkSet(
+        ids=list(data["ids"]),
+        texts=list(data["documents"] or []),
+        metadatas=[m or {} for m in (data["metadatas"] or [])],
+        vectors=_normalize_rows(np.asarray(data["embeddings"], dtype=np.float32)),
+    )
+    if chunks.nbytes > _CHUNK_CACHE_MAX_BYTES:
+        return chunks  # too large to keep
+    with _chunk_lock:
+        # Older versions of this collection are never read again
+        for old in [k for k in _chunk_cache if k[0] == collection_name]:
+            _evict(old)
+        _chunk_cache[key] = chunks
+        _chunk_cache_bytes += chunks.nbytes
+        while len(_chunk_cache) > _CHUNK_CACHE_SIZE or _chunk_cache_bytes > _CHUNK_CACHE_MAX_BYTES:
+            _evict(next(iter(_chunk_cache)))
+    return chunks
+
+
+def list_collection_names() -> List[str]:
+    # Older chromadb versions return Collection objects, newer ones names
+    return [getattr(c, "name", c) for c in get_client().list_collections()]
+
+
+def delete_collections(names: List[str]) -> int:
+    """Delete the named collections (missing ones are skipped) and evict their cached chunks."""
+    client = get_client()
+    deleted = 0
+    for name in names:
+        try:
+            client.delete_collection(name)
+            deleted += 1
+        except Exception:
+            pass  # never created, or already gone
+    with _chunk_lock:
+        for key in [k for k in _chunk_cache if k[0] in names]:
+            _evict(key)
+    return deleted
+
+
+def page_label(metadata: dict) -> Optional[int]:
+    """1-based page number of a chunk (loaders store 0-based page indexes)."""
+    page = (metadata or {}).get("page")
+    return page + 1 if isinstance(page, int) else None
+
+
+def search(collection_name: str, query_vector: np.ndarray, k: int = 5) -> List[dict]:
+    """Top-k chunks of a collection by cosine similarity: [{text, page, score}]."""
+    chunks = get_chunks(collection_name)
+    if not chunks or chunks.vectors.shape[1] != query_vector.shape[-1]:
+        return []
+    scores = chunks.vectors @ query_vector.reshape(-1)
+    top_k = min(k, len(chunks))
+    best = np.argpartition(-scores, top_k - 1)[:top_k]
+    best = best[np.argsort(-scores[best])]
+    return [
+        {"text": chunks.texts[i], "page": page_label(chunks.metadatas[i]), "score": round(float(scores[i]), 3)}
+        for i in best
+    ]
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Unit-normalized embeddings (one row per text) from the ingestion model."""
+    from backend.src.utils.embeddings import get_embeddings
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    vectors = get_embeddings().embed_documents(texts)
+    return _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+def embed_and_store(collection_name: str, ids: List[str], texts: List[str]) -> np.ndarray:
+    """
+    Unit vectors for `texts`, in order, embedding only ids not yet stored.
+
+    Ids are content hashes, so unchanged texts are never re-embedded; ids
+    no longer requested are removed from the collection.
+    """
+    collection = get_client().get_or_create_collection(collection_name, metadata={"hnsw:space": "cosine"})
+    stored = collection.get(include=["embeddings"])
+    vectors = dict(zip(stored["ids"], stored["embeddings"] if stored["embeddings"] is not None else []))
+
+    missing = [(i, t) for i, t in dict(zip(ids, texts)).items() if i not in vectors]
+    if missing:
+        new_ids, new_texts = zip(*missing)
+        embeddings = embed_texts(list(new_texts))
+        collection.upsert(ids=list(new_ids), documents=list(new_texts), embeddings=embeddings.tolist())
+        vectors.update(zip(new_ids, embeddings))
+
+    wanted = set(ids)
+    stale = [i for i in vectors if i not in wanted]
+    if stale:
+        collection.delete(ids=stale)
+
+    if not ids:
+        return np.empty((0, 0), dtype=np.float32)
+    return _normalize_rows(np.asarray([vectors[i] for i in ids], dtype=np.float32))
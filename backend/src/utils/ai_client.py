@@ -10,7 +10,7 @@ Includes rate limiting and retry logic for Groq API.
 import os
 import time
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 from functools import lru_cache
 from dotenv import load_dotenv
 
@@ -180,16 +180,16 @@ def complete_with_fallback(
     # Try OpenAI first
     if OPENAI_API_KEY:
         try:
-            http_client = httpx.Client(timeout=60.0)
-            client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
-            resp = client.chat.completions.create(
-                model=model or OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature,
-            )
+            with httpx.Client(timeout=60.0) as http_client:
+                client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+                resp = client.chat.completions.create(
+                    model=model or OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=temperature,
+                )
             return resp.choices[0].message.content.strip()
         except (RateLimitError, AuthenticationError) as e:
             logger.warning(f"OpenAI unavailable ({type(e).__name__}), falling back to Groq")
@@ -244,10 +244,104 @@ def _complete_with_groq(
             retry_delay = GROQ_RETRY_DELAY * (2 ** attempt)  # Exponential backoff
             logger.warning(f"Groq rate limit hit. Retry {attempt + 1}/{GROQ_MAX_RETRIES} in {retry_delay}s...")
             time.sleep(retry_delay)
-        except Exception as e:
+        except Exception:
             # For other errors, don't retry
             raise
     
     # All retries exhausted
     raise AIClientError(f"Groq API failed after {GROQ_MAX_RETRIES} retries: {last_exception}")
 
+
+
+def stream_with_fallback(
+    system: str,
+    prompt: str,
+    temperature: float = 0.2,
+    model: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Stream a chat completion as text deltas, with the same provider
+    fallback as complete_with_fallback.
+
+    Falling back to Groq is only possible before the first delta; errors
+    after that propagate to the caller.
+    """
+    from openai import OpenAI
+    import httpx
+
+    if USE_FALLBACK or not OPENAI_API_KEY:
+        yield from _stream_with_groq(system, prompt, temperature, model)
+        return
+
+    # Closed when the stream is exhausted or the caller stops iterating
+    with httpx.Client(timeout=60.0) as http_client:
+        client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+        try:
+            stream = client.chat.completions.create(
+                model=model or OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=temperature,
+                stream=True,
+            )
+        except (RateLimitError, AuthenticationError) as e:
+            logger.warning(f"OpenAI unavailable ({type(e).__name__}), falling back to Groq")
+            yield from _stream_with_groq(system, prompt, temperature, model)
+            return
+
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def _stream_with_groq(
+    system: str,
+    prompt: str,
+    temperature: float = 0.2,
+    model: Optional[str] = None
+) -> Iterator[str]:
+    """Stream from the Groq API; rate-limit retries apply until the stream opens."""
+    from groq import Groq, RateLimitError as GroqRateLimitError
+
+    if not GROQ_API_KEY:
+        raise AIClientError("No AI provider available.")
+
+    client = Groq(api_key=GROQ_API_KEY)
+
+    groq_model = GROQ_MODEL
+    if model:
+        model_mapping = {
+            "gpt-4o": "llama-3.3-70b-versatile",
+            "gpt-4o-mini": "llama-3.1-8b-instant",
+        }
+        groq_model = model_mapping.get(model, GROQ_MODEL)
+
+    stream = None
+    last_exception = None
+    for attempt in range(GROQ_MAX_RETRIES):
+        try:
+            _rate_limit_groq()
+            stream = client.chat.completions.create(
+                model=groq_model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=temperature,
+                stream=True,
+            )
+            break
+        except GroqRateLimitError as e:
+            last_exception = e
+            retry_delay = GROQ_RETRY_DELAY * (2 ** attempt)
+            logger.warning(f"Groq rate limit hit. Retry {attempt + 1}/{GROQ_MAX_RETRIES} in {retry_delay}s...")
+            time.sleep(retry_delay)
+
+    if stream is None:
+        raise AIClientError(f"Groq API failed after {GROQ_MAX_RETRIES} retries: {last_exception}")
+
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,20 @@
+"""Content-Disposition headers for file downloads named after user input (RFP titles)."""
+
+import re
+import unicodedata
+from urllib.parse import quote
+
+_UNSAFE = re.compile(r'[\x00-\x1f\x7f/\\]+')
+_FALLBACK_UNSAFE = re.compile(r"[^A-Za-z0-9.-]+")
+
+
+def attachment_headers(filename: str) -> dict:
+    """
+    Headers serving a download as `filename`: a quoted ASCII-only fallback
+    plus the UTF-8 name in filename* (RFC 6266), so quotes, semicolons,
+    newlines or accents in a title cannot break the header.
+    """
+    name = _UNSAFE.sub("_", filename)
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    fallback = _FALLBACK_UNSAFE.sub("_", ascii_name).strip("_") or "download"
+    return {"Content-Disposition": f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"}
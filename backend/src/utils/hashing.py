@@ -0,0 +1,17 @@
+"""
+Stable content hashes used as cache versions.
+
+Any JSON-serializable value hashes the same regardless of dict key order,
+so a cache entry keyed by content_hash() is invalidated exactly when the
+underlying data changes.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(obj: Any, length: int = 16) -> str:
+    """Short sha256 hex digest of the canonical JSON form of `obj`."""
+    payload = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:length]
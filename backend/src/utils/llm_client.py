@@ -1,10 +1,10 @@
 """AI client with OpenAI-first, Groq fallback support."""
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
 # Use the unified AI client with automatic fallback
-from backend.src.utils.ai_client import complete_with_fallback
+from backend.src.utils.ai_client import complete_with_fallback, stream_with_fallback
 
 
 def complete(system: str, prompt: str, temperature: float = 0.2) -> str:
@@ -16,6 +16,11 @@ def complete(system: str, prompt: str, temperature: float = 0.2) -> str:
     return complete_with_fallback(system, prompt, temperature)
 
 
+def stream(system: str, prompt: str, temperature: float = 0.2) -> Iterator[str]:
+    """Like complete(), but yields the reply as text deltas as they arrive."""
+    return stream_with_fallback(system, prompt, temperature)
+
+
 def complete_json(system: str, prompt: str, temperature: float = 0.2) -> Dict[str, Any]:
     """Ask the model for JSON and parse it safely."""
     content = complete(system, prompt, temperature=temperature)
@@ -0,0 +1,43 @@
+"""
+Token counting for prompt budgets.
+
+Uses tiktoken's cl100k_base encoding when it is available; if the encoding
+cannot be loaded (e.g. no network to fetch the BPE file) it falls back to
+the usual ~4 characters per token estimate.
+"""
+
+from functools import lru_cache
+
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"⚠ tiktoken unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text`."""
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(enc.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "…") -> str:
+    """Cut `text` to at most `max_tokens` tokens, marking the cut with `suffix`."""
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    enc = _encoding()
+    if enc is None:
+        return text[: max_tokens * CHARS_PER_TOKEN].rstrip() + suffix
+    return enc.decode(enc.encode(text)[:max_tokens]).rstrip() + suffix
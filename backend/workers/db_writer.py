@@ -0,0 +1,74 @@
+"""
+Database Writer Queue
+
+SQLite allows one writer at a time. Heavy writes (upload persistence,
+stored reviews) are handed to a single background thread that runs them
+one after another, so request threads never contend for the write lock
+among themselves; reads keep using their own pooled connections and run
+concurrently under WAL. Across processes (uvicorn workers, jobs) the
+busy_timeout and BEGIN IMMEDIATE in write_session() do the queuing.
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+# Pending writes beyond this block the submitting thread (back-pressure)
+MAX_PENDING_WRITES = 1000
+
+_queue: "queue.Queue" = queue.Queue(maxsize=MAX_PENDING_WRITES)
+_thread: Optional[threading.Thread] = None
+_start_lock = threading.Lock()
+
+
+def _worker() -> None:
+    while True:
+        future, fn, args, kwargs = _queue.get()
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            _queue.task_done()
+
+
+def _ensure_started() -> None:
+    global _thread
+    with _start_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_worker, name="db-writer", daemon=True)
+            _thread.start()
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """Queue `fn(*args, **kwargs)` on the writer thread; returns its Future."""
+    future: Future = Future()
+    if threading.current_thread() is _thread:
+        # Already on the writer thread (a queued write calling another): run inline, queuing would deadlock
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+    _ensure_started()
+    _queue.put((future, fn, args, kwargs))
+    return future
+
+
+def run(fn: Callable, *args, **kwargs) -> Any:
+    """Run `fn` on the writer thread and wait for its result (exceptions are re-raised)."""
+    return submit(fn, *args, **kwargs).result()
+
+
+async def run_async(fn: Callable, *args, **kwargs) -> Any:
+    """run() for the event loop: awaits the writer thread without blocking the loop."""
+    return await asyncio.wrap_future(submit(fn, *args, **kwargs))
+
+
+def drain() -> None:
+    """Block until every queued write has finished (jobs and shutdown)."""
+    if _thread is not None:
+        _queue.join()
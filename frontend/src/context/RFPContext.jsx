@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
+import { readSSE } from '../utils/sse';
 
 const RFPContext = createContext();
 const API_BASE = 'http://localhost:8000/api';
@@ -54,13 +55,27 @@ export function RFPProvider({ children }) {
         }
     };
 
-    const fetchProposals = async () => {
-        try {
-            const response = await fetch(`${API_BASE}/proposals`);
+    // Follows keyset cursors until every page of a summary listing is loaded
+    const fetchAllPages = async (path) => {
+        const items = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: '200' });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`${API_BASE}${path}?${params}`);
             if (!response.ok) throw new Error('Failed to fetch proposals');
+            const page = await response.json();
+            items.push(...page.items);
+            cursor = page.next_cursor;
+        } while (cursor);
+        return items;
+    };
 
-            const data = await response.json();
-            console.log('✅ Fetched proposals from backend:', data);
+    const fetchProposals = async () => {
+        try {
+            // Listing columns only; the detail page loads the full proposal
+            const data = await fetchAllPages('/proposals/summary');
+            console.log('✅ Fetched proposals from backend:', data.length);
 
             // Transform backend data to frontend format
             const transformedProposals = data.map(p => ({
@@ -71,18 +86,10 @@ export function RFPProvider({ children }) {
                 price: p.price ? `$${p.price.toLocaleString()}` : 'Not specified',
                 summary: p.summary || 'No summary available',
                 status: p.status === 'submitted' ? 'Pending' : p.status.charAt(0).toUpperCase() + p.status.slice(1),
-                // Extended fields
-                experience: p.experience,
-                methodology: p.methodology,
-                warranties: p.warranties,
-                timeline_details: p.timeline_details,
-                extracted_text: p.extracted_text,
+                experience: p.has_experience,
                 contractor_email: p.contractor_email,
                 start_date: p.start_date,
-                currency: p.currency,
-                // Form data for comparison matrix
-                proposal_form_data: p.proposal_form_data || [],
-                dimensions: p.dimensions || {}
+                currency: p.currency
             }));
 
 
@@ -281,20 +288,28 @@ export function RFPProvider({ children }) {
         }
     };
 
-    const chatWithRFPConsultant = async (message, currentState, history) => {
+    // Streams the consultant's reply: onToken(text) per delta, resolves to the final result
+    const chatWithRFPConsultant = async (message, currentState, sessionId = null, onToken = () => {}) => {
         try {
-            const response = await fetch(`${API_BASE}/chat/rfp`, {
+            const response = await fetch(`${API_BASE}/chat/rfp/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     message,
                     current_state: currentState,
-                    conversation_history: history
+                    session_id: sessionId
                 })
             });
 
             if (!response.ok) throw new Error('AI Chat failed');
-            return await response.json();
+
+            let result = null;
+            await readSSE(response, (event, data) => {
+                if (event === 'token') onToken(data.text);
+                if (event === 'done') result = data;
+            });
+            if (!result) throw new Error('AI Chat stream ended early');
+            return result;
         } catch (err) {
             console.error('AI Chat Error:', err);
             throw err;
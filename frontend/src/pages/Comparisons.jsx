@@ -1,6 +1,7 @@
 import React, { useState, useMemo, useEffect } from 'react';
 import ReactApexChart from 'react-apexcharts';
 import { useRFP } from '../context/RFPContext';
+import { readSSE } from '../utils/sse';
 import { useSearchParams } from 'react-router-dom';
 import { X } from 'lucide-react';
 
@@ -226,18 +227,31 @@ export default function Comparisons() {
             // Fetch AI-powered comparison scores
             setLoadingScores(true);
             try {
-                const aiRes = await fetch(`http://localhost:8000/api/analysis/rfp/${rfpId}/compare`, {
+                const aiRes = await fetch(`http://localhost:8000/api/analysis/rfp/${rfpId}/compare/stream`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({
                         proposal_ids: proposalIds,
-                        dimensions: selectedDimensions
+                        dimensions: selectedDimensions,
+                        dimension_specs: aiDimensions.filter(d => selectedDimensions.includes(d.id))
                     })
                 });
 
                 if (aiRes.ok) {
-                    fetchedAiData = await aiRes.json();
-                    setAiScores(fetchedAiData);
+                    // Each vendor's scores arrive as soon as that vendor is scored
+                    const streamed = [];
+                    await readSSE(aiRes, (event, data) => {
+                        if (event === 'proposal') {
+                            streamed.push(data);
+                            setAiScores({ proposals: [...streamed] });
+                            setShowReport(true);
+                        }
+                        if (event === 'done') fetchedAiData = {
+                            rfp_title: data.rfp_title,
+                            proposals: proposalIds.map(pid => streamed.find(p => p.id === pid)).filter(Boolean)
+                        };
+                    });
+                    if (fetchedAiData) setAiScores(fetchedAiData);
                     console.log("AI Comparison Scores:", fetchedAiData);
                 } else {
                     console.error("AI comparison failed, using fallback scores");
@@ -98,6 +98,7 @@ export default function CreateRFP() {
     // 2. Chat & Logic State
     // -------------------------------------------------------------------------
     const [chatMessages, setChatMessages] = useState([]);
+    const chatSessionId = useRef(null);  // Server-side consultant history
     const [chatInput, setChatInput] = useState('');
     const [isTyping, setIsTyping] = useState(false);
 
@@ -232,15 +233,23 @@ export default function CreateRFP() {
                 timeline_end: dataRef.current.timeline.end
             };
 
-            // Limit history to plain text for API
-            const history = chatMessages.map(m => ({
-                role: m.role,
-                text: m.text
-            }));
-
             console.log("SENDING TO AI:", { input, currentState });
 
-            const result = await chatWithRFPConsultant(input, currentState, history);
+            // Grow an AI message as the reply streams in
+            let streaming = false;
+            const result = await chatWithRFPConsultant(input, currentState, chatSessionId.current, (text) => {
+                if (!streaming) {
+                    streaming = true;
+                    setIsTyping(false);
+                    setChatMessages(prev => [...prev, { role: 'ai', text }]);
+                    return;
+                }
+                setChatMessages(prev => [
+                    ...prev.slice(0, -1),
+                    { ...prev[prev.length - 1], text: prev[prev.length - 1].text + text }
+                ]);
+            });
+            if (result.session_id) chatSessionId.current = result.session_id;
 
             console.log("AI RESPONSE:", result);
 
@@ -258,8 +267,10 @@ export default function CreateRFP() {
                 }
             }));
 
-            // Add AI Reply
-            setChatMessages(prev => [...prev, { role: 'ai', text: result.reply }]);
+            // Final AI reply (replaces the streamed text)
+            setChatMessages(prev => streaming
+                ? [...prev.slice(0, -1), { role: 'ai', text: result.reply }]
+                : [...prev, { role: 'ai', text: result.reply }]);
 
         } catch (err) {
             console.error(err);
@@ -1,14 +1,24 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
 import { FileText, Files, BarChart2, Plus, ArrowRight } from 'lucide-react';
 import { Link } from 'react-router-dom';
 import { useRFP } from '../context/RFPContext';
 
 export default function Dashboard() {
     const { rfps } = useRFP();
+    const [stats, setStats] = useState(null);
 
-    // Computed KPIs
-    const openCount = rfps.filter(r => r.status === 'open').length;
-    const draftCount = rfps.filter(r => r.status === 'draft').length;
+    // Aggregated counts from the backend (one cached query instead of counting every row here)
+    useEffect(() => {
+        fetch('http://localhost:8000/api/stats/dashboard')
+            .then(res => res.ok ? res.json() : null)
+            .then(setStats)
+            .catch(err => console.error('Failed to fetch dashboard stats:', err));
+    }, [rfps]);
+
+    // Computed KPIs (local counts until the stats arrive)
+    const openCount = stats ? (stats.rfps.by_status.open || 0) : rfps.filter(r => r.status === 'open').length;
+    const draftCount = stats ? (stats.rfps.by_status.draft || 0) : rfps.filter(r => r.status === 'draft').length;
+    const withProposalsCount = stats ? stats.rfps.with_proposals : rfps.filter(r => r.proposals > 0).length;
 
     // Helper for "Time Ago"
     const timeAgo = (dateString) => {
@@ -39,7 +49,7 @@ export default function Dashboard() {
     const kpis = [
         { label: 'Open RFPs', value: openCount, icon: <FileText className="text-blue-600" size={24} />, color: 'bg-blue-100', link: '/open-rfps?status=open' },
         { label: 'Drafts', value: draftCount, icon: <Files className="text-amber-600" size={24} />, color: 'bg-amber-100', link: '/open-rfps?status=draft' },
-        { label: 'Saved Comparisons', value: rfps.filter(r => r.proposals > 0).length, icon: <BarChart2 className="text-teal-600" size={24} />, color: 'bg-teal-100', link: '/comparisons' },
+        { label: 'Saved Comparisons', value: withProposalsCount, icon: <BarChart2 className="text-teal-600" size={24} />, color: 'bg-teal-100', link: '/comparisons' },
     ];
 
     return (
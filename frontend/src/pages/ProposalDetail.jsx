@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { Send, User as UserIcon, Bot, ArrowLeft, FileText, CheckCircle, XCircle } from 'lucide-react';
 import { useRFP } from '../context/RFPContext';
+import { readSSE } from '../utils/sse';
 
 const API_BASE = 'http://localhost:8000/api';
 
@@ -12,6 +13,7 @@ export default function ProposalDetail() {
     const [fullProposal, setFullProposal] = useState(null);
     const [rfpData, setRfpData] = useState(null);  // RFP form structure
     const [messages, setMessages] = useState([]);
+    const [chatSessionId, setChatSessionId] = useState(null);  // Server keeps the history
     const [input, setInput] = useState('');
     const [loading, setLoading] = useState(true);
 
@@ -73,30 +75,29 @@ export default function ProposalDetail() {
         setInput('');
 
         try {
-            // Prepare history for context
-            const history = messages.map(m => ({
-                role: m.role,
-                content: m.text // Backend expects 'content', frontend uses 'text'
-            }));
-
-            const response = await fetch(`${API_BASE}/proposals/${id}/chat`, {
+            const response = await fetch(`${API_BASE}/proposals/${id}/chat/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     proposal_id: id,
                     message: userMsg.text,
-                    conversation_history: history
+                    session_id: chatSessionId
                 })
             });
 
             if (!response.ok) throw new Error('Chat request failed');
 
-            const data = await response.json();
+            // Show the reply as it streams in: append an empty AI message and grow it
+            setMessages(prev => [...prev, { role: 'ai', text: '' }]);
+            const appendToReply = (text) => setMessages(prev => [
+                ...prev.slice(0, -1),
+                { ...prev[prev.length - 1], text: prev[prev.length - 1].text + text }
+            ]);
 
-            setMessages(prev => [...prev, {
-                role: 'ai',
-                text: data.reply
-            }]);
+            await readSSE(response, (event, data) => {
+                if (event === 'token') appendToReply(data.text);
+                if (event === 'done' && data.session_id) setChatSessionId(data.session_id);
+            });
 
         } catch (err) {
             console.error('Chat error:', err);
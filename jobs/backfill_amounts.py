@@ -0,0 +1,51 @@
+"""Normalize money fields on proposals stored before amounts were parsed at ingest."""
+
+from sqlmodel import select
+
+from backend.models.db import write_session
+from backend.models.entities import ProposalModel
+from backend.services.ingest.amounts import NORMALIZED_KEY, normalize_form_rows, parse_amount
+
+BATCH_SIZE = 100
+
+
+def run(force: bool = False) -> int:
+    """Fill price_minor/price_status and normalized form rows where missing.
+
+    Args:
+        force: Re-parse every proposal, not only those never normalized
+            (after a change to the amount parser).
+
+    Returns:
+        Number of proposals updated.
+    """
+    updated = 0
+    last_id = ""
+    while True:
+        # One short write transaction per batch, so uploads are not blocked for the whole run
+        with write_session() as session:
+            stmt = select(ProposalModel).where(ProposalModel.id > last_id).order_by(ProposalModel.id).limit(BATCH_SIZE)
+            batch = session.exec(stmt).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            for proposal in batch:
+                changed = False
+                currency = proposal.currency or "USD"
+
+                if proposal.price is not None and (force or proposal.price_status is None):
+                    minor, _, status = parse_amount(proposal.price, currency)
+                    proposal.price_minor = minor
+                    proposal.price_status = status.value
+                    changed = True
+
+                rows = proposal.proposal_form_data or []
+                if any(isinstance(row, dict) and (force or NORMALIZED_KEY not in row) for row in rows):
+                    proposal.proposal_form_data = normalize_form_rows(rows, currency)
+                    changed = True
+
+                if changed:
+                    session.add(proposal)
+                    updated += 1
+            session.commit()
+    return updated
@@ -4,7 +4,7 @@ from datetime import date
 
 from sqlmodel import select
 
-from backend.models.db import get_session
+from backend.models.db import write_session
 from backend.models.entities import RfpModel, ProposalModel
 from backend.services.notification_service import send_expiry_email
 
@@ -17,7 +17,7 @@ def run() -> int:
     """
     today = date.today()
     updated = 0
-    with get_session() as session:
+    with write_session() as session:
         stmt = select(RfpModel).where(
             RfpModel.status == "open",
             RfpModel.deadline.is_not(None),
@@ -0,0 +1,23 @@
+"""Remove storage left behind by deleted RFPs/proposals and compact the stores."""
+
+from sqlalchemy import text
+
+from backend.models.db import engine
+from backend.services import cleanup_service
+
+
+def run(vacuum: bool = True, dry_run: bool = False) -> dict:
+    """Delete orphaned vector collections, PDFs and cache rows.
+
+    Args:
+        vacuum: Also VACUUM the application database afterwards (SQLite only).
+        dry_run: Only count what would be removed.
+
+    Returns:
+        Counts of removed collections, files and rows.
+    """
+    removed = cleanup_service.collect_garbage(dry_run=dry_run)
+    if vacuum and not dry_run and removed["rows"] and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+    return removed
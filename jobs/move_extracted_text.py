@@ -0,0 +1,43 @@
+"""Move inline proposals.extracted_text into the compressed proposal_texts table."""
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from backend.models.db import engine, write_session
+from backend.models.entities import ProposalModel
+from backend.services import text_store
+
+BATCH_SIZE = 100
+
+
+def run(vacuum: bool = True) -> int:
+    """Compress and move every inline text, then null the inline column.
+
+    Args:
+        vacuum: Rebuild the SQLite file afterwards so the freed pages are
+            returned and the proposals table is stored compactly.
+
+    Returns:
+        Number of proposals moved.
+    """
+    moved = 0
+    while True:
+        with write_session() as session:
+            # Moved rows get extracted_text = NULL, so each pass picks up the next batch
+            stmt = (
+                select(ProposalModel.id, ProposalModel.extracted_text)
+                .where(ProposalModel.extracted_text.is_not(None))
+                .limit(BATCH_SIZE)
+            )
+            batch = session.exec(stmt).all()
+            if not batch:
+                break
+            for proposal_id, extracted in batch:
+                text_store.store_text(session, proposal_id, extracted)
+            session.commit()
+            moved += len(batch)
+
+    if vacuum and moved and engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+    return moved
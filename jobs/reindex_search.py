@@ -0,0 +1,12 @@
+"""Rebuild the full-text search index over all RFPs and proposals."""
+
+from backend.services import search_service
+
+
+def run() -> int:
+    """Drop and re-create every search document.
+
+    Returns:
+        Number of documents indexed.
+    """
+    return search_service.rebuild()
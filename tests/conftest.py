@@ -0,0 +1,46 @@
+"""
+Shared fixtures. The database and storage paths are pointed at a temporary
+directory before any backend module is imported, since settings and the
+engine are created at import time.
+"""
+
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="rfp-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["STORAGE_PATH"] = os.path.join(_TMP, "storage")
+os.makedirs(os.environ["STORAGE_PATH"])
+
+import pytest  # noqa: E402
+
+from backend.models.db import get_session, init_db  # noqa: E402
+from backend.models.entities import ProposalModel, RfpModel  # noqa: E402
+from backend.services import entity_cache, stats_service  # noqa: E402,F401  (registers ORM hooks)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    init_db()
+    yield
+
+
+@pytest.fixture
+def make_rfp():
+    """Factory: insert an RFP (and optionally proposals) and return (rfp_id, [proposal_ids])."""
+
+    def make(title: str = "Roof Repair", proposals: int = 0, **fields):
+        with get_session() as session:
+            rfp = RfpModel(title=title, requirements=[{"id": "1", "text": "OSHA certified"}], **fields)
+            session.add(rfp)
+            session.commit()
+            rfp_id = rfp.id
+            proposal_ids = []
+            for n in range(proposals):
+                proposal = ProposalModel(rfp_id=rfp_id, contractor=f"Vendor {n}", price=1000.0 * (n + 1))
+                session.add(proposal)
+                session.commit()
+                proposal_ids.append(proposal.id)
+        return rfp_id, proposal_ids
+
+    return make
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from backend.src.utils import ai_client
+
+
+def _delta(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def http_clients(monkeypatch):
+    """OpenAI stubbed to stream two deltas; returns the httpx clients it was given."""
+    clients = []
+
+    class FakeOpenAI:
+        def __init__(self, api_key, http_client):
+            clients.append(http_client)
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, stream=False, **kwargs):
+            if stream:
+                return iter([_delta("Hello"), _delta(" there")])
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" Hi "))])
+
+    monkeypatch.setattr(ai_client, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(ai_client, "USE_FALLBACK", False)
+    monkeypatch.setattr(openai, "OpenAI", FakeOpenAI)
+    return clients
+
+
+def test_stream_closes_http_client(http_clients):
+    assert "".join(ai_client.stream_with_fallback("system", "prompt")) == "Hello there"
+    assert len(http_clients) == 1 and http_clients[0].is_closed
+
+
+def test_abandoned_stream_closes_http_client(http_clients):
+    stream = ai_client.stream_with_fallback("system", "prompt")
+    assert next(stream) == "Hello"
+    stream.close()
+    assert http_clients[0].is_closed
+
+
+def test_complete_closes_http_client(http_clients):
+    assert ai_client.complete_with_fallback("system", "prompt") == "Hi"
+    assert isinstance(http_clients[0], httpx.Client) and http_clients[0].is_closed
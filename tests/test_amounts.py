@@ -0,0 +1,57 @@
+import pytest
+
+from backend.services.ingest.amounts import QuoteStatus, parse_amount
+
+
+@pytest.mark.parametrize("raw, minor, currency", [
+    ("$1,295,648.70", 129564870, "USD"),
+    ("1295648.70", 129564870, "USD"),
+    ("1,200", 120000, "USD"),
+    ("(1,200.00)", -120000, "USD"),
+    ("($1,200.00)", -120000, "USD"),
+    ("-$50", -5000, "USD"),
+    ("$-50", -5000, "USD"),
+    ("EUR 950", 95000, "EUR"),
+    ("950 EUR", 95000, "EUR"),
+    ("€1,000.50", 100050, "EUR"),
+    ("¥5,000", 5000, "JPY"),
+    (".50", 50, "USD"),
+    ("$ -", 0, "USD"),
+    (1295648.7, 129564870, "USD"),
+    (0, 0, "USD"),
+])
+def test_amounts_are_quoted(raw, minor, currency):
+    assert parse_amount(raw) == (minor, currency, QuoteStatus.QUOTED)
+
+
+@pytest.mark.parametrize("raw", [
+    "Included in item 3.2",
+    "See note 4",
+    "5%",
+    "2 @ $500",
+    "Phase 2: $10,000",
+    "1.295,70",
+    "1,29,500",
+    "12,34",
+    "$1,000 - $2,000",
+    "(1,200.00",
+    "--5",
+    "XYZ 100",
+    "1 000",
+    "N/A",
+])
+def test_free_text_is_not_an_amount(raw):
+    minor, _, status = parse_amount(raw)
+    assert minor is None
+    assert status == QuoteStatus.NOT_APPLICABLE
+
+
+@pytest.mark.parametrize("raw, status", [
+    ("TBD", QuoteStatus.TBD),
+    ("to be confirmed", QuoteStatus.TBD),
+    ("", QuoteStatus.NOT_QUOTED),
+    ("-", QuoteStatus.NOT_QUOTED),
+    (None, QuoteStatus.NOT_QUOTED),
+])
+def test_placeholder_words(raw, status):
+    assert parse_amount(raw)[2] == status
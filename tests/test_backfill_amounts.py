@@ -0,0 +1,18 @@
+from backend.models.db import get_session
+from backend.models.entities import ProposalModel
+from jobs import backfill_amounts
+
+
+def test_backfill_normalizes_unparsed_rows_in_batches(make_rfp, monkeypatch):
+    monkeypatch.setattr(backfill_amounts, "BATCH_SIZE", 2)
+    _, proposal_ids = make_rfp(proposals=3)
+
+    backfill_amounts.run()
+    with get_session() as session:
+        for proposal_id in proposal_ids:
+            proposal = session.get(ProposalModel, proposal_id)
+            assert proposal.price_status == "quoted"
+            assert proposal.price_minor == round(proposal.price * 100)
+
+    assert backfill_amounts.run() == 0
+    assert backfill_amounts.run(force=True) >= 3
@@ -0,0 +1,39 @@
+from backend.services import bid_analytics, proposal_service, rfp_service
+from backend.services.matrix_service import MatrixLayout
+
+
+def _analytics(make_rfp, rows):
+    """Analytics for line items given as one list of vendor totals per row."""
+    rfp_id, proposal_ids = make_rfp(proposals=len(rows[0]))
+    proposals = [
+        proposal_service.get_proposal(pid).model_copy(update={"proposal_form_data": [
+            {"item_id": str(i), "total": f"${row[j]}"} for i, row in enumerate(rows)
+        ]})
+        for j, pid in enumerate(proposal_ids)
+    ]
+    layout = MatrixLayout(
+        rfp=rfp_service.get_rfp(rfp_id),
+        proposals=proposals,
+        rfp_rows=[{"item_id": str(i), "description": f"Item {i}"} for i in range(len(rows))],
+        fixed_columns=["item_id", "description"],
+        vendor_columns=["total"],
+    )
+    return bid_analytics.compute_analytics(layout), proposal_ids
+
+
+def test_outlier_flagged_when_mad_is_zero(make_rfp):
+    result, ids = _analytics(make_rfp, [[100, 100, 1000], [100, 100, 101]])
+    flagged = result["rows"][0]["outliers"]
+    assert [o["proposal_id"] for o in flagged] == [ids[2]]
+    assert flagged[0]["z_score"] == 90.0
+    assert result["rows"][1]["outliers"] == []
+
+
+def test_small_differences_in_a_tight_cluster_are_not_outliers(make_rfp):
+    result, _ = _analytics(make_rfp, [[100, 100.5, 101, 99.5, 103]])
+    assert result["rows"][0]["outliers"] == []
+
+
+def test_wild_bid_among_spread_quotes(make_rfp):
+    result, ids = _analytics(make_rfp, [[900, 1000, 1100, 1050, 5000]])
+    assert [o["proposal_id"] for o in result["rows"][0]["outliers"]] == [ids[4]]
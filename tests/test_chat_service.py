@@ -0,0 +1,78 @@
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.models.db import get_session
+from backend.models.entities import RfpModel
+from backend.services import answer_cache, chat_service
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError("provider down")
+
+
+def _failing_stream(*args, **kwargs):
+    raise RuntimeError("provider down")
+    yield  # pragma: no cover
+
+
+def test_ask_about_proposal_returns_apology_when_llm_fails(make_rfp, monkeypatch):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    monkeypatch.setattr(chat_service, "_embed_question", lambda message: None)
+    monkeypatch.setattr(chat_service, "complete", _fail)
+
+    assert chat_service.ask_about_proposal(proposal_id, "What is the warranty?") == chat_service.CHAT_ERROR_REPLY
+
+
+def test_stream_about_proposal_yields_apology_when_llm_fails(make_rfp, monkeypatch):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    monkeypatch.setattr(chat_service, "_embed_question", lambda message: None)
+    monkeypatch.setattr(chat_service, "stream", _failing_stream)
+
+    assert list(chat_service.stream_about_proposal(proposal_id, "What is the warranty?")) == [chat_service.CHAT_ERROR_REPLY]
+
+
+def test_ask_about_rfp_returns_apology_when_llm_fails(make_rfp, monkeypatch):
+    rfp_id, _ = make_rfp(proposals=2)
+    monkeypatch.setattr(chat_service, "_embed_question", lambda message: None)
+    monkeypatch.setattr(chat_service, "complete", _fail)
+
+    result = chat_service.ask_about_rfp(rfp_id, "Which vendor is cheapest?")
+    assert result == {"reply": chat_service.CHAT_ERROR_REPLY, "sources": []}
+
+
+def test_cached_answer_is_retired_when_the_rfp_changes(make_rfp, monkeypatch):
+    rfp_id, (proposal_id,) = make_rfp(proposals=1, budget=5000)
+    monkeypatch.setattr(chat_service, "_embed_question", lambda message: np.array([1.0, 0.0, 0.0]))
+    monkeypatch.setattr(chat_service, "_retrieve_excerpts", lambda proposal_id, query: [])
+    replies = iter(["Within budget.", "Over budget."])
+    monkeypatch.setattr(chat_service, "complete", lambda *args, **kwargs: next(replies))
+
+    assert chat_service.ask_about_proposal(proposal_id, "Is it within budget?") == "Within budget."
+    assert chat_service.ask_about_proposal(proposal_id, "Is it within budget?") == "Within budget."
+
+    with get_session() as session:
+        rfp = session.get(RfpModel, rfp_id)
+        rfp.budget = 500
+        session.add(rfp)
+        session.commit()
+
+    assert chat_service.ask_about_proposal(proposal_id, "Is it within budget?") == "Over budget."
+
+
+def test_answer_cache_lookup_does_not_write(make_rfp, monkeypatch):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    vector = np.array([0.0, 1.0, 0.0])
+    answer_cache.store(proposal_id, "v1", "Warranty?", vector, "Two years.")
+
+    writes = []
+
+    def record(session):
+        writes.append(session)
+
+    event.listen(Session, "before_commit", record)
+    try:
+        assert answer_cache.lookup(proposal_id, "v1", vector) == "Two years."
+    finally:
+        event.remove(Session, "before_commit", record)
+    assert writes == []
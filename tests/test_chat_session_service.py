@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services import chat_session_service
+
+
+def test_concurrent_appends_keep_every_turn():
+    chat = chat_session_service.open_session(None, "proposal", "concurrency")
+
+    def append(n):
+        chat_session_service.append_turns(chat.id, [{"role": "user", "content": f"turn {n}"}])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(append, range(40)))
+
+    turns = chat_session_service.get_chat_session(chat.id).turns
+    assert sorted(t["content"] for t in turns) == sorted(f"turn {n}" for n in range(40))
+
+
+def test_compaction_keeps_turns_appended_while_summarizing(monkeypatch):
+    chat = chat_session_service.open_session(None, "proposal", "compaction")
+    chat_session_service.append_turns(
+        chat.id, [{"role": "user", "content": f"turn {n}"} for n in range(chat_session_service.COMPACT_AFTER_TURNS + 1)]
+    )
+
+    def summarize(summary, turns):
+        chat_session_service.append_turns(chat.id, [{"role": "user", "content": "late turn"}])
+        return "summary"
+
+    monkeypatch.setattr(chat_session_service, "_summarize", summarize)
+    chat_session_service.compact_session(chat.id)
+
+    compacted = chat_session_service.get_chat_session(chat.id)
+    assert compacted.summary == "summary"
+    assert [t["content"] for t in compacted.turns][-1] == "late turn"
+    assert len(compacted.turns) == chat_session_service.KEEP_RECENT_TURNS + 1
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+from sqlmodel import select
+
+from backend.models.db import get_session
+from backend.models.entities import RfpModel, ScoreCacheModel
+from backend.schemas.analysis import GENERAL_DIMENSIONS
+from backend.services import proposal_service, rfp_digest, rfp_service, scoring_service
+from backend.workers import db_writer
+
+
+def _on_writer_thread(monkeypatch, module, name) -> list:
+    """Wrap module.name to record the thread each call runs on."""
+    threads = []
+    original = getattr(module, name)
+
+    def wrapped(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapped)
+    return threads
+
+
+def test_run_async_returns_result_and_raises():
+    async def main():
+        assert await db_writer.run_async(lambda a, b: a + b, 2, b=3) == 5
+        try:
+            await db_writer.run_async(lambda: 1 / 0)
+        except ZeroDivisionError:
+            return True
+
+    assert asyncio.run(main())
+
+
+def test_async_digest_is_saved_by_the_writer(make_rfp, monkeypatch):
+    rfp_id, _ = make_rfp(title="Clerestory Windows")
+    threads = _on_writer_thread(monkeypatch, rfp_digest, "_save_digest")
+    rfp = rfp_service.get_rfp(rfp_id)
+
+    digest = asyncio.run(rfp_digest.get_digest_async(rfp))
+    assert threads == ["db-writer"]
+    with get_session() as session:
+        assert session.get(RfpModel, rfp_id).digest == digest
+
+    assert asyncio.run(rfp_digest.get_digest_async(rfp)) == digest
+    assert threads == ["db-writer"]
+
+
+def test_async_scores_are_saved_by_the_writer(make_rfp, monkeypatch):
+    rfp_id, (proposal_id,) = make_rfp(proposals=1)
+    threads = _on_writer_thread(monkeypatch, scoring_service, "_store_scores")
+    monkeypatch.setattr(scoring_service, "_embed_dimensions_safe", lambda dims: None)
+    monkeypatch.setattr(scoring_service, "_evidence_versions", lambda proposals: {p.id: None for p in proposals})
+    monkeypatch.setattr(
+        scoring_service, "_score_one",
+        lambda rfp_context, context, dims: {d.id: {"score": 80, "reasoning": "ok"} for d in dims},
+    )
+    dims = GENERAL_DIMENSIONS[:2]
+    results = asyncio.run(scoring_service.score_proposals(
+        rfp_service.get_rfp(rfp_id), [proposal_service.get_proposal(proposal_id)], dims
+    ))
+
+    assert results[0]["overall_score"] == 80
+    assert threads == ["db-writer"]
+    with get_session() as session:
+        rows = session.exec(select(ScoreCacheModel).where(ScoreCacheModel.proposal_id == proposal_id)).all()
+    assert sorted(r.dimension for r in rows) == sorted(d.id for d in dims)
@@ -0,0 +1,73 @@
+from sqlmodel import func, select
+
+from backend.models.db import get_session
+from backend.models.entities import (
+    AnswerCacheModel,
+    ChatSessionModel,
+    ProposalModel,
+    ProposalReviewModel,
+    ProposalTextModel,
+    RfpModel,
+    SavedComparisonModel,
+    ScoreCacheModel,
+    SearchDocModel,
+)
+from backend.services import proposal_service, rfp_service, search_service, stats_service, text_store
+
+
+def _rows(model, column, values) -> int:
+    with get_session() as session:
+        return session.exec(select(func.count()).select_from(model).where(column.in_(values))).one()
+
+
+def _add_dependents(rfp_id, proposal_id):
+    with get_session() as session:
+        text_store.store_text(session, proposal_id, "Roof tear-off and OSHA certified crew")
+        session.add(ScoreCacheModel(
+            proposal_id=proposal_id, dimension="cost", proposal_hash="h", rfp_version="r",
+            prompt_version="p", score=70, label="Strong",
+        ))
+        session.add(ProposalReviewModel(proposal_id=proposal_id, proposal_hash="h", requirements_hash="r", prompt_version="p"))
+        session.add(AnswerCacheModel(proposal_id=proposal_id, proposal_version="v", question="q", answer="a"))
+        session.add(ChatSessionModel(kind="proposal", subject_id=proposal_id))
+        session.add(ChatSessionModel(kind="rfp", subject_id=rfp_id))
+        session.add(SavedComparisonModel(rfp_id=rfp_id))
+        session.commit()
+
+
+def test_delete_rfp_removes_everything_stored_for_it(make_rfp):
+    rfp_id, proposal_ids = make_rfp(title="Cascade", proposals=2)
+    kept_rfp_id, kept_proposal_ids = make_rfp(title="Untouched", proposals=1)
+    for rfp, proposal in ((rfp_id, proposal_ids[0]), (kept_rfp_id, kept_proposal_ids[0])):
+        _add_dependents(rfp, proposal)
+    assert _rows(SearchDocModel, SearchDocModel.rfp_id, [rfp_id]) == 3
+    assert [hit["doc_id"] for hit in search_service.search("Cascade")] == [rfp_id]
+
+    assert sorted(rfp_service.delete_rfp(rfp_id)) == sorted(proposal_ids)
+
+    assert _rows(RfpModel, RfpModel.id, [rfp_id]) == 0
+    assert _rows(ProposalModel, ProposalModel.rfp_id, [rfp_id]) == 0
+    for model in (ScoreCacheModel, ProposalReviewModel, AnswerCacheModel, ProposalTextModel):
+        assert _rows(model, model.proposal_id, proposal_ids) == 0
+        assert _rows(model, model.proposal_id, kept_proposal_ids) == 1
+    assert _rows(ChatSessionModel, ChatSessionModel.subject_id, [rfp_id, *proposal_ids]) == 0
+    assert _rows(SavedComparisonModel, SavedComparisonModel.rfp_id, [rfp_id]) == 0
+    assert _rows(SearchDocModel, SearchDocModel.rfp_id, [rfp_id]) == 0
+    assert _rows(SearchDocModel, SearchDocModel.rfp_id, [kept_rfp_id]) == 2
+    assert search_service.search("Cascade") == []
+
+
+def test_delete_rfp_invalidates_caches(make_rfp):
+    rfp_id, (proposal_id,) = make_rfp(proposals=1)
+    assert rfp_service.get_rfp(rfp_id) and proposal_service.get_proposal(proposal_id)
+    before = stats_service.get_dashboard_stats()["rfps"]["total"]
+
+    rfp_service.delete_rfp(rfp_id)
+
+    assert rfp_service.get_rfp(rfp_id) is None
+    assert proposal_service.get_proposal(proposal_id) is None
+    assert stats_service.get_dashboard_stats()["rfps"]["total"] == before - 1
+
+
+def test_delete_missing_rfp_returns_none():
+    assert rfp_service.delete_rfp("does-not-exist") is None
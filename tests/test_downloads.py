@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.src.utils.downloads import attachment_headers
+
+
+@pytest.mark.parametrize("filename, fallback, encoded", [
+    ("Comparison_Roof.xlsx", "Comparison_Roof.xlsx", "Comparison_Roof.xlsx"),
+    ('Bid "A"; filename=x.csv', "Bid_A_filename_x.csv", "Bid%20%22A%22%3B%20filename%3Dx.csv"),
+    ("Réfection_toiture.pdf", "Refection_toiture.pdf", "R%C3%A9fection_toiture.pdf"),
+    ("Roof\r\nX-Injected: 1.csv", "Roof_X-Injected_1.csv", "Roof_X-Injected%3A%201.csv"),
+    ("../../etc/passwd", ".._.._etc_passwd", ".._.._etc_passwd"),
+    ("屋根.csv", ".csv", "%E5%B1%8B%E6%A0%B9.csv"),
+])
+def test_attachment_headers(filename, fallback, encoded):
+    assert attachment_headers(filename) == {
+        "Content-Disposition": f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{encoded}"
+    }
+
+
+def test_export_uses_safe_filename(make_rfp):
+    from backend.main import app
+
+    rfp_id, _ = make_rfp(title='Roof; "Phase 2"')
+    response = TestClient(app).get(f"/api/proposals/{rfp_id}/matrix/export.csv")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        "attachment; filename=\"Comparison_Roof_Phase_2_line_items.csv\"; "
+        "filename*=UTF-8''Comparison_Roof%3B_%22Phase_2%22_line_items.csv"
+    )
@@ -0,0 +1,73 @@
+import time
+
+from backend.models.db import get_session
+from backend.models.entities import ProposalModel
+from backend.services import entity_cache, proposal_service, rfp_service
+from backend.services.entity_cache import ReadThroughCache
+
+
+def test_cached_rfp_is_not_shared_with_callers(make_rfp):
+    rfp_id, _ = make_rfp()
+    first = rfp_service.get_rfp(rfp_id)
+    first.requirements.append(first.requirements[0].model_copy(update={"id": "2"}))
+    first.title = "Changed"
+
+    again = rfp_service.get_rfp(rfp_id)
+    assert again.title == "Roof Repair"
+    assert [req.id for req in again.requirements] == ["1"]
+
+
+def test_commit_invalidates_cached_proposal(make_rfp):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    assert proposal_service.get_proposal(proposal_id).status == "submitted"
+
+    proposal_service.set_status(proposal_id, "Accepted")
+    assert proposal_service.get_proposal(proposal_id).status == "Accepted"
+
+
+def test_rollback_keeps_cached_proposal(make_rfp):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    proposal_service.get_proposal(proposal_id)
+    hits = entity_cache.proposals.hits
+
+    with get_session() as session:
+        proposal = session.get(ProposalModel, proposal_id)
+        proposal.status = "Rejected"
+        session.add(proposal)
+        session.flush()
+        session.rollback()
+
+    assert proposal_service.get_proposal(proposal_id).status == "submitted"
+    assert entity_cache.proposals.hits == hits + 1
+
+
+def test_entries_expire_after_ttl():
+    cache = ReadThroughCache("test", ttl=0.0)
+    loads = []
+
+    def load(key):
+        loads.append(key)
+        return ProposalModel(id=key, rfp_id="r")
+
+    cache.get("a", load)
+    time.sleep(0.001)
+    cache.get("a", load)
+    assert loads == ["a", "a"]
+
+
+def test_value_loaded_during_invalidation_is_not_stored():
+    cache = ReadThroughCache("test")
+
+    def load(key):
+        cache.invalidate([key])  # a write commits while the row is being read
+        return ProposalModel(id=key, rfp_id="r")
+
+    cache.get("a", load)
+    assert cache.metrics()["entries"] == 0
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ReadThroughCache("test", max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, lambda k: ProposalModel(id=k, rfp_id="r"))
+    assert list(cache._entries) == ["a", "c"]
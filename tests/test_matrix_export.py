@@ -0,0 +1,58 @@
+import io
+import tempfile
+
+from openpyxl import load_workbook
+
+from backend.services import matrix_export, proposal_service, rfp_service
+from backend.services.matrix_service import MatrixLayout
+
+
+def _layout(make_rfp) -> MatrixLayout:
+    rfp_id, (a_id, b_id) = make_rfp(title="Roof <Phase 2> & Gutters", proposals=2)
+    a = proposal_service.get_proposal(a_id).model_copy(update={"proposal_form_data": [
+        {"item_id": "1", "total": "$1,200.50", "notes": "incl. \x01disposal"},
+        {"item_id": "2", "total": "TBD", "notes": "ok"},
+    ]})
+    b = proposal_service.get_proposal(b_id).model_copy(update={"proposal_form_data": [
+        {"item_id": "1", "total": "$999", "notes": None},
+    ]})
+    return MatrixLayout(
+        rfp=rfp_service.get_rfp(rfp_id),
+        proposals=[a, b],
+        rfp_rows=[
+            {"item_id": "1", "description": "Tear-off", "section": "Demolition"},
+            {"item_id": "2", "description": "Decking", "section": "Demolition"},
+        ],
+        fixed_columns=["item_id", "description"],
+        vendor_columns=["total", "notes"],
+    )
+
+
+def test_xlsx_export_content_and_styles(make_rfp):
+    data = b"".join(matrix_export.stream_matrix_xlsx(_layout(make_rfp)))
+    ws = load_workbook(io.BytesIO(data))[matrix_export.SHEET_TITLE]
+    rows = [[cell.value for cell in row] for row in ws.iter_rows()]
+
+    assert rows[0][0] == "Roof <Phase 2> & Gutters"
+    assert rows[1] == [None, None, "Vendor 0", None, "Vendor 1", None]
+    assert rows[2] == ["item_id", "description", "Vendor 0 total", "Vendor 0 notes", "Vendor 1 total", "Vendor 1 notes"]
+    assert rows[3][0] == "Demolition"
+    assert rows[4] == ["1", "Tear-off", 1200.5, "incl. disposal", 999, "-"]
+    assert rows[5] == ["2", "Decking", "TBD", "ok", "Not Quoted", "Not Quoted"]
+    assert rows[6] == ["GRAND TOTAL", "GRAND TOTAL", 1200.5, "", 999, ""]
+
+    assert ws.freeze_panes == "A4"
+    assert ws.column_dimensions["B"].width == 50
+    assert ws["A3"].style == "matrix_header" and ws["A3"].font.bold
+    assert ws["C5"].style == "matrix_currency" and ws["C5"].number_format == '"$"#,##0.00'
+    assert ws["C7"].style == "matrix_total"
+
+
+def test_xlsx_export_writes_no_temp_files(make_rfp, monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("export touched a temporary file")
+
+    layout = _layout(make_rfp)
+    for name in ("NamedTemporaryFile", "TemporaryFile", "mkstemp", "mkdtemp"):
+        monkeypatch.setattr(tempfile, name, refuse)
+    assert b"".join(matrix_export.stream_matrix_xlsx(layout))[:2] == b"PK"
@@ -0,0 +1,53 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.services import matrix_service, proposal_service, rfp_service
+
+
+@pytest.fixture
+def matrix(make_rfp, monkeypatch):
+    """Three line items: vendor A quotes 1 and 2, vendor B quotes 2 and marks 3 TBD."""
+    rfp_id, (a_id, b_id) = make_rfp(proposals=2)
+    a = proposal_service.get_proposal(a_id).model_copy(update={"proposal_form_data": [
+        {"item_id": "1", "description": "Tear-off", "total": "$100"},
+        {"item_id": "2", "description": "Decking", "total": "$200"},
+    ]})
+    b = proposal_service.get_proposal(b_id).model_copy(update={"proposal_form_data": [
+        {"item_id": "2", "description": "Decking", "total": "$250"},
+        {"item_id": "3", "description": "Flashing", "total": "TBD",
+         "normalized": {"total": {"minor": None, "currency": "USD", "status": "tbd"}}},
+    ]})
+    layout = matrix_service.MatrixLayout(
+        rfp=rfp_service.get_rfp(rfp_id),
+        proposals=[a, b],
+        rfp_rows=[{"item_id": str(n), "description": f"Item {n}"} for n in (1, 2, 3)],
+        fixed_columns=["item_id", "description"],
+        vendor_columns=["total"],
+    )
+
+    async def load(requested_id):
+        return layout if requested_id == rfp_id else None
+
+    monkeypatch.setattr(matrix_service, "load_matrix_layout", load)
+    from backend.main import app
+
+    def get(**params):
+        response = TestClient(app).get(f"/api/proposals/{rfp_id}/matrix", params=params)
+        assert response.status_code == 200
+        return [row["fixed_values"]["item_id"] for row in response.json()["rows"] if not row.get("is_grand_total")]
+
+    return get, a_id, b_id
+
+
+def test_filter_vendor_alone_keeps_rows_that_vendor_responded_to(matrix):
+    get, a_id, b_id = matrix
+    assert get(filter_vendor=a_id) == ["1", "2"]
+    assert get(filter_vendor=b_id) == ["2", "3"]
+
+
+def test_filter_status_with_and_without_vendor(matrix):
+    get, a_id, b_id = matrix
+    assert get(filter_status="not_quoted") == ["1", "3"]
+    assert get(filter_status="not_quoted", filter_vendor=a_id) == ["3"]
+    assert get(filter_status="tbd") == ["3"]
+    assert get() == ["1", "2", "3"]
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from backend.routers import pages
+from backend.services import rfp_service
+
+
+class _Templates:
+    """Stands in for Jinja2Templates: returns the template context as JSON."""
+
+    def TemplateResponse(self, name, context):
+        context = {k: v for k, v in context.items() if k != "request"}
+        return JSONResponse({"template": name, **jsonable_encoder(context)})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def no_full_scan():
+        raise AssertionError("page loaded every full RFP row")
+
+    monkeypatch.setattr(pages, "templates", _Templates())
+    monkeypatch.setattr(rfp_service, "list_rfps", no_full_scan)
+    app = FastAPI()
+    app.include_router(pages.router)
+    return TestClient(app)
+
+
+def test_dashboard_uses_aggregate_projection(client, make_rfp):
+    rfp_id, _ = make_rfp(title="Belfry Restoration", proposals=2, budget=25000, deadline=None)
+    body = client.get("/dashboard").json()
+
+    entry = next(e for e in body["all_rfps"] if e["rfp"]["id"] == rfp_id)
+    assert entry["rfp"]["title"] == "Belfry Restoration"
+    assert entry["rfp"]["budget"] == 25000
+    assert entry["total_proposals"] == 2
+    assert "requirements" not in entry["rfp"]
+
+
+def test_rfp_list_is_paged(client, make_rfp):
+    for n in range(3):
+        make_rfp(title=f"Paged {n}")
+    first = client.get("/rfps", params={"limit": 2}).json()
+    assert len(first["rfps"]) == 2 and first["next_cursor"]
+    assert "requirements" not in first["rfps"][0]
+
+    second = client.get("/rfps", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert {r["id"] for r in first["rfps"]}.isdisjoint(r["id"] for r in second["rfps"])
+    assert client.get("/rfps", params={"cursor": "garbage"}).status_code == 400
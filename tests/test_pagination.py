@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.models.db import get_session
+from backend.models.entities import ProposalModel
+from backend.services import proposal_service
+from backend.src.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 5, 123456)
+    cursor = encode_cursor(created_at, "abc-123")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "abc-123")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bm90IGpzb24", encode_cursor(datetime.now(), "x")[:-4]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def proposals(make_rfp):
+    """Seven proposals for one RFP; three share a created_at so ties are broken by id."""
+    rfp_id, _ = make_rfp()
+    base = datetime(2026, 1, 1)
+    stamps = [base, base + timedelta(hours=1), base + timedelta(hours=1), base + timedelta(hours=1),
+              base + timedelta(hours=2), base + timedelta(hours=3), base + timedelta(hours=4)]
+    with get_session() as session:
+        rows = [ProposalModel(rfp_id=rfp_id, contractor=f"Vendor {n}", created_at=stamp) for n, stamp in enumerate(stamps)]
+        session.add_all(rows)
+        session.commit()
+        expected = [r.id for r in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)]
+    return rfp_id, expected
+
+
+def test_keyset_pages_cover_every_row_once_in_order(proposals):
+    rfp_id, expected = proposals
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = proposal_service.list_proposal_summaries(rfp_id=rfp_id, cursor=cursor, limit=2)
+        seen += [item.id for item in page.items]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == expected
+    assert pages == 4
+
+
+def test_rows_inserted_before_the_cursor_do_not_shift_pages(proposals):
+    rfp_id, expected = proposals
+    first = proposal_service.list_proposal_summaries(rfp_id=rfp_id, limit=3)
+    with get_session() as session:
+        session.add(ProposalModel(rfp_id=rfp_id, contractor="Late", created_at=datetime(2026, 6, 1)))
+        session.commit()
+    second = proposal_service.list_proposal_summaries(rfp_id=rfp_id, cursor=first.next_cursor, limit=3)
+    assert [item.id for item in first.items + second.items] == expected[:6]
+
+
+def test_bad_cursor_is_a_400():
+    from backend.main import app
+
+    response = TestClient(app).get("/api/proposals/summary", params={"cursor": "garbage"})
+    assert response.status_code == 400
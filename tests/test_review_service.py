@@ -0,0 +1,32 @@
+from backend.services import review_service
+
+
+def _failing_evaluator(calls):
+    def evaluate(*args, **kwargs):
+        calls.append(args)
+        raise RuntimeError("provider down")
+    return evaluate
+
+
+def test_failed_review_is_not_retried_within_the_retry_window(make_rfp, monkeypatch):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    calls = []
+    monkeypatch.setattr(review_service, "_evaluate_with_ai", _failing_evaluator(calls))
+
+    first = review_service.get_review_summary(proposal_id)
+    second = review_service.get_review_summary(proposal_id)
+
+    assert first == second
+    assert first["overall_score"] is None
+    assert len(calls) == 1
+
+
+def test_failed_review_is_retried_after_the_retry_window(make_rfp, monkeypatch):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    monkeypatch.setattr(review_service, "_evaluate_with_ai", _failing_evaluator([]))
+    review_service.get_review_summary(proposal_id)
+
+    monkeypatch.setattr(review_service, "REVIEW_RETRY_SECONDS", 0)
+    monkeypatch.setattr(review_service, "_evaluate_with_ai", lambda *args: {"overall_score": 82})
+
+    assert review_service.get_review_summary(proposal_id)["overall_score"] == 82
@@ -0,0 +1,12 @@
+from backend.schemas.analysis import GENERAL_DIMENSIONS
+from backend.services import proposal_service, scoring_service
+
+
+def test_dimension_hash_changes_with_indexed_evidence(make_rfp):
+    _, (proposal_id,) = make_rfp(proposals=1)
+    proposal = proposal_service.get_proposal(proposal_id)
+    dim = GENERAL_DIMENSIONS[0]
+
+    assert scoring_service._dimension_hash(proposal, dim, "v1") == scoring_service._dimension_hash(proposal, dim, "v1")
+    assert scoring_service._dimension_hash(proposal, dim, "v1") != scoring_service._dimension_hash(proposal, dim, "v2")
+    assert scoring_service._dimension_hash(proposal, dim, "v1") != scoring_service._dimension_hash(proposal, dim, None)
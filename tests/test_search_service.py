@@ -0,0 +1,68 @@
+from backend.models.db import get_session
+from backend.models.entities import RfpModel
+from backend.services import rfp_service, search_service
+
+
+def _hits(query):
+    return [hit["doc_id"] for hit in search_service.search(query)]
+
+
+def test_index_is_written_in_the_committing_transaction(make_rfp, monkeypatch):
+    def no_second_transaction():
+        raise AssertionError("indexing opened its own transaction")
+
+    monkeypatch.setattr(search_service, "write_session", no_second_transaction)
+    rfp_id, _ = make_rfp(title="Skylight Replacement")
+    assert _hits("skylight") == [rfp_id]
+
+    with get_session() as session:
+        rfp = session.get(RfpModel, rfp_id)
+        rfp.title = "Atrium Glazing"
+        session.add(rfp)
+        session.commit()
+    assert _hits("skylight") == []
+    assert _hits("atrium") == [rfp_id]
+
+
+def test_rolled_back_write_is_not_indexed():
+    with get_session() as session:
+        session.add(RfpModel(title="Chimney Repointing"))
+        session.flush()
+        session.rollback()
+    assert _hits("chimney") == []
+
+
+def test_index_failure_keeps_the_write_and_cache_invalidation(make_rfp, monkeypatch):
+    rfp_id, _ = make_rfp(title="Cupola Cleaning")
+    assert rfp_service.get_rfp(rfp_id).title == "Cupola Cleaning"
+
+    def broken(*args):
+        raise RuntimeError("fts unavailable")
+
+    monkeypatch.setattr(search_service, "_write", broken)
+    with get_session() as session:
+        rfp = session.get(RfpModel, rfp_id)
+        rfp.title = "Downspout Repair"
+        session.add(rfp)
+        session.commit()
+
+    assert rfp_service.get_rfp(rfp_id).title == "Downspout Repair"
+    assert _hits("cupola") == [rfp_id]  # stale until jobs/reindex_search.py runs
+
+
+def test_async_session_commits_index_too(make_rfp):
+    import asyncio
+
+    from backend.models.db import get_async_session
+
+    rfp_id, _ = make_rfp(title="Dormer Framing")
+
+    async def rename():
+        async with get_async_session() as session:
+            rfp = await session.get(RfpModel, rfp_id)
+            rfp.title = "Parapet Flashing"
+            session.add(rfp)
+            await session.commit()
+
+    asyncio.run(rename())
+    assert _hits("parapet") == [rfp_id]
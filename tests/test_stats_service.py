@@ -0,0 +1,30 @@
+import time
+
+from sqlalchemy import text
+
+from backend.models.db import engine
+from backend.services import stats_service
+
+
+def _count(stats: dict, rfp_id: str) -> int:
+    return next(r["total_proposals"] for r in stats["per_rfp"] if r["rfp_id"] == rfp_id)
+
+
+def test_stats_refresh_after_orm_commit(make_rfp):
+    stats_service.get_dashboard_stats()
+    rfp_id, _ = make_rfp(proposals=2)
+    assert _count(stats_service.get_dashboard_stats(), rfp_id) == 2
+
+
+def test_stats_expire_after_ttl(make_rfp, monkeypatch):
+    rfp_id, (proposal_id, _) = make_rfp(proposals=2)
+    assert _count(stats_service.get_dashboard_stats(), rfp_id) == 2
+
+    # A write from another process: no ORM events fire here
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM proposals WHERE id = :id"), {"id": proposal_id})
+    assert _count(stats_service.get_dashboard_stats(), rfp_id) == 2
+
+    later = time.monotonic() + stats_service.TTL_SECONDS + 1
+    monkeypatch.setattr(stats_service.time, "monotonic", lambda: later)
+    assert _count(stats_service.get_dashboard_stats(), rfp_id) == 1
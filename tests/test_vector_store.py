@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from backend.services import vector_store
+
+
+class FakeCollection:
+    def __init__(self, ids, texts, dim=4):
+        self.ids, self.texts = list(ids), list(texts)
+        self.vectors = np.ones((len(self.ids), dim), dtype=np.float32)
+        self.full_reads = 0
+
+    def get(self, include):
+        if include:
+            self.full_reads += 1
+        return {
+            "ids": self.ids,
+            "documents": self.texts,
+            "metadatas": [{"page": 0}] * len(self.ids),
+            "embeddings": self.vectors,
+        }
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(vector_store, "get_client", lambda: fake)
+    monkeypatch.setattr(vector_store, "_chunk_cache", type(vector_store._chunk_cache)())
+    monkeypatch.setattr(vector_store, "_chunk_cache_bytes", 0)
+    return fake
+
+
+def test_repeat_reads_are_cached(client):
+    client.collections["c"] = collection = FakeCollection(["a", "b"], ["one", "two"])
+    assert vector_store.get_chunks("c").texts == ["one", "two"]
+    vector_store.get_chunks("c")
+    assert collection.full_reads == 1
+
+
+def test_reingest_with_same_count_reloads(client):
+    client.collections["c"] = FakeCollection(["a", "b"], ["old", "old"])
+    before = vector_store.collection_stamp("c")
+    vector_store.get_chunks("c")
+
+    client.collections["c"] = FakeCollection(["x", "y"], ["new", "new"])
+    assert vector_store.collection_stamp("c") != before
+    assert vector_store.get_chunks("c").texts == ["new", "new"]
+    assert len(vector_store._chunk_cache) == 1
+
+
+def test_cache_is_bounded_by_bytes(client, monkeypatch):
+    per_collection = FakeCollection(["a"], ["t"]).vectors.nbytes + 1
+    monkeypatch.setattr(vector_store, "_CHUNK_CACHE_MAX_BYTES", 2 * per_collection)
+    for name in ("c1", "c2", "c3"):
+        client.collections[name] = FakeCollection([name], ["t"])
+        vector_store.get_chunks(name)
+
+    assert [key[0] for key in vector_store._chunk_cache] == ["c2", "c3"]
+    assert vector_store._chunk_cache_bytes == 2 * per_collection
+
+
+def test_missing_or_empty_collection(client):
+    client.collections["empty"] = FakeCollection([], [])
+    assert vector_store.get_chunks("empty") is None
+    assert vector_store.get_chunks("missing") is None
+    assert vector_store.collection_stamp("missing") is None